@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""比较逐个启用和批量并行启用100个MOD（复制方式）的耗时
+
+用法: python bench_copy.py [工作目录] [MOD数量]
+不指定目录时在临时目录中生成。结果取决于磁盘类型和CPU核数：
+SSD/NVMe和网络共享上并行复制能重叠I/O等待，机械硬盘上调度器会退回顺序复制；
+刚生成的测试文件在页缓存中，单核环境下并行只能体现调度开销。
+"""
+
+from utils.config_manager import ConfigManager
+from utils.mod_manager import ModManager
+from utils.copy_scheduler import default_copy_workers
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+def main():
+    work_dir = tempfile.mkdtemp(dir=sys.argv[1] if len(sys.argv) > 1 else None)
+    mod_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        mods_path = os.path.join(work_dir, "Content", "Paks", "~mods")
+        backup_path = os.path.join(work_dir, "modbackup")
+        os.makedirs(mods_path)
+        # 强制复制方式，禁用时直接删除文件，启用时都从备份复制
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump({"mods_path": mods_path, "backup_path": backup_path, "deploy_mode": "copy",
+                       "use_staging": False, "dedup_backups": False}, f)
+        config = ConfigManager()
+        mod_manager = ModManager(config)
+
+        # 大小不一的MOD：少数几个大的外观MOD，其余是小MOD
+        print(f"生成 {mod_count} 个测试MOD")
+        block = os.urandom(1024 * 1024)
+        mod_ids = []
+        total_mb = 0
+        with config.batch():
+            for i in range(mod_count):
+                mod_id = f"Mod{i:03d}"
+                size_mb = 64 if i % 20 == 0 else 2
+                os.makedirs(os.path.join(mods_path, mod_id))
+                for ext in (".pak", ".ucas", ".utoc"):
+                    with open(os.path.join(mods_path, mod_id, mod_id + ext), "wb") as f:
+                        for _ in range(size_mb if ext == ".ucas" else 1):
+                            f.write(block)
+                total_mb += size_mb + 2
+                mod_info = {"name": mod_id, "enabled": True, "folder_structure": True,
+                            "files": [f"{mod_id}/{mod_id}{ext}" for ext in (".pak", ".ucas", ".utoc")]}
+                config.backup_mod(mod_id, mod_info)
+                mod_ids.append(mod_id)
+        print(f"共 {total_mb} MB，自动选择的复制线程数: {default_copy_workers(backup_path, mods_path)}")
+
+        def disable_all():
+            with config.batch():
+                for mod_id in mod_ids:
+                    mod_manager.disable_mod(mod_id)
+
+        # 逐个启用，每个MOD的文件顺序复制
+        disable_all()
+        config.set("copy_workers", 1)
+        start = time.perf_counter()
+        with config.batch():
+            serial_ok = sum(1 for mod_id in mod_ids if mod_manager.enable_mod(mod_id))
+        serial_s = time.perf_counter() - start
+
+        print(f"逐个启用: {serial_ok}/{mod_count} 个MOD，{serial_s:.2f} 秒，{total_mb / serial_s:.1f} MB/s")
+
+        # 一次调度所有MOD的文件：自动选择线程数，以及固定8个线程
+        for workers in (0, 8):
+            disable_all()
+            config.set("copy_workers", workers)
+            start = time.perf_counter()
+            with config.batch():
+                results = mod_manager.enable_mods(mod_ids)
+            scheduled_s = time.perf_counter() - start
+            scheduled_ok = sum(1 for result in results.values() if result)
+            print(f"调度启用（线程数 {workers or '自动'}）: {scheduled_ok}/{mod_count} 个MOD，"
+                  f"{scheduled_s:.2f} 秒，{total_mb / scheduled_s:.1f} MB/s")
+        print(f"CPU核数: {os.cpu_count()}")
+        config.close()
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n测试完成")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""比较不同部署方式启用/禁用一个大MOD的耗时
+
+用法: python bench_deploy.py [备份目录] [MOD目录] [文件大小MB]
+不指定目录时在临时目录中生成；备份目录和MOD目录在同一文件系统上时才能使用硬链接和写时复制。
+"""
+
+from utils.deploy import DEPLOY_MODES, probe_capabilities, resolve_deploy_mode, deploy_file
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+EXTENSIONS = (".pak", ".ucas", ".utoc")
+
+def main():
+    work_dir = tempfile.mkdtemp()
+    backup_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(work_dir, "modbackup", "BigOutfit")
+    mods_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join(work_dir, "~mods", "BigOutfit")
+    size_mb = int(sys.argv[3]) if len(sys.argv) > 3 else 512
+    os.makedirs(backup_dir, exist_ok=True)
+    os.makedirs(mods_dir, exist_ok=True)
+    try:
+        print(f"生成 {size_mb} MB 的测试MOD")
+        block = os.urandom(1024 * 1024)
+        sources = []
+        for ext in EXTENSIONS:
+            path = os.path.join(backup_dir, "BigOutfit" + ext)
+            with open(path, "wb") as f:
+                for _ in range(size_mb if ext == ".ucas" else 1):
+                    f.write(block)
+            sources.append(path)
+
+        supported = probe_capabilities(backup_dir, mods_dir)
+        print(f"支持的部署方式: {sorted(supported)}")
+        for mode in DEPLOY_MODES:
+            if mode == "auto":
+                continue
+            actual = resolve_deploy_mode(mode, backup_dir, mods_dir)
+            if actual != mode:
+                print(f"{mode:9s}: 不支持")
+                continue
+            start = time.perf_counter()
+            for src in sources:
+                deploy_file(src, os.path.join(mods_dir, os.path.basename(src)), mode)
+            enable_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            for src in sources:
+                os.remove(os.path.join(mods_dir, os.path.basename(src)))
+            disable_ms = (time.perf_counter() - start) * 1000
+            print(f"{mode:9s}: 启用 {enable_ms:8.1f} ms，禁用 {disable_ms:6.1f} ms")
+        print(f"自动选择: {resolve_deploy_mode('auto', backup_dir, mods_dir)}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n测试完成")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""测试文件指纹服务：完整指纹、快速指纹、缓存命中以及多线程计算的耗时
+
+用法: python bench_fingerprint.py [文件大小MB] [文件数]
+"""
+
+from utils.fingerprint import FingerprintService, HAS_XXHASH
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+def build_files(work_dir, count, size_mb):
+    """生成测试文件，并把修改时间调到过去（刚修改过的文件不会被缓存）"""
+    paths = []
+    block = os.urandom(1024 * 1024)
+    old_time = time.time() - 60
+    for i in range(count):
+        path = os.path.join(work_dir, f"Mod_{i:02d}.ucas")
+        with open(path, "wb") as f:
+            for _ in range(size_mb):
+                f.write(block)
+            f.write(str(i).encode("ascii"))
+        os.utime(path, (old_time, old_time))
+        paths.append(path)
+    return paths
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label}: {(time.perf_counter() - start) * 1000:8.1f} ms")
+    return result
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    work_dir = tempfile.mkdtemp()
+    try:
+        print(f"生成 {count} 个 {size_mb} MB 的测试文件，xxhash可用: {HAS_XXHASH}")
+        paths = build_files(work_dir, count, size_mb)
+        cache_file = os.path.join(work_dir, "fingerprint_cache.json")
+
+        serial = FingerprintService(None, workers=1)
+        timed("完整指纹（单线程）", lambda: serial.fingerprint_many(paths))
+        service = FingerprintService(cache_file, workers=4)
+        full = timed("完整指纹（4线程）", lambda: service.fingerprint_many(paths))
+        quick = timed("快速指纹", lambda: service.fingerprint_many(paths, quick=True))
+        service.save()
+
+        # 重新加载缓存，未变化的文件不再读取
+        service = FingerprintService(cache_file, workers=4)
+        cached = timed("完整指纹（缓存）", lambda: service.fingerprint_many(paths))
+        print(f"缓存结果与计算结果一致: {cached == full}，缓存统计: {service.stats()}")
+        print(f"快速指纹互不相同: {len(set(quick.values())) == count}")
+        print("same_content(文件0, 文件0的副本): ", end="")
+        copy_path = os.path.join(work_dir, "copy.ucas")
+        shutil.copy2(paths[0], copy_path)
+        print(service.same_content(paths[0], copy_path))
+        print(f"same_content(文件0, 文件1): {service.same_content(paths[0], paths[1])}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n测试完成")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""比较导入大MOD时先解压到临时目录再复制和直接解压到MOD目录的耗时与写入量
+
+用法: python bench_import.py [工作目录] [MOD大小MB]
+写入量来自/proc/self/io的wchar（只在Linux上可用），包括导入后备份MOD的写入。
+"""
+
+from utils.config_manager import ConfigManager
+from utils.mod_manager import ModManager
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+def written_bytes():
+    try:
+        with open("/proc/self/io", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+def main():
+    work_dir = tempfile.mkdtemp(dir=sys.argv[1] if len(sys.argv) > 1 else None)
+    size_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        # 不压缩的zip，解压耗时主要是写入
+        bundle = os.path.join(work_dir, "BigOutfit.zip")
+        block = os.urandom(1024 * 1024)
+        with zipfile.ZipFile(bundle, "w", zipfile.ZIP_STORED) as z:
+            for ext in (".pak", ".utoc"):
+                z.writestr(f"BigOutfit/BigOutfit{ext}", block)
+            with z.open("BigOutfit/BigOutfit.ucas", "w", force_zip64=True) as f:
+                for _ in range(size_mb):
+                    f.write(block)
+            z.writestr("BigOutfit/showcase.mp4", block * 16)
+        print(f"测试压缩包: {os.path.getsize(bundle) / (1024 * 1024):.0f} MB")
+
+        for direct in (False, True):
+            mods_path = os.path.join(work_dir, f"Content{int(direct)}", "Paks", "~mods")
+            os.makedirs(mods_path)
+            with open("config.json", "w", encoding="utf-8") as f:
+                json.dump({"mods_path": mods_path, "backup_path": os.path.join(work_dir, f"modbackup{int(direct)}"),
+                           "direct_import": direct, "dedup_backups": False}, f)
+            config = ConfigManager()
+            mod_manager = ModManager(config)
+            before = written_bytes()
+            start = time.perf_counter()
+            mod_manager.import_mod(bundle)
+            seconds = time.perf_counter() - start
+            written_mb = (written_bytes() - before) / (1024 * 1024)
+            print(f"{'直接解压到MOD目录' if direct else '先解压到临时目录'}: {seconds:.2f} 秒，写入 {written_mb:.0f} MB"
+                  f"（含备份），MOD目录: {sorted(os.listdir(os.path.join(mods_path, 'BigOutfit')))}")
+            config.close()
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n测试完成")
+
+if __name__ == "__main__":
+    main()
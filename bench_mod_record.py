@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""比较普通dict与ModRecord保存10000个MOD时的内存占用和字段读取耗时"""
+
+from utils.mod_record import ModRecord
+import time
+import tracemalloc
+
+MOD_COUNT = 10000
+
+def make_mods():
+    mods = {}
+    for i in range(MOD_COUNT):
+        folder = f"folder_{i % 50}"
+        name = f"Mod_{i:05d}"
+        # 模拟从JSON加载：每个MOD的键和重复值都是独立的字符串对象
+        mods[name] = {
+            "name": "".join(name),
+            "display_name": "".join(name),
+            "mod_name": "".join(name),
+            "real_name": "".join(name),
+            "folder_name": "".join(folder),
+            "category_id": i % 20,
+            "enabled": i % 2 == 0,
+            "files": [f"{folder}/{name}.pak", f"{folder}/{name}.ucas", f"{folder}/{name}.utoc"],
+            "original_path": f"C:/Game/~mods/{folder}/{name}.pak",
+            "import_date": "".join("2024-01-01 00:00:00"),
+            "size": 12.34,
+            "folder_structure": True,
+            "preview_image": "",
+        }
+    return mods
+
+def measure(build):
+    tracemalloc.start()
+    mods = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return mods, current
+
+def read_fields(mods):
+    # 模拟refresh_mod_list对每个MOD的字段访问
+    start = time.perf_counter()
+    for _ in range(10):
+        for mod_id, mod_info in mods.items():
+            mod_info.get('category_id')
+            mod_info.get('enabled', False)
+            mod_info.get('name', mod_info.get('display_name', mod_id))
+            mod_info.get('size', '--')
+    return time.perf_counter() - start
+
+def main():
+    print(f"开始测试：{MOD_COUNT} 个MOD")
+
+    dict_mods, dict_memory = measure(make_mods)
+    record_mods, record_memory = measure(lambda: {k: ModRecord.from_json(v) for k, v in make_mods().items()})
+
+    print(f"dict 内存: {dict_memory / 1024 / 1024:.2f} MB")
+    print(f"ModRecord 内存: {record_memory / 1024 / 1024:.2f} MB")
+    print(f"内存减少: {(1 - record_memory / dict_memory) * 100:.1f}%")
+
+    dict_time = read_fields(dict_mods)
+    record_time = read_fields(record_mods)
+    print(f"dict 字段读取: {dict_time * 1000:.1f} ms")
+    print(f"ModRecord 字段读取: {record_time * 1000:.1f} ms")
+
+    print("\n测试完成")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""导入深层嵌套压缩包的耗时随嵌套深度的变化
+
+每层压缩包包含一个MOD和下一层压缩包。每个压缩包只访问一次时耗时随深度线性增长；
+direct_import关闭时所有压缩包都解压到临时目录（只扫描各自的目录），开启时小的嵌套压缩包在内存中处理。
+用法: python bench_nested.py [最大深度]
+"""
+
+from utils.config_manager import ConfigManager
+from utils.mod_manager import ModManager
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+def build_chain(depth):
+    data = None
+    for level in reversed(range(depth)):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as z:
+            for ext in (".pak", ".ucas", ".utoc"):
+                z.writestr(f"Level{level}/Level{level}Mod{ext}", os.urandom(256 * 1024))
+            # 每层都带截图，模拟真实整合包
+            z.writestr(f"Level{level}/screenshot.png", os.urandom(256 * 1024))
+            if data is not None:
+                z.writestr(f"Level{level}/Next.zip", data)
+        data = buffer.getvalue()
+    return data
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    work_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        print(f"{'深度':>4} {'临时目录(秒)':>12} {'直接导入(秒)':>12} {'压缩包节点':>10}")
+        for depth in (1, 2, 4, max_depth):
+            bundle = os.path.join(work_dir, f"Chain{depth}.zip")
+            with open(bundle, "wb") as f:
+                f.write(build_chain(depth))
+            times = []
+            for direct in (False, True):
+                mods_path = os.path.join(work_dir, f"Content_{depth}_{int(direct)}", "Paks", "~mods")
+                os.makedirs(mods_path)
+                with open("config.json", "w", encoding="utf-8") as f:
+                    json.dump({"mods_path": mods_path, "backup_path": os.path.join(work_dir, f"backup_{depth}_{int(direct)}"),
+                               "direct_import": direct}, f)
+                config = ConfigManager()
+                mod_manager = ModManager(config)
+                start = time.perf_counter()
+                result = mod_manager.import_mod(bundle)
+                times.append(time.perf_counter() - start)
+                mods = result if isinstance(result, list) else [result]
+                assert len(mods) == depth, f"应导入 {depth} 个MOD，实际 {len(mods)}"
+                nodes = len(mod_manager.last_import_graph.nodes)
+                config.close()
+            print(f"{depth:>4} {times[0]:>12.3f} {times[1]:>12.3f} {nodes:>10}")
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n测试完成")
+
+if __name__ == "__main__":
+    main()
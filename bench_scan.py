@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""比较旧的rglob扫描方式、单次scandir扫描和带扫描缓存的增量扫描在5000个MOD目录树上的文件系统调用次数和耗时"""
+
+from utils.mod_scanner import scan_mod_groups
+from utils.scan_cache import ScanCache
+from pathlib import Path
+import os
+import shutil
+import tempfile
+import time
+
+MOD_COUNT = 5000
+# 每个分组文件夹里放多少个MOD，其余MOD各占一个文件夹
+MODS_PER_SHARED_FOLDER = 10
+
+def build_tree(root):
+    """生成模拟的~mods目录：一半MOD各占一个文件夹，一半按组放在共享文件夹里，附带说明文件"""
+    for i in range(MOD_COUNT):
+        if i % 2 == 0:
+            folder = root / f"single_{i:05d}"
+        else:
+            folder = root / f"pack_{i // (MODS_PER_SHARED_FOLDER * 2):04d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        for ext in (".pak", ".ucas", ".utoc"):
+            (folder / f"Mod_{i:05d}{ext}").write_bytes(b"0" * 16)
+        (folder / "readme.txt").write_text("readme", encoding="utf-8")
+    # 一些不完整的MOD
+    for i in range(50):
+        (root / "broken" / f"Broken_{i}.pak").parent.mkdir(exist_ok=True)
+        (root / "broken" / f"Broken_{i}.pak").write_bytes(b"0")
+    # 模拟已经存在一段时间的MOD目录（刚修改过的目录不会被缓存）
+    old_time = time.time() - 60
+    for dir_path, _, _ in os.walk(root):
+        os.utime(dir_path, (old_time, old_time))
+
+def legacy_scan(mods_path):
+    """修改前scan_mods_directory中的文件查找部分"""
+    result = []
+    for file in mods_path.rglob('*.pak'):
+        ucas_file = file.with_suffix('.ucas')
+        utoc_file = file.with_suffix('.utoc')
+        if ucas_file.exists() and utoc_file.exists():
+            rel_path = file.parent.relative_to(mods_path) if file.parent != mods_path else Path("")
+            all_files = [str(rel_path / file.name), str(rel_path / ucas_file.name), str(rel_path / utoc_file.name)]
+            for other_file in file.parent.glob('*'):
+                if other_file.is_file() and other_file.name not in [file.name, ucas_file.name, utoc_file.name]:
+                    all_files.append(str(rel_path / other_file.name))
+            result.append((str(file), sorted(all_files), file.stat().st_size))
+    return result
+
+def new_scan(mods_path, cache=None):
+    """使用scan_mod_groups的扫描"""
+    result = []
+    for group in scan_mod_groups(mods_path, cache=cache):
+        if not group['complete']:
+            continue
+        result.append((group['pak_path'], sorted(group['rel_files']), group['pak_size']))
+    return result
+
+class _CountingEntry:
+    """包装DirEntry，统计stat()调用"""
+
+    def __init__(self, entry, counter):
+        self._entry = entry
+        self._counter = counter
+
+    def stat(self, **kwargs):
+        self._counter['DirEntry.stat'] += 1
+        return self._entry.stat(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def __fspath__(self):
+        return self._entry.path
+
+class _CountingScandir:
+    def __init__(self, it, counter):
+        self._it = it
+        self._counter = counter
+
+    def __iter__(self):
+        for entry in self._it:
+            yield _CountingEntry(entry, self._counter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._it.close()
+
+def count_calls(func, mods_path):
+    """替换os.stat/os.lstat/os.scandir，统计一次扫描的文件系统调用次数"""
+    counter = {'os.scandir': 0, 'os.stat': 0, 'os.lstat': 0, 'DirEntry.stat': 0}
+    real_scandir, real_stat, real_lstat = os.scandir, os.stat, os.lstat
+
+    def scandir(path='.'):
+        counter['os.scandir'] += 1
+        return _CountingScandir(real_scandir(path), counter)
+
+    def stat(path, *args, **kwargs):
+        counter['os.stat'] += 1
+        return real_stat(path, *args, **kwargs)
+
+    def lstat(path, *args, **kwargs):
+        counter['os.lstat'] += 1
+        return real_lstat(path, *args, **kwargs)
+
+    os.scandir, os.stat, os.lstat = scandir, stat, lstat
+    try:
+        func(mods_path)
+    finally:
+        os.scandir, os.stat, os.lstat = real_scandir, real_stat, real_lstat
+    return counter
+
+def measure(func, mods_path, rounds=3):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(mods_path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def main():
+    work_dir = Path(tempfile.mkdtemp()) / "~mods"
+    try:
+        print(f"生成测试目录：{MOD_COUNT} 个MOD")
+        build_tree(work_dir)
+
+        legacy_result, legacy_time = measure(legacy_scan, work_dir)
+        new_result, new_time = measure(new_scan, work_dir)
+        print(f"结果一致: {sorted(legacy_result) == sorted(new_result)}，MOD数: {len(new_result)}")
+
+        legacy_calls = count_calls(legacy_scan, work_dir)
+        new_calls = count_calls(new_scan, work_dir)
+        print(f"旧方式 系统调用: {legacy_calls}，合计 {sum(legacy_calls.values())}")
+        print(f"新方式 系统调用: {new_calls}，合计 {sum(new_calls.values())}")
+        print(f"旧方式 耗时: {legacy_time * 1000:.1f} ms")
+        print(f"新方式 耗时: {new_time * 1000:.1f} ms")
+
+        # 扫描缓存：第一次完整扫描并写入缓存，之后目录未变化时只stat目录
+        cache_file = str(work_dir.parent / "scan_cache.json")
+        cold_start = time.perf_counter()
+        new_scan(work_dir, ScanCache(cache_file))
+        cold_time = time.perf_counter() - cold_start
+        warm_start = time.perf_counter()
+        warm_result = new_scan(work_dir, ScanCache(cache_file))
+        warm_time = time.perf_counter() - warm_start
+        print(f"缓存结果一致: {sorted(warm_result) == sorted(new_result)}")
+        warm_calls = count_calls(lambda path: new_scan(path, ScanCache(cache_file)), work_dir)
+        print(f"缓存命中 系统调用: {warm_calls}，合计 {sum(warm_calls.values())}")
+        print(f"首次扫描(写缓存) 耗时: {cold_time * 1000:.1f} ms")
+        print(f"缓存命中(含读取缓存文件) 耗时: {warm_time * 1000:.1f} ms")
+        cache = ScanCache(cache_file)
+        walk_start = time.perf_counter()
+        scan_mod_groups(work_dir, cache=cache)
+        print(f"缓存命中(仅目录遍历) 耗时: {(time.perf_counter() - walk_start) * 1000:.1f} ms")
+
+        # 新增一个MOD后只重新列出发生变化的目录
+        for ext in (".pak", ".ucas", ".utoc"):
+            (work_dir / "single_00000" / f"Extra{ext}").write_bytes(b"0")
+        cache = ScanCache(cache_file)
+        changed_result = new_scan(work_dir, cache)
+        print(f"新增MOD后: MOD数 {len(changed_result)}，重新扫描 {cache.misses} 个目录")
+    finally:
+        shutil.rmtree(work_dir.parent, ignore_errors=True)
+
+    print("\n测试完成")
+
+if __name__ == "__main__":
+    main()
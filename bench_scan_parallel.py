@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""比较串行扫描和线程池并行扫描在合成MOD目录树上的耗时
+
+用法: python bench_scan_parallel.py [MOD目录]
+不指定目录时生成5000个MOD的临时目录树；另外通过给每次列目录加上固定延迟，
+模拟网络共享或机械硬盘上延迟主导的情况。
+"""
+
+from bench_scan import build_tree, MOD_COUNT
+from utils.mod_scanner import scan_mod_groups, detect_storage_kind, default_scan_workers
+from pathlib import Path
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+WORKER_COUNTS = (1, 2, 4, 8, 16)
+# 模拟的每次列目录延迟（毫秒）
+SIMULATED_LATENCY_MS = 1
+
+def measure(mods_path, workers, rounds=3):
+    best = None
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = scan_mod_groups(mods_path, workers=workers)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def run(mods_path, label):
+    print(f"\n{label}")
+    serial_result, serial_time = measure(mods_path, 1)
+    serial_key = [group['pak_path'] for group in serial_result]
+    for workers in WORKER_COUNTS:
+        result, elapsed = measure(mods_path, workers)
+        same = [group['pak_path'] for group in result] == serial_key
+        print(f"线程数 {workers:2d}: {elapsed * 1000:8.1f} ms，加速 {serial_time / elapsed:4.2f}x，结果顺序与串行一致: {same}")
+
+def main():
+    if len(sys.argv) > 1:
+        mods_path = Path(sys.argv[1])
+        work_dir = None
+    else:
+        work_dir = Path(tempfile.mkdtemp())
+        mods_path = work_dir / "~mods"
+        print(f"生成测试目录：{MOD_COUNT} 个MOD")
+        build_tree(mods_path)
+    try:
+        print(f"存储类型: {detect_storage_kind(mods_path)}，自动选择的线程数: {default_scan_workers(mods_path)}")
+        run(mods_path, "本地目录（页缓存已预热）")
+
+        # 给每次列目录加上固定延迟，模拟延迟主导的存储
+        real_scandir = os.scandir
+
+        def slow_scandir(path='.'):
+            time.sleep(SIMULATED_LATENCY_MS / 1000.0)
+            return real_scandir(path)
+
+        os.scandir = slow_scandir
+        try:
+            run(mods_path, f"模拟每次列目录 {SIMULATED_LATENCY_MS} ms 延迟")
+        finally:
+            os.scandir = real_scandir
+    finally:
+        if work_dir is not None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n测试完成")
+
+if __name__ == "__main__":
+    main()
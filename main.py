@@ -339,6 +339,9 @@ def main():
         print("[调试] 进入主事件循环")
         exit_code = app.exec()
         
+        # 关闭配置存储
+        config.close()
+        
         # 在程序退出前清理所有临时文件
         cleanup_temp_directories()
         
@@ -356,6 +359,10 @@ def main():
 if __name__ == "__main__":
     from datetime import datetime
     import shutil
+    import multiprocessing
+    
+    # 批量导入使用进程池解压，打包后的程序需要在子进程中直接进入工作函数
+    multiprocessing.freeze_support()
     
     try:
         sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from utils.archive_planner import list_members, plan_extraction
+from utils.config_manager import ConfigManager
+from utils.mod_manager import ModManager
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+def make_bundle(path):
+    """模拟常见的MOD整合包：一组完整MOD、缺文件的配色变体、截图、视频和一个嵌套压缩包"""
+    nested = path + ".nested.zip"
+    with zipfile.ZipFile(nested, "w") as z:
+        for ext in (".pak", ".ucas", ".utoc"):
+            z.writestr(f"RedHair{ext}", os.urandom(64 * 1024))
+        z.writestr("RedHair_preview.jpg", os.urandom(512 * 1024))
+    with zipfile.ZipFile(path, "w") as z:
+        for ext in (".pak", ".ucas", ".utoc"):
+            z.writestr(f"Main/BigOutfit{ext}", os.urandom(256 * 1024))
+        # 只有pak和ucas的配色变体不完整
+        z.writestr("Variants/BigOutfit_Blue.pak", os.urandom(256 * 1024))
+        z.writestr("Variants/BigOutfit_Blue.ucas", os.urandom(256 * 1024))
+        z.writestr("Screenshots/shot1.png", os.urandom(1024 * 1024))
+        z.writestr("Screenshots/shot2.png", os.urandom(1024 * 1024))
+        z.writestr("showcase.mp4", os.urandom(4 * 1024 * 1024))
+        z.write(nested, "Extras/RedHair.zip")
+    os.remove(nested)
+
+def main():
+    print("开始测试选择性解压")
+
+    # 在临时目录中运行，避免影响真实配置
+    work_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        bundle = os.path.join(work_dir, "Bundle.zip")
+        make_bundle(bundle)
+
+        for include_previews in (False, True):
+            plan = plan_extraction(list_members(bundle), include_previews=include_previews)
+            print(f"预览图={include_previews}: 解压 {plan['members']}")
+            print(f"  完整MOD组: {plan['groups']}，嵌套压缩包: {plan['archives']}，"
+                  f"跳过 {plan['skipped_files']} 个文件 {plan['skipped_bytes'] / (1024 * 1024):.1f} MB")
+
+        mods_path = os.path.join(work_dir, "Content", "Paks", "~mods")
+        os.makedirs(mods_path)
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump({"mods_path": mods_path, "backup_path": os.path.join(work_dir, "modbackup")}, f)
+        config = ConfigManager()
+        mod_manager = ModManager(config)
+        result = mod_manager.import_mod(bundle)
+        mods = result if isinstance(result, list) else [result]
+        print(f"导入的MOD: {sorted(mod['name'] for mod in mods)}")
+        print(f"MOD目录: {sorted(os.listdir(mods_path))}")
+        stats = mod_manager.extraction_stats
+        print(f"解压统计: {stats['archives']} 个压缩包，跳过 {stats['skipped_files']} 个文件，"
+              f"{stats['skipped_bytes'] / (1024 * 1024):.1f} MB")
+        config.close()
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("测试完成")
+
+if __name__ == "__main__":
+    main()
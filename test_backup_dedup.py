@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from utils.config_manager import ConfigManager
+import json
+import os
+import shutil
+import tempfile
+import time
+
+def write_mod(mods_path, folder, name, data):
+    os.makedirs(os.path.join(mods_path, folder), exist_ok=True)
+    old_time = time.time() - 60
+    for ext in (".pak", ".ucas", ".utoc"):
+        path = os.path.join(mods_path, folder, name + ext)
+        with open(path, "wb") as f:
+            f.write(data + ext.encode("ascii"))
+        os.utime(path, (old_time, old_time))
+    return {"name": name, "files": [f"{folder}/{name}{ext}" for ext in (".pak", ".ucas", ".utoc")]}
+
+def disk_usage(path):
+    """按inode统计目录实际占用的字节数（硬链接只算一次）"""
+    seen = set()
+    total = 0
+    for dir_path, _, file_names in os.walk(path):
+        for file_name in file_names:
+            st = os.stat(os.path.join(dir_path, file_name))
+            if st.st_ino not in seen:
+                seen.add(st.st_ino)
+                total += st.st_size
+    return total
+
+def main():
+    print("开始测试备份去重")
+
+    # 在临时目录中运行，避免影响真实配置
+    work_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        mods_path = os.path.join(work_dir, "~mods")
+        backup_path = os.path.join(work_dir, "modbackup")
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump({"mods_path": mods_path, "backup_path": backup_path, "dedup_backups": False}, f)
+
+        data = os.urandom(8 * 1024 * 1024)
+        config = ConfigManager()
+
+        # 旧版备份：同一个材质包换名导入了两次，各自完整复制
+        config.backup_mod("TexA", write_mod(mods_path, "TexA", "TexA", data))
+        config.backup_mod("TexA_copy", write_mod(mods_path, "TexA_copy", "TexA_copy", data))
+        print(f"未去重时备份占用: {disk_usage(backup_path) // 1024} KB")
+
+        # 迁移旧备份
+        print(f"迁移结果: {config.migrate_backups_to_store()}")
+        print(f"迁移后备份占用: {disk_usage(backup_path) // 1024} KB")
+        print(f"迁移后校验: {config.verify_backups()}")
+
+        # 开启去重后再次导入相同内容：不再写入数据
+        config.set("dedup_backups", True)
+        start = time.perf_counter()
+        config.backup_mod("TexA_again", write_mod(mods_path, "TexA_again", "TexA_again", data))
+        print(f"重复内容备份耗时: {(time.perf_counter() - start) * 1000:.1f} ms，占用: {disk_usage(backup_path) // 1024} KB")
+        print(f"对象库: {config.object_store.usage()}")
+
+        # 删除MOD后，没有引用的对象被回收
+        for mod_id in ("TexA", "TexA_copy", "TexA_again"):
+            shutil.rmtree(config.get_backup_dir(mod_id))
+            config.remove_mod(mod_id)
+        print(f"删除全部MOD后的对象库: {config.object_store.usage()}")
+        config.close()
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("测试完成")
+
+if __name__ == "__main__":
+    main()
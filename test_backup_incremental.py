@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from utils.config_manager import ConfigManager
+import json
+import os
+import shutil
+import tempfile
+import time
+
+SIZE_MB = 512
+
+def main():
+    print("开始测试增量备份")
+
+    # 在临时目录中运行，避免影响真实配置
+    work_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        mods_path = os.path.join(work_dir, "Content", "Paks", "~mods")
+        backup_path = os.path.join(work_dir, "modbackup")
+        mod_dir = os.path.join(mods_path, "BigOutfit")
+        os.makedirs(mod_dir)
+        block = os.urandom(1024 * 1024)
+        for ext in (".pak", ".ucas", ".utoc"):
+            with open(os.path.join(mod_dir, "BigOutfit" + ext), "wb") as f:
+                for _ in range(SIZE_MB if ext == ".ucas" else 1):
+                    f.write(block)
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump({"mods_path": mods_path, "backup_path": backup_path}, f)
+
+        config = ConfigManager()
+        mod_info = {"name": "BigOutfit", "enabled": True, "folder_structure": True,
+                    "files": [f"BigOutfit/BigOutfit{ext}" for ext in (".pak", ".ucas", ".utoc")]}
+        start = time.perf_counter()
+        config.backup_mod("BigOutfit", mod_info)
+        print(f"首次备份 {SIZE_MB} MB: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        backup_dir = config.get_backup_dir("BigOutfit")
+        ucas_inode = os.stat(os.path.join(backup_dir, "BigOutfit.ucas")).st_ino
+        start = time.perf_counter()
+        config.backup_mod("BigOutfit", mod_info)
+        print(f"未变化时重新备份: {(time.perf_counter() - start) * 1000:.1f} ms，"
+              f"大文件未重写: {os.stat(os.path.join(backup_dir, 'BigOutfit.ucas')).st_ino == ucas_inode}")
+
+        # 修改一个小文件、删除一个文件：只复制变化的文件，删除备份中多余的文件
+        with open(os.path.join(mod_dir, "BigOutfit.pak"), "wb") as f:
+            f.write(b"changed")
+        os.remove(os.path.join(mod_dir, "BigOutfit.utoc"))
+        mod_info["files"] = ["BigOutfit/BigOutfit.pak", "BigOutfit/BigOutfit.ucas"]
+        start = time.perf_counter()
+        config.backup_mod("BigOutfit", mod_info)
+        print(f"修改一个文件后重新备份: {(time.perf_counter() - start) * 1000:.1f} ms，备份文件: {sorted(os.listdir(backup_dir))}")
+        with open(os.path.join(backup_dir, "BigOutfit.pak"), "rb") as f:
+            print(f"备份内容已更新: {f.read() == b'changed'}，大文件未重写: "
+                  f"{os.stat(os.path.join(backup_dir, 'BigOutfit.ucas')).st_ino == ucas_inode}")
+        print(f"校验结果: {config.verify_backups()}")
+        config.close()
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("测试完成")
+
+if __name__ == "__main__":
+    main()
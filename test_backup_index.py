@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from utils.config_manager import ConfigManager
+import json
+import os
+import tempfile
+
+def write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+def main():
+    print("开始测试备份索引")
+
+    # 在临时目录中运行，避免影响真实配置
+    work_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        mods_path = os.path.join(work_dir, "~mods")
+        backup_path = os.path.join(work_dir, "modbackup")
+        # 旧版备份：ModA按ID命名，ModB的备份目录是显示名称，ModC没有备份
+        write_file(os.path.join(backup_path, "ModA", "ModA.pak"), "a")
+        write_file(os.path.join(backup_path, "ModA", "preview.png"), "img")
+        write_file(os.path.join(backup_path, "外套B", "ModB.pak"), "b")
+        write_file(os.path.join(backup_path, "其他MOD", "Other.pak"), "x")
+        config_data = {
+            "mods_path": mods_path,
+            "backup_path": backup_path,
+            "mods": {
+                "ModA": {"name": "ModA", "files": ["ModA/ModA.pak"]},
+                "ModB": {"name": "ModB", "display_name": "外套B", "files": ["ModB/ModB.pak"]},
+                "ModC": {"name": "ModC", "files": ["ModC/ModC.pak"]}
+            }
+        }
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump(config_data, f, ensure_ascii=False)
+
+        config = ConfigManager()
+        print(f"建立的索引: {config.backup_index.entries}")
+        print(f"ModB 备份目录: {config.get_backup_dir('ModB')}")
+        print(f"ModC 备份目录（应为None，不会用其他MOD的备份）: {config.get_backup_dir('ModC')}")
+
+        # 备份新MOD后记录到索引
+        write_file(os.path.join(mods_path, "ModD", "ModD.pak"), "d")
+        write_file(os.path.join(mods_path, "ModD", "ModD.ucas"), "dd")
+        config.backup_mod("ModD", {"name": "ModD", "files": ["ModD/ModD.pak", "ModD/ModD.ucas"]})
+        print(f"ModD 清单: {sorted(config.backup_index.get('ModD')['files'])}")
+
+        # 重命名MOD时备份目录和索引一起更新
+        mod_info = dict(config.get_mods()["ModD"])
+        mod_info["name"] = "ModE"
+        config.update_mod("ModD", mod_info)
+        print(f"重命名后: ModD={config.get_backup_dir('ModD')}，ModE={config.get_backup_dir('ModE')}")
+
+        # 校验：修改一个备份文件、删除一个备份文件
+        write_file(os.path.join(backup_path, "ModA", "ModA.pak"), "changed content")
+        os.remove(os.path.join(backup_path, "外套B", "ModB.pak"))
+        print(f"校验结果: {config.verify_backups()}")
+        config.refresh_backup_index("ModA")
+        print(f"刷新ModA后的校验结果: {config.verify_backups(['ModA'])}")
+
+        # 删除MOD记录时从索引中移除
+        config.remove_mod("ModB")
+        print(f"删除ModB后: {config.backup_index.get('ModB')}")
+        config.close()
+
+        # 重新加载，索引直接从文件读取而不是重建
+        config = ConfigManager()
+        print(f"重新加载后的索引MOD: {sorted(config.backup_index.entries)}")
+        config.close()
+    finally:
+        os.chdir(old_cwd)
+
+    print("测试完成")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from utils.config_manager import ConfigManager
+from utils.mod_manager import ModManager
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+def zip_bytes(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        for name, data in files.items():
+            z.writestr(name, data)
+    return buffer.getvalue()
+
+def triplet(name, size):
+    return {f"{name}{ext}": os.urandom(size) for ext in (".pak", ".ucas", ".utoc")}
+
+def main():
+    print("开始测试批量导入")
+
+    # 在临时目录中运行，避免影响真实配置
+    work_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        archives = []
+        for i in range(6):
+            path = os.path.join(work_dir, f"Outfit{i}.zip")
+            files = triplet(f"Outfit{i}", 2 * 1024 * 1024)
+            if i == 0:
+                # 带一个嵌套压缩包
+                files["Extras/Hair.zip"] = zip_bytes(triplet("Hair", 256 * 1024))
+            with open(path, "wb") as f:
+                f.write(zip_bytes(files))
+            archives.append(path)
+        # 没有MOD文件的压缩包：交给单个导入流程，作为虚拟MOD导入
+        readme = os.path.join(work_dir, "Readme.zip")
+        with open(readme, "wb") as f:
+            f.write(zip_bytes({"readme.txt": b"no mods here"}))
+        archives.append(readme)
+        # 损坏的压缩包
+        broken = os.path.join(work_dir, "Broken.zip")
+        with open(broken, "wb") as f:
+            f.write(b"not an archive")
+        archives.append(broken)
+
+        mods_path = os.path.join(work_dir, "Content", "Paks", "~mods")
+        os.makedirs(mods_path)
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump({"mods_path": mods_path, "backup_path": os.path.join(work_dir, "modbackup")}, f)
+        config = ConfigManager()
+        mod_manager = ModManager(config)
+
+        states = {}
+        def on_state(path, state, detail, stats):
+            states.setdefault(os.path.basename(path), []).append(state)
+
+        results = mod_manager.import_mods(archives, on_state, workers=2)
+        for path in archives:
+            result = results[path]
+            name = os.path.basename(path)
+            if isinstance(result, Exception):
+                print(f"  {name}: 失败 {result}")
+            else:
+                print(f"  {name}: {sorted(mod['name'] for mod in result)}")
+            print(f"    状态: {' -> '.join(states[name])}")
+        stats = mod_manager.last_batch_stats
+        print(f"总体: 完成 {stats['done']} 个，失败 {stats['failed']} 个，解压 {stats['bytes'] / (1024 * 1024):.1f} MB，"
+              f"{stats['seconds']:.2f} 秒，{stats['mb_per_s']:.1f} MB/s")
+        print(f"MOD目录: {sorted(os.listdir(mods_path))}")
+        print(f"暂存目录已清理: {not os.path.exists(os.path.join(work_dir, 'Content', '~mods_importing'))}")
+
+        # 重新导入：MOD文件夹中用户自己放入的文件保留，MOD文件换成新版本
+        user_file = os.path.join(mods_path, "Outfit1", "my_notes.txt")
+        with open(user_file, "w", encoding="utf-8") as f:
+            f.write("user data")
+        with open(archives[1], "wb") as f:
+            f.write(zip_bytes(triplet("Outfit1", 1024)))
+        results = mod_manager.import_mods([archives[1]], workers=1)
+        print(f"重新导入: {sorted(mod['name'] for mod in results[archives[1]])}，"
+              f"文件夹: {sorted(os.listdir(os.path.join(mods_path, 'Outfit1')))}，"
+              f"新版本: {os.path.getsize(os.path.join(mods_path, 'Outfit1', 'Outfit1.pak')) == 1024}")
+        if not os.path.exists(user_file):
+            raise AssertionError("重新导入删除了MOD文件夹中未记录的文件")
+        config.close()
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("测试完成")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from utils.config_manager import ConfigManager
+import json
+import os
+import tempfile
+
+def main():
+    print("开始测试分类树")
+
+    # 在临时目录中运行，避免影响真实配置
+    work_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        # 准备一份旧版配置：分类是路径字符串，MOD保存分类路径
+        config_data = {
+            "categories": ["默认分类", "服装", "服装/外套", "武器"],
+            "category_timestamps": {"默认分类": 0, "服装": 2, "服装/外套": 3, "武器": 1},
+            "default_category_name": "默认分类",
+            "mods": {
+                "ModA": {"name": "ModA", "category": "服装/外套", "enabled": True},
+                "ModB": {"name": "ModB", "category": "服装"},
+                "ModC": {"name": "ModC"}
+            }
+        }
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump(config_data, f, ensure_ascii=False)
+
+        config = ConfigManager()
+        print(f"迁移后的分类: {config.get_categories()}")
+        print(f"ModA 分类ID: {config.get_mods()['ModA'].get('category_id')}，分类: {config.get_mod_category(config.get_mods()['ModA'])}")
+
+        # 重命名只修改一个节点，子分类和MOD自动跟随
+        config.rename_category("服装", "衣服")
+        print(f"重命名后的分类: {config.get_categories()}")
+        print(f"衣服/外套 下的MOD: {config.mods_in_category('衣服/外套')}")
+
+        # 移动分类（连同子分类）
+        config.move_category("衣服/外套", "武器")
+        config.add_category("武器/外套/三级")
+        config.set_mod_category("ModC", "武器/外套/三级")
+        print(f"移动后的分类: {config.get_categories()}")
+        print(f"ModA 分类: {config.get_mod_category(config.get_mods()['ModA'])}")
+
+        # 不允许把分类移动到自己的子分类下
+        print(f"移动到子分类下: {config.move_category('武器', '武器/外套')}")
+
+        # 删除分类，其中的MOD移到指定分类
+        config.delete_category("武器", move_to="衣服")
+        print(f"删除后的分类: {config.get_categories()}")
+        print(f"衣服 下的MOD: {config.mods_in_category('衣服')}")
+        config.close()
+
+        # 重新加载，确认分类树已保存
+        config = ConfigManager()
+        print(f"重新加载后的分类: {config.get_categories()}")
+        print(f"重新加载后的MOD分类: {dict((mod_id, config.get_mod_category(info)) for mod_id, info in config.get_mods().items())}")
+        config.close()
+    finally:
+        os.chdir(old_cwd)
+
+    print("\n测试完成")
+
+if __name__ == "__main__":
+    main()
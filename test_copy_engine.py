@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from utils.copy_engine import CopyEngine, CopyCancelled, CopyOperation
+import filecmp
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+FILE_SIZE_MB = 256
+
+def main():
+    print("开始测试复制引擎")
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        src = os.path.join(work_dir, "BigOutfit.ucas")
+        block = os.urandom(1024 * 1024)
+        with open(src, "wb") as f:
+            for _ in range(FILE_SIZE_MB):
+                f.write(block)
+
+        # 普通复制，对比shutil.copy2
+        start = time.perf_counter()
+        shutil.copy2(src, os.path.join(work_dir, "copy2.ucas"))
+        print(f"shutil.copy2: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        updates = []
+        engine = CopyEngine(progress_callback=lambda done, total, label: updates.append((done, total)))
+        dest = os.path.join(work_dir, "engine.ucas")
+        with engine.operation("复制测试", os.path.getsize(src)):
+            engine.copy_file(src, dest)
+        print(f"CopyEngine: {engine.last_record()}")
+        print(f"进度回调次数: {len(updates)}，最后一次: {updates[-1]}，内容一致: {filecmp.cmp(src, dest, shallow=False)}")
+
+        # 复制到一半时取消：抛出CopyCancelled，不留下目标文件和临时文件
+        def cancel_halfway(done, total, label):
+            if done >= total // 2:
+                engine.cancel()
+
+        engine.progress_callback = cancel_halfway
+        cancelled_dest = os.path.join(work_dir, "cancelled.ucas")
+        try:
+            with engine.operation("取消测试", os.path.getsize(src)):
+                engine.copy_file(src, cancelled_dest)
+            print("取消失败：复制已完成")
+        except CopyCancelled as e:
+            print(f"已取消: {e}，记录: {engine.last_record()}")
+        leftovers = [name for name in os.listdir(work_dir) if name.startswith("cancelled")]
+        print(f"取消后残留文件: {leftovers}")
+
+        # 下一次操作不受上一次取消的影响
+        engine.progress_callback = None
+        engine.copy_file(src, os.path.join(work_dir, "after_cancel.ucas"))
+        print(f"取消后再次复制: {engine.last_record()}")
+
+        # 两个线程同时使用同一个引擎：取消其中一个操作不影响另一个
+        engine.chunk_size = 1024 * 1024
+        import_op = CopyOperation("导入", os.path.getsize(src))
+        backup_started = threading.Event()
+        outcome = {}
+
+        def backup():
+            with engine.operation("备份", os.path.getsize(src)) as operation:
+                backup_started.set()
+                engine.copy_file(src, os.path.join(work_dir, "backup.ucas"))
+                outcome["backup"] = (operation.label, operation.done, operation.cancelled)
+
+        def import_halfway(done, total, label):
+            if done >= total // 2:
+                import_op.cancel()
+
+        import_op.progress_callback = import_halfway
+        thread = threading.Thread(target=backup)
+        thread.start()
+        backup_started.wait()
+        try:
+            with engine.operation(import_op):
+                engine.copy_file(src, os.path.join(work_dir, "import.ucas"))
+            outcome["import"] = "完成"
+        except CopyCancelled:
+            outcome["import"] = "已取消"
+        thread.join()
+        print(f"并发操作: 导入 {outcome['import']}，备份 {outcome.get('backup')}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("测试完成")
+
+if __name__ == "__main__":
+    main()
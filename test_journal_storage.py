@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from utils.config_manager import ConfigManager
+import json
+import os
+import shutil
+import tempfile
+
+def main():
+    print("开始测试日志存储后端")
+
+    # 在临时目录中运行，避免影响真实配置
+    work_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        config_data = {
+            "mods_path": "",
+            "backup_path": os.path.join(work_dir, "modbackup"),
+            "storage_backend": "journal",
+            # 关闭延迟写入，每次修改直接写入存储
+            "write_behind_ms": 0,
+            "mods": {
+                "ModA": {"name": "ModA", "files": ["ModA/ModA.pak"], "enabled": True},
+                "ModB": {"name": "ModB", "files": ["ModB/ModB.pak"], "enabled": True}
+            }
+        }
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump(config_data, f, ensure_ascii=False)
+
+        config = ConfigManager()
+        print(f"存储后端: {config.storage.name}")
+
+        # 单个MOD的修改追加到日志
+        mod_info = config.get_mods()["ModA"]
+        mod_info["enabled"] = False
+        config.update_mod("ModA", mod_info)
+        print(f"update_mod后日志存在: {os.path.exists('config.journal')}")
+
+        # 整体保存写入新快照，日志中旧的记录不能再重放到快照上
+        config.config["mods"]["ModA"]["enabled"] = True
+        config._save_config()
+        print(f"整体保存后日志存在: {os.path.exists('config.journal')}")
+        config.close()
+
+        config = ConfigManager()
+        enabled = config.get_mods()["ModA"].get("enabled")
+        print(f"重新加载后 ModA 启用状态: {enabled}")
+        config.close()
+        if enabled is not True:
+            raise AssertionError("整体保存之前的日志记录覆盖了新快照")
+
+        # 压缩：快照包含所有修改，日志被清空
+        config = ConfigManager()
+        mod_info = config.get_mods()["ModB"]
+        mod_info["enabled"] = False
+        config.update_mod("ModB", mod_info)
+        config.storage.compact(config.config)
+        print(f"压缩后日志存在: {os.path.exists('config.journal')}")
+        config.close()
+
+        config = ConfigManager()
+        mods = config.get_mods()
+        print(f"重新加载后 ModA: {mods['ModA'].get('enabled')}，ModB: {mods['ModB'].get('enabled')}")
+        config.close()
+
+        # 延迟写入：后台线程写入的是保存时的配置副本，之后未保存的内存修改不会被写入
+        with open("config.json", "r", encoding="utf-8") as f:
+            config_data = json.load(f)
+        config_data["write_behind_ms"] = 100
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump(config_data, f, ensure_ascii=False)
+        config = ConfigManager()
+        mod_info = config.get_mods()["ModB"]
+        mod_info["enabled"] = True
+        config.update_mod("ModB", mod_info)
+        config.config["mods"]["ModB"]["enabled"] = False
+        config.config["mods"]["ModB"]["files"].append("ModB/Unsaved.pak")
+        config.flush()
+        config.close()
+
+        config = ConfigManager()
+        mod_info = config.get_mods()["ModB"]
+        print(f"延迟写入后 ModB: {mod_info.get('enabled')}，文件: {mod_info.get('files')}")
+        config.close()
+        if mod_info.get("enabled") is not True or "ModB/Unsaved.pak" in mod_info.get("files", []):
+            raise AssertionError("延迟写入写入了保存之后的内存修改")
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("\n测试完成")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from utils.config_manager import ConfigManager
+from utils.mod_manager import ModManager
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+def zip_bytes(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        for name, data in files.items():
+            z.writestr(name, data)
+    return buffer.getvalue()
+
+def triplet(name, size):
+    return {f"{name}{ext}": os.urandom(size) for ext in (".pak", ".ucas", ".utoc")}
+
+def main():
+    print("开始测试在内存中处理嵌套压缩包")
+
+    # 在临时目录中运行，避免影响真实配置
+    work_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        # 外层 -> Pack.zip -> Inner.zip 三层嵌套，另有一个较大的嵌套压缩包
+        inner = zip_bytes(triplet("InnerMod", 64 * 1024))
+        pack = zip_bytes({**triplet("PackMod", 64 * 1024), "Inner.zip": inner})
+        large = zip_bytes(triplet("LargeMod", 1024 * 1024))
+        bundle = os.path.join(work_dir, "Bundle.zip")
+        with open(bundle, "wb") as f:
+            f.write(zip_bytes({**triplet("TopMod", 64 * 1024), "Nested/Pack.zip": pack, "Large.zip": large}))
+
+        for limit_mb in (1, 0):
+            mods_path = os.path.join(work_dir, f"Content{limit_mb}", "Paks", "~mods")
+            os.makedirs(mods_path)
+            with open("config.json", "w", encoding="utf-8") as f:
+                json.dump({"mods_path": mods_path, "backup_path": os.path.join(work_dir, f"modbackup{limit_mb}"),
+                           "nested_memory_limit_mb": limit_mb}, f)
+            config = ConfigManager()
+            mod_manager = ModManager(config)
+
+            result = mod_manager.import_mod(bundle)
+            mods = result if isinstance(result, list) else [result]
+            print(f"嵌套压缩包内存上限 {limit_mb} MB:")
+            print(f"  导入的MOD: {sorted(mod['name'] for mod in mods)}")
+            print(f"  嵌套MOD: {sorted(mod['name'] for mod in mods if mod.get('is_nested'))}")
+            graph = mod_manager.last_import_graph
+            spilled = [node["name"] for node in graph.nodes if node["parent"] is not None and node["location"] == "disk"]
+            print(f"  写到磁盘的嵌套压缩包: {sorted(spilled)}")
+            for line in graph.describe():
+                print(f"    {line}")
+            print(f"  MOD目录: {sorted(os.listdir(mods_path))}")
+            config.close()
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("测试完成")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from utils.config_manager import ConfigManager
+import json
+import os
+import sqlite3
+import tempfile
+
+def main():
+    print("开始测试SQLite存储后端")
+
+    # 在临时目录中运行，避免影响真实配置
+    work_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        # 准备一份旧的JSON配置，并打开SQLite后端
+        config_data = {
+            "language": "zh",
+            "categories": ["默认分类", "服装"],
+            "category_timestamps": {"默认分类": 0, "服装": 1},
+            "default_category_name": "默认分类",
+            "mods_path": "",
+            "backup_path": os.path.join(work_dir, "modbackup"),
+            "game_path": "",
+            "storage_backend": "sqlite",
+            "mods": {
+                "ModA": {"name": "ModA", "files": ["ModA/ModA.pak"], "enabled": True, "category": "服装"},
+                "ModB": {"name": "ModB", "files": ["ModB/ModB.pak"], "enabled": False}
+            }
+        }
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump(config_data, f, ensure_ascii=False)
+
+        config = ConfigManager()
+        print(f"存储后端: {config.storage.name}")
+        print(f"迁移后的MOD: {list(config.get_mods().keys())}")
+        print(f"迁移后的分类: {config.get_categories()}")
+
+        # 行级更新
+        mod_info = config.get_mods()["ModB"]
+        mod_info["enabled"] = True
+        config.update_mod("ModB", mod_info)
+        config.set_mod_category("ModB", "服装")
+        config.remove_mod("ModA")
+        config.close()
+
+        # 直接查询数据库验证索引列
+        conn = sqlite3.connect("config.db")
+        rows = conn.execute("SELECT mod_id, category, enabled FROM mods").fetchall()
+        print(f"数据库中的MOD行: {rows}")
+        print(f"日志模式: {conn.execute('PRAGMA journal_mode').fetchone()[0]}")
+        conn.close()
+
+        # 重新加载，确认数据一致
+        config = ConfigManager()
+        mods = config.get_mods()
+        print(f"重新加载后的MOD: {mods}")
+        print(f"ModB 启用状态: {mods['ModB'].get('enabled')}，分类: {config.get_mod_category(mods['ModB'])}")
+        config.close()
+    finally:
+        os.chdir(old_cwd)
+
+    print("\n测试完成")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from utils.config_manager import ConfigManager
+from utils.mod_manager import ModManager
+import json
+import os
+import shutil
+import tempfile
+import time
+
+def main():
+    print("开始测试通过暂存目录禁用和启用MOD")
+
+    # 在临时目录中运行，避免影响真实配置
+    work_dir = tempfile.mkdtemp()
+    old_cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        mods_path = os.path.join(work_dir, "Content", "Paks", "~mods")
+        backup_path = os.path.join(work_dir, "modbackup")
+        os.makedirs(os.path.join(mods_path, "BigOutfit"))
+        block = os.urandom(1024 * 1024)
+        for ext in (".pak", ".ucas", ".utoc"):
+            with open(os.path.join(mods_path, "BigOutfit", "BigOutfit" + ext), "wb") as f:
+                for _ in range(256 if ext == ".ucas" else 1):
+                    f.write(block)
+        with open("config.json", "w", encoding="utf-8") as f:
+            json.dump({"mods_path": mods_path, "backup_path": backup_path}, f)
+
+        config = ConfigManager()
+        mod_manager = ModManager(config)
+        mod_info = {"name": "BigOutfit", "enabled": True, "folder_structure": True,
+                    "files": [f"BigOutfit/BigOutfit{ext}" for ext in (".pak", ".ucas", ".utoc")]}
+        config.backup_mod("BigOutfit", mod_info)
+        print(f"暂存目录: {config.get_staging_path()}，可用: {config.staging_available()}")
+
+        for _ in range(3):
+            start = time.perf_counter()
+            mod_manager.disable_mod("BigOutfit")
+            disable_ms = (time.perf_counter() - start) * 1000
+            print(f"禁用后MOD目录: {os.listdir(mods_path)}，暂存: {config.has_staged_files('BigOutfit')}")
+            start = time.perf_counter()
+            mod_manager.enable_mod("BigOutfit")
+            enable_ms = (time.perf_counter() - start) * 1000
+            print(f"禁用 {disable_ms:.1f} ms，启用 {enable_ms:.1f} ms，启用后文件: {sorted(os.listdir(os.path.join(mods_path, 'BigOutfit')))}")
+
+        # 暂存文件缺失时从备份恢复
+        mod_manager.disable_mod("BigOutfit")
+        os.remove(os.path.join(config.get_staging_dir("BigOutfit"), "BigOutfit", "BigOutfit.ucas"))
+        print(f"暂存文件缺失时启用: {mod_manager.enable_mod('BigOutfit')}，文件: {sorted(os.listdir(os.path.join(mods_path, 'BigOutfit')))}")
+        print(f"暂存目录已清理: {not config.get_staging_dir('BigOutfit').exists()}")
+
+        # 禁用后只剩暂存文件的MOD不会被当作无效记录清理
+        mod_manager.disable_mod("BigOutfit")
+        shutil.rmtree(config.get_backup_dir("BigOutfit"))
+        print(f"清理无效MOD: {config.clean_invalid_mods()}，MOD仍在: {'BigOutfit' in config.get_mods()}")
+        config.close()
+    finally:
+        os.chdir(old_cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print("测试完成")
+
+if __name__ == "__main__":
+    main()
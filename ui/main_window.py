@@ -11,6 +11,9 @@ from PySide6.QtCore import Qt, QSize, Signal, QThread, QMimeData, QPoint, QByteA
 from PySide6.QtGui import QAction, QIcon, QPixmap, QFont, QImage, QDrag, QPainter
 from utils.mod_manager import ModManager
 from utils.config_manager import ConfigManager
+from utils.mod_watcher import ModWatcher
+from utils.fs_cache import FsCache
+from utils.copy_engine import CopyOperation
 import os
 import uuid
 from pathlib import Path
@@ -105,16 +108,20 @@ class ModInfoDialog(QDialog):
 
 class ImportModThread(QThread):
     finished = Signal(object, str)  # 修改为接收任何类型的结果（单个MOD或MOD列表）
+    progress = Signal(object, object, str)  # 已复制字节数、总字节数（未知时为0）、操作名称
     
     def __init__(self, mod_manager, file_path):
         super().__init__()
         self.mod_manager = mod_manager
         self.file_path = file_path
+        # 本次导入的复制操作，取消只影响这次导入（不影响同时进行的后台备份等）
+        self.operation = CopyOperation(f"导入 {os.path.basename(str(file_path))}", progress_callback=self.progress.emit)
     
     def run(self):
         """在单独线程中执行MOD导入过程"""
         try:
-            mod_info = self.mod_manager.import_mod(self.file_path)
+            with self.mod_manager.copy_engine.operation(self.operation):
+                mod_info = self.mod_manager.import_mod(self.file_path)
             self.finished.emit(mod_info, "")
         except Exception as e:
             # 捕获所有异常，并获取详细的错误信息
@@ -151,11 +158,112 @@ class ImportModThread(QThread):
             
             self.finished.emit(None, error_msg)
 
+class BatchImportThread(QThread):
+    finished = Signal(object, str)  # {压缩包路径: MOD信息列表或异常}，错误信息
+    job_state = Signal(str, str, str, object)  # 压缩包路径、状态、说明、总体统计
+    
+    def __init__(self, mod_manager, file_paths):
+        super().__init__()
+        self.mod_manager = mod_manager
+        self.file_paths = file_paths
+        self.operation = CopyOperation(f"批量导入 {len(file_paths)} 个压缩包")
+    
+    def run(self):
+        """在单独线程中批量导入，解压在进程池中进行"""
+        try:
+            with self.mod_manager.copy_engine.operation(self.operation):
+                results = self.mod_manager.import_mods(self.file_paths, self.job_state.emit)
+            self.finished.emit(results, "")
+        except Exception as e:
+            import traceback
+            print(f"[错误] BatchImportThread.run: 批量导入失败: {e}")
+            traceback.print_exc()
+            try:
+                from utils.mod_manager import cleanup_temp_directories
+                cleanup_temp_directories()
+            except Exception as cleanup_e:
+                print(f"[错误] 清理临时文件失败: {cleanup_e}")
+            self.finished.emit(None, str(e))
+
+class BackupModsThread(QThread):
+    finished = Signal(int)  # 成功备份的MOD数
+    
+    def __init__(self, mod_manager, mod_infos):
+        super().__init__()
+        self.mod_manager = mod_manager
+        self.mod_infos = mod_infos
+    
+    def run(self):
+        """在单独线程中备份文件监视发现的新MOD（备份会同时把MOD加入配置）"""
+        count = 0
+        for mod_info in self.mod_infos:
+            try:
+                if self.mod_manager.backup_mod(mod_info.get('name', ''), mod_info):
+                    count += 1
+            except Exception as e:
+                print(f"[错误] BackupModsThread.run: 备份MOD {mod_info.get('name', '')} 失败: {e}")
+                import traceback
+                traceback.print_exc()
+        self.finished.emit(count)
+
+class BatchImportDialog(QDialog):
+    """批量导入进度：每个压缩包一行显示状态，底部显示总体进度和解压速度"""
+    
+    def __init__(self, parent, file_paths, operation):
+        super().__init__(parent)
+        self.setWindowTitle('批量导入')
+        self.setMinimumWidth(520)
+        self.items = {}
+        
+        layout = QVBoxLayout(self)
+        self.job_list = QListWidget()
+        for path in file_paths:
+            item = QListWidgetItem(os.path.basename(path))
+            self.job_list.addItem(item)
+            self.items[path] = item
+        layout.addWidget(self.job_list)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, len(file_paths))
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+        
+        self.summary_label = QLabel('')
+        layout.addWidget(self.summary_label)
+        
+        # 取消后排队的压缩包不再开始，正在解压的完成后丢弃，已导入的MOD保留
+        self.cancel_btn = QPushButton('取消')
+        self.cancel_btn.clicked.connect(operation.cancel)
+        self.cancel_btn.clicked.connect(lambda: self.cancel_btn.setEnabled(False))
+        layout.addWidget(self.cancel_btn, alignment=Qt.AlignRight)
+    
+    def update_job(self, path, state, detail, stats):
+        from utils.batch_import import JOB_STATE_NAMES
+        item = self.items.get(path)
+        if item is not None:
+            text = f"{os.path.basename(path)}  —  {JOB_STATE_NAMES.get(state, state)}"
+            if detail:
+                text += f"（{detail}）"
+            item.setText(text)
+        finished = stats['done'] + stats['failed']
+        self.progress_bar.setValue(finished)
+        self.summary_label.setText(
+            f"完成 {stats['done']} / {stats['jobs']}，失败 {stats['failed']}，"
+            f"已解压 {stats['bytes'] / (1024 * 1024):.0f} MB，{stats['mb_per_s']:.1f} MB/s")
+
 class MainWindow(QMainWindow):
+    # 文件监视在后台线程发现变化后，通过信号切回主线程处理
+    mods_changed = Signal(object)
+    
     def __init__(self, config_manager):
         super().__init__()
         self.config = config_manager
         self.mod_manager = ModManager(config_manager)
+        self.mod_watcher = None
+        # 正在后台进行的导入/备份操作数；期间文件监视发现的变化先记下，操作结束后再处理
+        self._file_operations = 0
+        self._deferred_changes = set()
+        self.mods_changed.connect(self.on_mods_changed)
         self.load_style()
         self.init_ui()
         
@@ -182,6 +290,101 @@ class MainWindow(QMainWindow):
         # 自动扫描并加载MOD
         self.auto_scan_mods()
         
+        # 监视MOD目录和备份目录，手动放入或删除的文件无需刷新即可显示
+        self.start_mod_watcher()
+        
+    def closeEvent(self, event):
+        """关闭窗口时停止文件监视"""
+        self.stop_mod_watcher()
+        super().closeEvent(event)
+        
+    def start_mod_watcher(self):
+        """启动（或在路径变化后重启）文件监视，可通过配置项watch_mods关闭"""
+        self.stop_mod_watcher()
+        if not self.config.get('watch_mods', True):
+            print("[调试] start_mod_watcher: 文件监视已关闭")
+            return
+        paths = [path for path in (self.config.get_mods_path(), self.config.get_backup_path()) if path and os.path.isdir(path)]
+        if not paths:
+            return
+        self.mod_watcher = ModWatcher(
+            paths,
+            self.mods_changed.emit,
+            debounce_ms=self.config.get('watch_debounce_ms', 500),
+            poll_interval=self.config.get('watch_poll_interval', 2.0)
+        )
+        self.mod_watcher.start()
+        
+    def stop_mod_watcher(self):
+        if self.mod_watcher is not None:
+            self.mod_watcher.stop()
+            self.mod_watcher = None
+            
+    def begin_file_operation(self):
+        """后台线程开始修改MOD目录或备份目录（导入、备份），期间暂缓处理文件监视发现的变化"""
+        self._file_operations += 1
+        
+    def end_file_operation(self):
+        """后台操作结束，所有操作都结束后处理期间记下的变化（此时导入的MOD已经在配置中）"""
+        self._file_operations = max(0, self._file_operations - 1)
+        if self._file_operations == 0 and self._deferred_changes:
+            changed_paths = self._deferred_changes
+            self._deferred_changes = set()
+            self.on_mods_changed(changed_paths)
+            
+    def on_mods_changed(self, changed_paths):
+        """增量处理文件监视发现的变化：只检查受影响的MOD，只扫描变化的目录
+        
+        导入线程先把MOD移入MOD目录再备份并加入配置，期间的变化在操作结束后再处理，不会把正在导入的MOD
+        当作手动放入的新MOD；新MOD的备份在后台线程中进行，不阻塞界面。
+        """
+        if self._file_operations:
+            print(f"[调试] on_mods_changed: 有正在进行的导入或备份，暂缓处理 {len(changed_paths)} 个路径")
+            self._deferred_changes.update(changed_paths)
+            return
+        print(f"[调试] on_mods_changed: {len(changed_paths)} 个路径发生变化")
+        try:
+            removed_count = 0
+            new_mods = []
+            with self.config.batch():
+                # 文件或备份被删除的MOD
+                affected = self.config.find_mods_by_paths(changed_paths)
+                if affected:
+                    removed_count = self.config.clean_invalid_mods(affected)
+                
+                # 新放入的MOD，与auto_scan_mods相同按名称判断是否已存在
+                found_mods, _ = self.mod_manager.scan_changed_paths(changed_paths)
+                existing_mod_names = set(mod.get('name', '') for mod in self.config.get_mods().values())
+                for mod_info in found_mods:
+                    mod_name = mod_info.get('name', '')
+                    if mod_name not in existing_mod_names:
+                        print(f"[调试] on_mods_changed: 导入新MOD: {mod_name}")
+                        existing_mod_names.add(mod_name)
+                        new_mods.append(mod_info)
+            
+            if removed_count:
+                self.refresh_mod_list()
+                self.update_status_info()
+                self.statusBar().showMessage(f'检测到文件变化：移除 {removed_count} 个MOD', 3000)
+            if new_mods:
+                self.begin_file_operation()
+                self.watcher_backup_thread = BackupModsThread(self.mod_manager, new_mods)
+                self.watcher_backup_thread.finished.connect(self.on_watcher_backup_finished)
+                self.watcher_backup_thread.start()
+        except Exception as e:
+            print(f"[错误] on_mods_changed: 处理文件变化失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+        
+    def on_watcher_backup_finished(self, new_mods_count):
+        """文件监视发现的新MOD备份完成"""
+        try:
+            self.refresh_mod_list()
+            self.update_status_info()
+            self.statusBar().showMessage(f'检测到文件变化：新增 {new_mods_count} 个MOD', 3000)
+        finally:
+            self.end_file_operation()
+        
     def load_style(self):
         """加载样式表"""
         style_file = os.path.join(os.path.dirname(__file__), 'style.qss')
@@ -326,6 +529,18 @@ class MainWindow(QMainWindow):
         backup_action.triggered.connect(self.set_backup_directory)
         settings_menu.addAction(backup_action)
         
+        verify_backup_action = QAction(self.tr('校验备份'), self)
+        verify_backup_action.triggered.connect(self.verify_backups)
+        settings_menu.addAction(verify_backup_action)
+        
+        dedup_backup_action = QAction(self.tr('备份去重'), self)
+        dedup_backup_action.triggered.connect(self.dedup_backups)
+        settings_menu.addAction(dedup_backup_action)
+        
+        deploy_mode_action = QAction(self.tr('启用方式'), self)
+        deploy_mode_action.triggered.connect(self.set_deploy_mode)
+        settings_menu.addAction(deploy_mode_action)
+        
         game_path_action = QAction(self.tr('设置游戏路径'), self)
         game_path_action.triggered.connect(self.set_game_path)
         settings_menu.addAction(game_path_action)
@@ -581,6 +796,13 @@ class MainWindow(QMainWindow):
         self.import_btn.setStyleSheet('font-size: 12px;')  # 减小字号
         self.import_btn.clicked.connect(self.import_mod)
         
+        self.batch_import_btn = QPushButton('批量导入')
+        self.batch_import_btn.setObjectName('primaryButton')
+        self.batch_import_btn.setIcon(QIcon(resource_path('icons/下载.svg')))
+        self.batch_import_btn.setIconSize(QSize(16, 16))  # 减小图标
+        self.batch_import_btn.setStyleSheet('font-size: 12px;')  # 减小字号
+        self.batch_import_btn.clicked.connect(self.batch_import_mods)
+        
         self.enable_btn = QPushButton('启用MOD')
         self.enable_btn.setIcon(QIcon(resource_path('icons/开启-开启.svg')))
         self.enable_btn.setIconSize(QSize(16, 16))  # 减小图标
@@ -614,6 +836,7 @@ class MainWindow(QMainWindow):
         
         # 将所有按钮添加到一行
         button_layout.addWidget(self.import_btn)
+        button_layout.addWidget(self.batch_import_btn)
         button_layout.addWidget(self.enable_btn)
         button_layout.addWidget(self.delete_btn)
         button_layout.addWidget(self.rename_mod_btn)
@@ -722,14 +945,17 @@ class MainWindow(QMainWindow):
                     current_category = data['full_path']
                 print(f"[调试] refresh_mods: 保存当前选中的分类: {current_category}")
                     
+        # 清理和扫描共用一个目录缓存，每个目录最多列出一次
+        fs_cache = FsCache()
+        
         # 清理无效的MOD
-        cleaned_count = self.config.clean_invalid_mods()
+        cleaned_count = self.config.clean_invalid_mods(fs_cache=fs_cache)
         if cleaned_count:
             print(f"[调试] 已清理 {cleaned_count} 个无效的MOD记录")
         
         # 搜索现有MOD
-        found_mods = self.mod_manager.scan_mods_directory()
-        print(f"[调试] 扫描到 {len(found_mods)} 个MOD文件")
+        found_mods = self.mod_manager.scan_mods_directory(fs_cache=fs_cache)
+        print(f"[调试] 扫描到 {len(found_mods)} 个MOD文件，目录缓存 {fs_cache.stats()}")
         
         # 重新加载分类和MOD列表
         self.load_categories()
@@ -737,35 +963,8 @@ class MainWindow(QMainWindow):
         
         # 尝试恢复之前选中的分类
         if current_category:
-            found = False
             print(f"[调试] refresh_mods: 尝试恢复选中的分类: {current_category}")
-            
-            for i in range(self.tree.topLevelItemCount()):
-                item = self.tree.topLevelItem(i)
-                data = item.data(0, Qt.ItemDataRole.UserRole)
-                
-                # 如果是一级分类
-                if data['type'] == 'category' and data['name'] == current_category:
-                    self.tree.setCurrentItem(item)
-                    found = True
-                    print(f"[调试] refresh_mods: 恢复选中一级分类: {current_category}")
-                    break
-                    
-                # 如果是二级分类，检查所有子项
-                if '/' in current_category and current_category.startswith(data['name'] + '/'):
-                    sub_name = current_category.split('/', 1)[1]
-                    for j in range(item.childCount()):
-                        child = item.child(j)
-                        child_data = child.data(0, Qt.ItemDataRole.UserRole)
-                        if child_data['type'] == 'subcategory' and child_data['name'] == sub_name:
-                            self.tree.setCurrentItem(child)
-                            found = True
-                            print(f"[调试] refresh_mods: 恢复选中二级分类: {current_category}")
-                            break
-                if found:
-                    break
-            
-            if not found:
+            if not self.select_category_by_name(current_category):
                 print(f"[警告] refresh_mods: 无法恢复选中的分类: {current_category}")
         
         # 刷新MOD列表
@@ -784,108 +983,63 @@ class MainWindow(QMainWindow):
         pass
         
     def load_categories(self):
-        """加载分类到目录树"""
+        """从分类树加载分类到目录树，支持任意层级"""
         self.tree.clear()
         
-        # 获取按时间戳排序的分类列表
-        categories = self.config.get_categories()
-        print(f"[调试] load_categories: 加载分类列表: {categories}")
-        
-        # 先加载所有一级分类
-        primary_categories = []
-        sub_categories = {}
-        
-        # 分离一级分类和二级分类
-        for category in categories:
-            if '/' in category:
-                main_cat, sub_cat = category.split('/', 1)
-                if main_cat not in sub_categories:
-                    sub_categories[main_cat] = []
-                sub_categories[main_cat].append(sub_cat)
-                if main_cat not in primary_categories:
-                    primary_categories.append(main_cat)
-            else:
-                if category not in primary_categories:
-                    primary_categories.append(category)
+        tree = self.config.category_tree
+        print(f"[调试] load_categories: 加载分类树，共 {len(tree)} 个分类")
         
-        # 确保默认分类在列表中
-        default_category_name = self.config.default_category_name
-        if default_category_name not in primary_categories:
-            primary_categories.insert(0, default_category_name)
-        
-        # 按照配置中的顺序添加一级分类（已经按时间戳排序）
-        ordered_primary_categories = []
-        for category in categories:
-            if '/' not in category and category not in ordered_primary_categories:
-                ordered_primary_categories.append(category)
-        
-        # 添加任何可能遗漏的一级分类
-        for category in primary_categories:
-            if category not in ordered_primary_categories:
-                ordered_primary_categories.append(category)
-        
-        # 添加一级分类到树形控件
-        for category in ordered_primary_categories:
-            item = QTreeWidgetItem([category])
-            item.setData(0, Qt.ItemDataRole.UserRole, {'type': 'category', 'name': category})
+        # 按深度优先顺序创建节点，父节点总是先于子节点创建
+        items = {}
+        for node_id in tree.walk():
+            name = tree.name(node_id)
+            parent_id = tree.parent(node_id)
+            item = QTreeWidgetItem([name])
+            if parent_id is None:
+                item.setData(0, Qt.ItemDataRole.UserRole, {'type': 'category', 'name': name, 'id': node_id, 'full_path': name})
+                self.tree.addTopLevelItem(item)
+            else:
+                item.setData(0, Qt.ItemDataRole.UserRole, {
+                    'type': 'subcategory',
+                    'name': name,
+                    'id': node_id,
+                    'full_path': tree.path(node_id)
+                })
+                items[parent_id].addChild(item)
             item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-            self.tree.addTopLevelItem(item)
-            
-            # 添加该一级分类下的二级分类
-            if category in sub_categories:
-                for sub_cat in sub_categories[category]:
-                    sub_item = QTreeWidgetItem([sub_cat])
-                    full_path = f"{category}/{sub_cat}"
-                    sub_item.setData(0, Qt.ItemDataRole.UserRole, {
-                        'type': 'subcategory', 
-                        'name': sub_cat,
-                        'full_path': full_path
-                    })
-                    sub_item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-                    item.addChild(sub_item)
-        
-        print(f"[调试] load_categories: 加载完成，一级分类: {ordered_primary_categories}，二级分类: {sub_categories}")
+            items[node_id] = item
         
-    def load_mods(self):
-        """加载分类，但不在左侧树中显示MOD"""
-        self.tree.blockSignals(True)
-        
-        # 第一遍：创建所有二级分类
-        sub_categories = {}
-        mods = self.config.get_mods()
+        print(f"[调试] load_categories: 加载完成: {self.config.get_categories()}")
         
-        for mod_id, mod_info in mods.items():
-            category = mod_info.get('category', self.config.default_category_name)
-            # 检查是否包含 / 分隔符，表示二级分类
-            if '/' in category:
-                main_cat, sub_cat = category.split('/', 1)
-                if main_cat not in sub_categories:
-                    sub_categories[main_cat] = set()
-                sub_categories[main_cat].add(sub_cat)
-        
-        # 创建二级分类项
-        for main_cat, sub_cats in sub_categories.items():
-            main_item = self.find_category_item(main_cat)
-            if main_item:
-                for sub_cat in sub_cats:
-                    sub_item = QTreeWidgetItem([sub_cat])
-                    sub_item.setData(0, Qt.ItemDataRole.UserRole, {
-                        'type': 'subcategory', 
-                        'name': sub_cat,
-                        'full_path': f"{main_cat}/{sub_cat}"
-                    })
-                    sub_item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-                    main_item.addChild(sub_item)
+    def load_mods(self):
+        """加载分类，但不在左侧树中显示MOD
         
+        MOD通过分类ID引用分类树中的节点，所有分类都已由load_categories加载，
+        这里只需确保每个MOD引用的分类都存在。
+        """
+        self.tree.blockSignals(True)
+        self.config.update_mod_categories()
         self.tree.blockSignals(False)
         
     def find_category_item(self, category_name):
-        """查找分类项"""
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            if item.data(0, Qt.ItemDataRole.UserRole)['name'] == category_name:
-                return item
-        return None
+        """按分类路径查找分类项，支持任意层级"""
+        if not category_name:
+            return None
+        parent = None
+        item = None
+        for name in category_name.split('/'):
+            item = None
+            count = parent.childCount() if parent else self.tree.topLevelItemCount()
+            for i in range(count):
+                child = parent.child(i) if parent else self.tree.topLevelItem(i)
+                data = child.data(0, Qt.ItemDataRole.UserRole)
+                if data and data.get('type') in ('category', 'subcategory') and data.get('name') == name:
+                    item = child
+                    break
+            if item is None:
+                return None
+            parent = item
+        return item
         
     def show_tree_context_menu(self, position):
         """显示目录树右键菜单"""
@@ -924,6 +1078,10 @@ class MainWindow(QMainWindow):
             delete_action.triggered.connect(lambda: self.delete_subcategory(item))
             menu.addAction(delete_action)
             
+            add_subcategory_action = QAction('添加子分类', self)
+            add_subcategory_action.triggered.connect(lambda: self.add_subcategory(item))
+            menu.addAction(add_subcategory_action)
+            
         elif data['type'] == 'mod':
             edit_action = QAction('编辑信息', self)
             edit_action.triggered.connect(lambda: self.edit_mod_info(item))
@@ -952,20 +1110,16 @@ class MainWindow(QMainWindow):
             if name in categories:
                 self.show_message('提示', f'分类 "{name}" 已存在！')
                 return
+            if '/' in name:
+                self.show_message('提示', '分类名称不能包含 /')
+                return
                 
             # 添加到配置
-            self.config.add_category(name)
-            
-            # 添加到树控件
-            item = QTreeWidgetItem([name])
-            item.setData(0, Qt.ItemDataRole.UserRole, {'type': 'category', 'name': name})
-            item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-            self.tree.addTopLevelItem(item)
-            
-            # 保存分类顺序
-            self.save_category_order()
+            if self.config.add_category(name) is None:
+                self.show_message('提示', f'无法添加分类 "{name}"')
+                return
             
-            # 重新加载分类树，确保正确的排序
+            # 重新加载分类树
             self.load_categories()
             
             # 选中新添加的分类
@@ -977,12 +1131,17 @@ class MainWindow(QMainWindow):
             print(f"[调试] add_category: 添加分类 {name} 成功")
     
     def add_subcategory(self, parent_item):
-        """添加子分类"""
-        parent_name = parent_item.data(0, Qt.ItemDataRole.UserRole)['name']
+        """添加子分类，子分类下还可以继续添加子分类"""
+        parent_data = parent_item.data(0, Qt.ItemDataRole.UserRole)
+        parent_path = parent_data.get('full_path', parent_data['name'])
         name, ok = self.input_dialog('添加子分类', '请输入子分类名称：')
         if ok and name:
+            if '/' in name:
+                self.show_message('提示', '分类名称不能包含 /')
+                return
+                
             # 创建完整分类路径
-            full_path = f"{parent_name}/{name}"
+            full_path = f"{parent_path}/{name}"
             
             # 检查分类是否已存在
             categories = self.config.get_categories()
@@ -991,97 +1150,45 @@ class MainWindow(QMainWindow):
                 return
                 
             # 添加到配置
-            categories.append(full_path)
-            self.config.set_categories(categories)
-            
-            # 添加到树形控件
-            sub_item = QTreeWidgetItem([name])
-            sub_item.setData(0, Qt.ItemDataRole.UserRole, {
-                'type': 'subcategory', 
-                'name': name,
-                'full_path': full_path
-            })
-            sub_item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-            parent_item.addChild(sub_item)
-            
-            # 展开父分类并选中新添加的子分类
-            self.tree.expandItem(parent_item)
-            self.tree.setCurrentItem(sub_item)
-            
-            # 保存分类顺序
-            self.save_category_order()
+            if self.config.add_category(full_path) is None:
+                self.show_message('提示', f'无法添加子分类 "{name}"')
+                return
+            
+            # 重新加载分类树，展开父分类并选中新添加的子分类
+            self.load_categories()
+            self.select_category_by_name(full_path)
             
             # 刷新MOD列表
             self.refresh_mod_list()
 
     def rename_category(self, item):
-        """重命名分类"""
-        old_name = item.data(0, Qt.ItemDataRole.UserRole)['name']
-        print(f"[调试] rename_category: 准备重命名分类 {old_name}")
+        """重命名分类（一级分类或任意层级的子分类）"""
+        data = item.data(0, Qt.ItemDataRole.UserRole)
+        old_name = data['name']
+        full_path = data.get('full_path', old_name)
+        print(f"[调试] rename_category: 准备重命名分类 {full_path}")
         print(f"[调试] rename_category: 当前默认分类名称: {self.config.default_category_name}")
         
         new_name, ok = self.input_dialog('重命名分类', '请输入新的分类名称：', old_name)
         
         if ok and new_name and new_name != old_name:
-            print(f"[调试] rename_category: 重命名分类 {old_name} -> {new_name}")
-            
-            # 更新config中的分类名称
-            self.config.rename_category(old_name, new_name)
-            
-            # 更新所有MOD的分类信息
-            mods = self.config.get_mods()
-            updated_count = 0
-            for mod_id, mod_info in mods.items():
-                if mod_info.get('category') == old_name:
-                    print(f"[调试] rename_category: 更新MOD {mod_id} 的分类")
-                    mod_info['category'] = new_name
-                    self.config.update_mod(mod_id, mod_info)
-                    updated_count += 1
-                # 同时更新二级分类
-                elif '/' in mod_info.get('category', '') and mod_info.get('category', '').startswith(old_name + '/'):
-                    old_subcat = mod_info.get('category')
-                    new_subcat = old_subcat.replace(old_name + '/', new_name + '/', 1)
-                    print(f"[调试] rename_category: 更新MOD {mod_id} 的子分类 {old_subcat} -> {new_subcat}")
-                    mod_info['category'] = new_subcat
-                    self.config.update_mod(mod_id, mod_info)
-                    updated_count += 1
-            
-            # 更新分类列表中的二级分类路径
-            categories = self.config.get_categories()
-            updated_categories = []
-            for cat in categories:
-                if '/' in cat and cat.startswith(old_name + '/'):
-                    new_cat = cat.replace(old_name + '/', new_name + '/', 1)
-                    updated_categories.append(new_cat)
-                elif cat == old_name:
-                    updated_categories.append(new_name)
-                else:
-                    updated_categories.append(cat)
+            print(f"[调试] rename_category: 重命名分类 {full_path} -> {new_name}")
+            if '/' in new_name:
+                self.show_message('提示', '分类名称不能包含 /')
+                return
             
-            # 确保默认分类始终存在
-            if '默认分类' not in updated_categories:
-                updated_categories.append('默认分类')
-                
-            self.config.set_categories(updated_categories)
+            # 只修改分类树中的一个节点，子分类和MOD通过ID引用，不需要逐个更新
+            if not self.config.rename_category(full_path, new_name):
+                self.show_message('提示', f'无法重命名为 "{new_name}"，同级可能已存在同名分类')
+                return
             
-            print(f"[调试] rename_category: 更新了 {updated_count} 个MOD的分类")
+            new_full_path = full_path.rsplit('/', 1)[0] + '/' + new_name if '/' in full_path else new_name
             
             # 刷新UI
             self.load_categories()
-            self.load_mods()
             
             # 确保选中重命名后的分类
-            found = False
-            for i in range(self.tree.topLevelItemCount()):
-                item = self.tree.topLevelItem(i)
-                if item.data(0, Qt.ItemDataRole.UserRole)['name'] == new_name:
-                    print(f"[调试] rename_category: 选中新分类 {new_name}")
-                    self.tree.setCurrentItem(item)
-                    self.tree.setCurrentItem(item)  # 双重设置确保触发选择事件
-                    found = True
-                    break
-            
-            if not found:
+            if not self.select_category_by_name(new_full_path):
                 # 如果找不到重命名后的分类，选择默认分类
                 self.select_default_category()
                     
@@ -1094,44 +1201,7 @@ class MainWindow(QMainWindow):
             
     def rename_subcategory(self, item):
         """重命名子分类"""
-        data = item.data(0, Qt.ItemDataRole.UserRole)
-        old_name = data['name']
-        full_path = data['full_path']
-        parent_name = full_path.split('/', 1)[0]
-        
-        new_name, ok = self.input_dialog('重命名子分类', '请输入新的子分类名称：', old_name)
-        
-        if ok and new_name and new_name != old_name:
-            print(f"[调试] rename_subcategory: 重命名子分类 {old_name} -> {new_name}")
-            
-            new_full_path = f"{parent_name}/{new_name}"
-            
-            # 更新所有MOD的分类信息
-            mods = self.config.get_mods()
-            updated_count = 0
-            for mod_id, mod_info in mods.items():
-                if mod_info.get('category') == full_path:
-                    print(f"[调试] rename_subcategory: 更新MOD {mod_id} 的分类")
-                    mod_info['category'] = new_full_path
-                    self.config.update_mod(mod_id, mod_info)
-                    updated_count += 1
-            
-            # 更新分类列表
-            categories = self.config.get_categories()
-            if full_path in categories:
-                idx = categories.index(full_path)
-                categories[idx] = new_full_path
-                self.config.set_categories(categories)
-            
-            print(f"[调试] rename_subcategory: 更新了 {updated_count} 个MOD的分类")
-            
-            # 刷新UI
-            self.load_categories()
-            self.load_mods()
-            
-            # 强制刷新MOD列表
-            self.refresh_mod_list()
-            print("[调试] rename_subcategory: 完成子分类重命名")
+        self.rename_category(item)
             
     def delete_category(self, item):
         """删除分类"""
@@ -1143,25 +1213,9 @@ class MainWindow(QMainWindow):
         reply = self.msgbox_question_zh('确认删除', f'确定要删除分类"{name}"吗？\n该分类下的MOD将移至{default_category_name}分类。')
         
         if reply == QMessageBox.StandardButton.Yes:
-            # 更新所有MOD的分类信息
-            mods = self.config.get_mods()
-            for mod_id, mod_info in mods.items():
-                if mod_info.get('category') == name:
-                    mod_info['category'] = default_category_name
-                    self.config.update_mod(mod_id, mod_info)
-                # 同时处理二级分类
-                elif '/' in mod_info.get('category', '') and mod_info.get('category', '').startswith(name + '/'):
-                    mod_info['category'] = default_category_name
-                    self.config.update_mod(mod_id, mod_info)
-            
-            # 从分类列表中删除所有相关分类
-            categories = self.config.get_categories()
-            updated_categories = []
-            for cat in categories:
-                if cat != name and not (cat.startswith(name + '/')):
-                    updated_categories.append(cat)
-            
-            self.config.set_categories(updated_categories)
+            # 删除分类及其子分类，其中的MOD移至默认分类
+            moved = self.config.delete_category(name)
+            print(f"[调试] delete_category: 删除分类 {name}，移动了 {moved} 个MOD")
             self.load_categories()
             self.load_mods()
     
@@ -1170,23 +1224,14 @@ class MainWindow(QMainWindow):
         data = item.data(0, Qt.ItemDataRole.UserRole)
         full_path = data['full_path']
         name = data['name']
-        parent_name = full_path.split('/', 1)[0]
+        parent_name = full_path.rsplit('/', 1)[0]
         
         reply = self.msgbox_question_zh('确认删除', f'确定要删除子分类"{name}"吗？\n该子分类下的MOD将移至上级分类。')
         
         if reply == QMessageBox.StandardButton.Yes:
-            # 更新所有MOD的分类信息
-            mods = self.config.get_mods()
-            for mod_id, mod_info in mods.items():
-                if mod_info.get('category') == full_path:
-                    mod_info['category'] = parent_name
-                    self.config.update_mod(mod_id, mod_info)
-            
-            # 从分类列表中删除
-            categories = self.config.get_categories()
-            if full_path in categories:
-                categories.remove(full_path)
-                self.config.set_categories(categories)
+            # 删除子分类及其下级分类，其中的MOD移至上级分类
+            moved = self.config.delete_category(full_path, move_to=parent_name)
+            print(f"[调试] delete_subcategory: 删除子分类 {full_path}，移动了 {moved} 个MOD")
             
             self.load_categories()
             self.load_mods()
@@ -1222,14 +1267,16 @@ class MainWindow(QMainWindow):
             existing_mod_names = set([mod.get('name', '') for mod in existing_mods.values()])
             
             # 导入新发现的MOD
-            new_mods_count = 0
-            for mod_info in found_mods:
-                mod_name = mod_info.get('name', '')
-                if mod_name not in existing_mod_names:
-                    print(f"[调试] auto_scan_mods: 导入新MOD: {mod_name}")
-                    # 备份MOD文件
-                    self.mod_manager.backup_mod(mod_name, mod_info)
-                    new_mods_count += 1
+            # 新MOD的登记合并为一次配置写入
+            with self.config.batch():
+                new_mods_count = 0
+                for mod_info in found_mods:
+                    mod_name = mod_info.get('name', '')
+                    if mod_name not in existing_mod_names:
+                        print(f"[调试] auto_scan_mods: 导入新MOD: {mod_name}")
+                        # 备份MOD文件
+                        self.mod_manager.backup_mod(mod_name, mod_info)
+                        new_mods_count += 1
             
             if new_mods_count > 0:
                 print(f"[调试] auto_scan_mods: 导入了 {new_mods_count} 个新MOD")
@@ -1278,16 +1325,96 @@ class MainWindow(QMainWindow):
             progress_dialog.setWindowModality(Qt.WindowModal)
             progress_dialog.setMinimumDuration(500)  # 显示对话框前的延迟时间（毫秒）
             progress_dialog.setAutoClose(False)
-            progress_dialog.setCancelButton(None)  # 禁用取消按钮
+            progress_dialog.setAutoReset(False)
             
             # 更新状态栏
             self.statusBar().showMessage(self.tr('正在导入MOD...'))
             
             # 创建并启动导入线程
             self.import_thread = ImportModThread(self.mod_manager, file_path)
-            self.import_thread.finished.connect(lambda mod_info, error: self.on_import_mod_finished(mod_info, error, progress_dialog))
+            operation = self.import_thread.operation
+            # 取消时复制引擎在下一块之前停止，并删除复制了一半的文件
+            progress_dialog.canceled.connect(operation.cancel)
+            self.import_thread.progress.connect(lambda done, total, label: self.on_copy_progress(progress_dialog, operation, done, total, label))
+            self.import_thread.finished.connect(lambda mod_info, error: self.on_import_thread_finished(mod_info, error, progress_dialog))
+            self.begin_file_operation()
             self.import_thread.start()
 
+    def batch_import_mods(self):
+        """一次选择多个压缩包导入，解压并行进行"""
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            '选择MOD文件',
+            '',
+            '压缩文件 (*.zip *.rar *.7z)'
+        )
+        file_paths = [path for path in file_paths if os.path.exists(path)]
+        if not file_paths:
+            return
+        
+        self.batch_import_thread = BatchImportThread(self.mod_manager, file_paths)
+        dialog = BatchImportDialog(self, file_paths, self.batch_import_thread.operation)
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.show()
+        self.statusBar().showMessage(self.tr('正在批量导入MOD...'))
+        self.import_btn.setEnabled(False)
+        self.batch_import_btn.setEnabled(False)
+        
+        self.batch_import_thread.job_state.connect(dialog.update_job)
+        self.batch_import_thread.finished.connect(lambda results, error: self.on_batch_import_finished(results, error, dialog))
+        self.begin_file_operation()
+        self.batch_import_thread.start()
+
+    def on_batch_import_finished(self, results, error, dialog):
+        """批量导入完成：成功导入的MOD按单个导入相同的方式加入分类并启用，再汇总失败的压缩包"""
+        try:
+            self._on_batch_import_finished(results, error, dialog)
+        finally:
+            self.end_file_operation()
+
+    def _on_batch_import_finished(self, results, error, dialog):
+        dialog.close()
+        self.import_btn.setEnabled(True)
+        self.batch_import_btn.setEnabled(True)
+        if error:
+            self.statusBar().showMessage(self.tr('导入MOD失败'), 3000)
+            self.show_message(self.tr('导入MOD失败'), error, QMessageBox.Critical)
+            return
+        
+        mod_infos = []
+        failures = []
+        for path, result in results.items():
+            if isinstance(result, Exception):
+                failures.append(f"{os.path.basename(path)}: {result}")
+            else:
+                mod_infos.extend(result)
+        stats = self.mod_manager.last_batch_stats or {}
+        print(f"[调试] on_batch_import_finished: {len(mod_infos)} 个MOD，{len(failures)} 个压缩包失败，"
+              f"{stats.get('mb_per_s', 0):.1f} MB/s")
+        
+        if mod_infos:
+            self.on_import_mod_finished(mod_infos, "")
+        if failures:
+            self.show_message(self.tr('导入MOD失败'), '\n'.join(failures), QMessageBox.Warning)
+
+    def on_import_thread_finished(self, mod_info, error, progress_dialog):
+        """导入线程结束：导入的MOD加入配置后，再处理导入期间文件监视发现的变化"""
+        try:
+            self.on_import_mod_finished(mod_info, error, progress_dialog)
+        finally:
+            self.end_file_operation()
+
+    def on_copy_progress(self, progress_dialog, operation, done, total, label):
+        """在进度对话框中显示复制进度和速度"""
+        rate = operation.current_rate()
+        done_mb = done / (1024 * 1024)
+        if total:
+            progress_dialog.setRange(0, 1000)
+            progress_dialog.setValue(min(1000, int(done * 1000 / total)))
+            progress_dialog.setLabelText(f"{label}\n{done_mb:.0f} / {total / (1024 * 1024):.0f} MB，{rate:.1f} MB/s")
+        else:
+            progress_dialog.setLabelText(f"{label}\n已复制 {done_mb:.0f} MB，{rate:.1f} MB/s")
+
     def on_import_mod_finished(self, mod_info, error, progress_dialog=None):
         """处理MOD导入完成事件"""
         # 关闭进度对话框
@@ -1329,34 +1456,36 @@ class MainWindow(QMainWindow):
         error_count = 0
                 
         # 导入所有MOD
-        for info in mod_infos:
-            try:
-                # 获取MOD ID
-                mod_id = info.get('name', str(uuid.uuid4()))
+        # 导入的MOD合并为一次配置写入
+        with self.config.batch():
+            for info in mod_infos:
+                try:
+                    # 获取MOD ID
+                    mod_id = info.get('name', str(uuid.uuid4()))
                     
-                # 设置MOD分类为当前选中的分类
-                info['category'] = current_category
-                print(f"[调试] on_import_mod_finished: 设置MOD {mod_id} 分类为: {current_category}")
+                    # 设置MOD分类为当前选中的分类
+                    info['category'] = current_category
+                    print(f"[调试] on_import_mod_finished: 设置MOD {mod_id} 分类为: {current_category}")
                     
-                # 添加MOD到配置
-                self.config.add_mod(mod_id, info)
+                    # 添加MOD到配置
+                    self.config.add_mod(mod_id, info)
                     
-                # 启用MOD
-                try:
-                    enable_result = self.mod_manager.enable_mod(mod_id)
-                    if not enable_result:
-                        print(f"[警告] on_import_mod_finished: 启用MOD {mod_id} 失败")
+                    # 启用MOD
+                    try:
+                        enable_result = self.mod_manager.enable_mod(mod_id)
+                        if not enable_result:
+                            print(f"[警告] on_import_mod_finished: 启用MOD {mod_id} 失败")
+                            error_count += 1
+                    except Exception as e:
+                        print(f"[错误] on_import_mod_finished: 启用MOD {mod_id} 时出错: {e}")
                         error_count += 1
+                        
+                    imported_mod_ids.append(mod_id)
                 except Exception as e:
-                    print(f"[错误] on_import_mod_finished: 启用MOD {mod_id} 时出错: {e}")
+                    print(f"[错误] on_import_mod_finished: 处理MOD导入结果时出错: {e}")
+                    import traceback
+                    traceback.print_exc()
                     error_count += 1
-                        
-                imported_mod_ids.append(mod_id)
-            except Exception as e:
-                print(f"[错误] on_import_mod_finished: 处理MOD导入结果时出错: {e}")
-                import traceback
-                traceback.print_exc()
-                error_count += 1
                     
         # 刷新MOD列表
         self.refresh_mod_list()
@@ -1649,6 +1778,7 @@ class MainWindow(QMainWindow):
         if path:
             self.config.set_mods_path(path)
             self.mod_manager.mods_path = Path(path)
+            self.start_mod_watcher()
             
             # 检查是否为特定路径，并且是否为首次设置
             expected_path = "steam\\steamapps\\common\\StellarBlade\\SB\\Content\\Paks\\~mods"
@@ -1658,11 +1788,13 @@ class MainWindow(QMainWindow):
             
             # 扫描现有MOD
             found_mods = self.mod_manager.scan_mods_directory()
-            for mod_info in found_mods:
-                mod_id = str(uuid.uuid4())
-                self.config.add_mod(mod_id, mod_info)
-                # 备份MOD文件
-                self.config.backup_mod(mod_id, mod_info)
+            # 新MOD的登记合并为一次配置写入
+            with self.config.batch():
+                for mod_info in found_mods:
+                    mod_id = str(uuid.uuid4())
+                    self.config.add_mod(mod_id, mod_info)
+                    # 备份MOD文件
+                    self.config.backup_mod(mod_id, mod_info)
                 
             self.load_mods()
             self.show_message(self.tr('成功'), f'已找到 {len(found_mods)} 个MOD文件')
@@ -1717,35 +1849,16 @@ class MainWindow(QMainWindow):
         # 检查是否是分类或子分类
         if data['type'] == 'category':
             name = data['name']
-            if name == '默认分类':
+            if name == self.config.default_category_name:
                 QMessageBox.warning(self, self.tr('提示'), self.tr('默认分类无法删除'))
                 return
                 
             reply = self.msgbox_question_zh(self.tr('确认删除'), self.tr(f'确定要删除分类"{name}"吗？\n该分类下的MOD将移至默认分类。'))
             if reply == QMessageBox.StandardButton.Yes:
                 print(f"[调试] delete_selected_category: 删除分类: {name}")
-                # 更新所有MOD的分类信息
-                mods = self.config.get_mods()
-                for mod_id, mod_info in mods.items():
-                    if mod_info.get('category') == name:
-                        mod_info['category'] = '默认分类'
-                        self.config.update_mod(mod_id, mod_info)
-                        print(f"[调试] delete_selected_category: 将MOD {mod_id} 从分类 {name} 移至默认分类")
-                    # 同时处理二级分类
-                    elif '/' in mod_info.get('category', '') and mod_info.get('category', '').startswith(name + '/'):
-                        mod_info['category'] = '默认分类'
-                        self.config.update_mod(mod_id, mod_info)
-                        print(f"[调试] delete_selected_category: 将子分类MOD {mod_id} 从分类 {mod_info.get('category')} 移至默认分类")
-                
-                # 从分类列表中删除所有相关分类
-                categories = self.config.get_categories()
-                updated_categories = []
-                for cat in categories:
-                    if cat != name and not (cat.startswith(name + '/')):
-                        updated_categories.append(cat)
-                
-                self.config.set_categories(updated_categories)
-                print(f"[调试] delete_selected_category: 更新分类列表，从 {len(categories)} 个分类减少到 {len(updated_categories)} 个分类")
+                # 删除分类及其子分类，其中的MOD移至默认分类
+                moved = self.config.delete_category(name)
+                print(f"[调试] delete_selected_category: 将 {moved} 个MOD移至默认分类")
                 
                 # 重新加载分类和MOD
                 self.load_categories()
@@ -1800,6 +1913,7 @@ class MainWindow(QMainWindow):
             '搜索:': 'Search:',
             '输入MOD名称或描述...': 'Enter MOD name or description...',
             '导入MOD': 'Import MOD',
+            '批量导入': 'Batch Import',
             '启用MOD': 'Enable MOD',
             '禁用MOD': 'Disable MOD',
             '删除MOD': 'Delete MOD',
@@ -1922,6 +2036,7 @@ class MainWindow(QMainWindow):
         
         # 更新按钮
         self.import_btn.setText(tr('导入MOD'))
+        self.batch_import_btn.setText(tr('批量导入'))
         self.enable_btn.setText(tr('启用MOD') if not self.enable_btn.isChecked() else tr('禁用MOD'))
         self.delete_btn.setText(tr('删除MOD'))
         self.rename_mod_btn.setText(tr('修改名称'))
@@ -1989,6 +2104,7 @@ class MainWindow(QMainWindow):
         
         # 确保C3区按钮保持正确的样式
         self.import_btn.setObjectName('primaryButton')
+        self.batch_import_btn.setObjectName('primaryButton')
         self.delete_btn.setObjectName('dangerButton')
         self.rename_mod_btn.setObjectName('primaryButton')
         self.change_preview_btn.setObjectName('primaryButton')
@@ -2004,7 +2120,7 @@ class MainWindow(QMainWindow):
             return
             
         # 获取MOD所在的分类
-        category = mod_info.get('category', '默认分类')
+        category = self.config.get_mod_category(mod_info)
         
         # 选中分类
         self.select_category_by_name(category)
@@ -2042,14 +2158,72 @@ class MainWindow(QMainWindow):
             if not backup_dir.exists():
                 backup_dir.mkdir(parents=True, exist_ok=True)
             self.config.set_backup_path(str(backup_dir))
+            self.start_mod_watcher()
             self.show_message(self.tr('成功'), f'备份目录已设置为: {current_backup_path}')
         else:
             # 用户选择自定义目录
             backup_path = QFileDialog.getExistingDirectory(self, self.tr('选择备份目录（用于存放MOD压缩包和解压文件）'))
             if backup_path:
                 self.config.set_backup_path(backup_path)
+                self.start_mod_watcher()
                 self.show_message(self.tr('成功'), f'备份目录已设置为: {backup_path}')
 
+    def verify_backups(self):
+        """检查备份索引中的文件清单与备份目录是否一致"""
+        try:
+            problems = self.config.verify_backups()
+            if not problems:
+                self.show_message(self.tr('校验备份'), self.tr('所有备份都与索引一致。'))
+                return
+            lines = []
+            for mod_id, issues in problems.items():
+                lines.append(f"{mod_id}:")
+                lines.extend(f"    {issue}" for issue in issues)
+            self.show_message(self.tr('校验备份'), self.tr(f'{len(problems)} 个MOD的备份与索引不一致：') + "\n\n" + "\n".join(lines), QMessageBox.Warning)
+            reply = self.msgbox_question_zh('校验备份', '是否按备份目录的当前内容更新索引？')
+            if reply == QMessageBox.StandardButton.Yes:
+                with self.config.batch():
+                    for mod_id in problems:
+                        self.config.refresh_backup_index(mod_id)
+        except Exception as e:
+            print(f"[错误] verify_backups: 校验备份失败: {e}")
+            import traceback
+            traceback.print_exc()
+            self.show_message(self.tr('错误'), self.tr(f'校验备份失败: {e}'), QMessageBox.Critical)
+
+    def set_deploy_mode(self):
+        """选择启用MOD时把备份文件放到MOD目录的方式"""
+        labels = {
+            "auto": self.tr('自动（同一磁盘上使用写时复制，否则复制）'),
+            "hardlink": self.tr('硬链接（修改MOD目录中的文件会同时改动备份）'),
+            "reflink": self.tr('写时复制（Btrfs、XFS、APFS等）'),
+            "symlink": self.tr('符号链接（Windows上需要开发者模式或管理员权限）'),
+            "copy": self.tr('复制'),
+        }
+        modes = list(labels)
+        current = self.config.get_deploy_mode()
+        label, ok = QInputDialog.getItem(self, self.tr('启用方式'), self.tr('启用MOD时如何放置文件：'),
+                                         [labels[mode] for mode in modes], modes.index(current), False)
+        if ok:
+            mode = modes[[labels[mode] for mode in modes].index(label)]
+            self.config.set_deploy_mode(mode)
+            print(f"[调试] set_deploy_mode: 启用方式已设置为 {mode}")
+
+    def dedup_backups(self):
+        """把已有备份收入去重对象库，内容相同的文件只保留一份"""
+        try:
+            if not self.config.object_store.enabled:
+                self.show_message(self.tr('备份去重'), self.tr('备份目录所在的磁盘不支持硬链接，无法去重。'), QMessageBox.Warning)
+                return
+            result = self.config.migrate_backups_to_store()
+            saved_mb = result["bytes_saved"] / (1024 * 1024)
+            self.show_message(self.tr('备份去重'), self.tr(f'已处理 {result["files"]} 个备份文件，其中 {result["duplicates"]} 个重复，节省 {saved_mb:.1f} MB。'))
+        except Exception as e:
+            print(f"[错误] dedup_backups: 备份去重失败: {e}")
+            import traceback
+            traceback.print_exc()
+            self.show_message(self.tr('错误'), self.tr(f'备份去重失败: {e}'), QMessageBox.Critical)
+
     def on_tab_clicked(self, tab_name):
         """处理标签页点击事件"""
         # 更新标签页状态
@@ -2093,14 +2267,6 @@ class MainWindow(QMainWindow):
         mods = self.config.get_mods()
         print(f"[调试] refresh_mod_list: 当前MOD总数: {len(mods)}")
         
-        # 记录所有MOD的分类情况，用于调试
-        mod_categories = {}
-        for mod_id, mod_info in mods.items():
-            mod_categories[mod_id] = mod_info.get('category', self.config.default_category_name)
-        print(f"[调试] refresh_mod_list: 当前所有MOD的分类：")
-        for mod_id, category in mod_categories.items():
-            print(f"  - {mod_id}: {category}")
-        
         # 获取当前选中的分类
         selected_category = None
         if cat_type == 'category':
@@ -2142,23 +2308,20 @@ class MainWindow(QMainWindow):
         # 检查是否处于编辑模式
         is_edit_mode = self.edit_mode_cb.isChecked()
         
+        # 通过索引只取当前分类和选项卡下的MOD
+        enabled_filter = None
+        if current_tab == 'enabled_tab':
+            enabled_filter = True
+        elif current_tab == 'disabled_tab':
+            enabled_filter = False
+        
         # 添加符合条件的MOD到列表
-        for mod_id, mod_info in mods.items():
+        for mod_id in self.config.mods_in_category(selected_category, enabled=enabled_filter):
             # 跳过已添加的MOD
             if mod_id in added_mod_ids:
                 continue
-                
-            # 检查分类
-            mod_category = mod_info.get('category', self.config.default_category_name)
-            if mod_category != selected_category:
-                continue
-                
-            # 检查启用状态
+            mod_info = mods[mod_id]
             is_enabled = mod_info.get('enabled', False)
-            if current_tab == 'enabled_tab' and not is_enabled:
-                continue
-            if current_tab == 'disabled_tab' and is_enabled:
-                continue
                 
             # 检查搜索文本
             if search_text:
@@ -2285,11 +2448,10 @@ class MainWindow(QMainWindow):
             if new_mod_id not in mods:
                 print(f"[警告] rename_mod: 新MOD ID {new_mod_id} 不在MOD列表中，尝试查找...")
                 # 尝试通过原始名称找到MOD
-                for mid, minfo in mods.items():
-                    if minfo.get('real_name') == mod_info.get('real_name'):
-                        new_mod_id = mid
-                        print(f"[调试] rename_mod: 找到匹配的MOD ID: {new_mod_id}")
-                        break
+                found_mod_id = self.config.find_mod_by_real_name(mod_info.get('real_name'))
+                if found_mod_id:
+                    new_mod_id = found_mod_id
+                    print(f"[调试] rename_mod: 找到匹配的MOD ID: {new_mod_id}")
             
             # 获取更新后的MOD信息
             updated_mod_info = mods.get(new_mod_id)
@@ -2621,12 +2783,13 @@ class MainWindow(QMainWindow):
             print(f"[调试] on_tree_drop_event: 准备将 {mod_count} 个MOD移动到分类 {target_category}")
             
             # 批量更新MOD分类
-            for mod_id in mod_ids:
-                if self.config.set_mod_category(mod_id, target_category):
-                    processed_count += 1
-                    print(f"[调试] on_tree_drop_event: 成功将MOD {mod_id} 移动到分类 {target_category}")
-                else:
-                    print(f"[警告] on_tree_drop_event: 无法将MOD {mod_id} 移动到分类 {target_category}")
+            with self.config.batch():
+                for mod_id in mod_ids:
+                    if self.config.set_mod_category(mod_id, target_category):
+                        processed_count += 1
+                        print(f"[调试] on_tree_drop_event: 成功将MOD {mod_id} 移动到分类 {target_category}")
+                    else:
+                        print(f"[警告] on_tree_drop_event: 无法将MOD {mod_id} 移动到分类 {target_category}")
             
             # 刷新UI
             self.load_mods()  # 重新加载B区树
@@ -2646,8 +2809,7 @@ class MainWindow(QMainWindow):
             event.accept()
             return
         
-        # 否则处理目录树内部拖拽
-        # 记录拖拽前的信息
+        # 否则处理目录树内部拖拽：只移动分类树中的一个节点
         source_item = self.tree.currentItem()
         if not source_item:
             print("[调试] on_tree_drop_event: 没有选中的源项，拒绝拖拽")
@@ -2662,460 +2824,120 @@ class MainWindow(QMainWindow):
             
         source_type = source_data.get('type')
         source_name = source_data.get('name', '')
+        source_path = source_data.get('full_path', source_name)
         
         # 检查是否为默认分类，不允许拖拽默认分类
-        if source_type == 'category' and source_name == '默认分类':
+        if source_type == 'category' and source_name == self.config.default_category_name:
             print("[调试] on_tree_drop_event: 默认分类不允许拖拽")
             self.show_message('提示', '默认分类不允许拖拽')
             event.ignore()
             return
             
-        print(f"[调试] on_tree_drop_event: 拖拽项: 类型={source_type}, 名称={source_name}")
+        print(f"[调试] on_tree_drop_event: 拖拽项: 类型={source_type}, 路径={source_path}")
         
         # 获取放置目标
         drop_position = event.pos()
         target_item = self.tree.itemAt(drop_position)
-        if not target_item:
-            print("[调试] on_tree_drop_event: 没有有效的目标项，拒绝拖放操作")
-            event.ignore()
-            return
-            
-        target_data = target_item.data(0, Qt.ItemDataRole.UserRole)
+        target_data = target_item.data(0, Qt.ItemDataRole.UserRole) if target_item else None
+        
         if not target_data:
-            print("[调试] on_tree_drop_event: 目标项没有关联数据，拒绝拖放操作")
-            event.ignore()
-            return
+            # 拖到空白处，移到根级末尾
+            new_parent = None
+            index = None
+        else:
+            target_path = target_data.get('full_path', target_data.get('name', ''))
+            target_parent = target_path.rsplit('/', 1)[0] if '/' in target_path else None
+            target_index = self.config.category_tree.index_of(self.config.get_category_id(target_path))
+            
+            # 根据放置位置判断：上边缘插到目标前面，下边缘插到目标后面，中间成为目标的子分类
+            rect = self.tree.visualItemRect(target_item)
+            offset = drop_position.y() - rect.top()
+            margin = max(2, rect.height() // 4)
+            if offset < margin:
+                new_parent, index = target_parent, target_index
+            elif offset > rect.height() - margin:
+                new_parent, index = target_parent, target_index + 1
+            else:
+                new_parent, index = target_path, None
             
-        target_type = target_data.get('type')
-        target_name = target_data.get('name', '')
-        
-        # 保存所有当前分类和MOD的分类关系
-        all_categories = []
-        mod_categories = {}
+            # 同级内向后移动时，移除源节点后目标位置前移一位
+            source_parent = source_path.rsplit('/', 1)[0] if '/' in source_path else None
+            if index is not None and new_parent == source_parent:
+                source_index = self.config.category_tree.index_of(self.config.get_category_id(source_path))
+                if source_index < index:
+                    index -= 1
         
-        # 保存所有分类
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            cat_name = item.text(0)
-            all_categories.append(cat_name)
-            
-            # 收集该一级分类下的所有二级分类
-            for j in range(item.childCount()):
-                child = item.child(j)
-                if child.data(0, Qt.ItemDataRole.UserRole)['type'] == 'subcategory':
-                    sub_cat_name = child.data(0, Qt.ItemDataRole.UserRole)['name']
-                    full_path = f"{cat_name}/{sub_cat_name}"
-                    all_categories.append(full_path)
-        
-        # 保存所有MOD的分类关系
-        mods = self.config.get_mods()
-        for mod_id, mod_info in mods.items():
-            mod_categories[mod_id] = mod_info.get('category', '默认分类')
-        
-        print(f"[调试] on_tree_drop_event: 拖拽前的分类列表: {all_categories}")
-        print(f"[调试] on_tree_drop_event: 保存了 {len(mod_categories)} 个MOD的分类关系")
-        
-        # 执行标准的拖放操作
-        QTreeWidget.dropEvent(self.tree, event)
-        
-        # 立即更新树项数据，确保所有项都有正确的数据
-        self.update_tree_items_data()
-        
-        # 确保默认分类存在
-        default_category_exists = False
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            if item.text(0) == '默认分类':
-                default_category_exists = True
-                break
-                
-        if not default_category_exists:
-            print("[调试] on_tree_drop_event: 恢复默认分类")
-            default_item = QTreeWidgetItem(['默认分类'])
-            default_item.setData(0, Qt.ItemDataRole.UserRole, {'type': 'category', 'name': '默认分类'})
-            default_item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-            self.tree.insertTopLevelItem(0, default_item)  # 插入到列表最前面
+        if not self.config.move_category(source_path, new_parent, index):
+            self.show_message('提示', '无法移动到该位置')
+            event.ignore()
+            return
         
-        # 保存分类顺序，这会触发按时间戳排序
-        self.save_category_order()
+        event.accept()
         
-        # 刷新分类树，确保分类按时间戳排序显示
+        # 刷新分类树并选中移动后的分类
+        new_path = f"{new_parent}/{source_name}" if new_parent else source_name
         self.load_categories()
-        
-        # 如果是将分类拖入其他分类（成为子分类），需要特殊处理
-        if source_type == 'category':
-            # 检查源分类是否还在顶层
-            found_in_top_level = False
-            for i in range(self.tree.topLevelItemCount()):
-                if self.tree.topLevelItem(i).text(0) == source_name:
-                    found_in_top_level = True
-                    break
-            
-            # 如果不在顶层，说明被拖入了其他分类，需要将其转为二级分类
-            if not found_in_top_level:
-                print(f"[调试] on_tree_drop_event: 分类 {source_name} 被拖入其他分类，转为二级分类")
-                
-                # 查找该分类现在的位置
-                for i in range(self.tree.topLevelItemCount()):
-                    parent_item = self.tree.topLevelItem(i)
-                    parent_name = parent_item.text(0)
-                    
-                    # 检查是否是默认分类，不允许子分类下有默认分类
-                    if source_name == '默认分类':
-                        # 将默认分类还原为顶级分类
-                        for j in range(parent_item.childCount()):
-                            child = parent_item.child(j)
-                            if child.text(0) == '默认分类':
-                                parent_item.removeChild(child)
-                                
-                        default_item = QTreeWidgetItem(['默认分类'])
-                        default_item.setData(0, Qt.ItemDataRole.UserRole, {'type': 'category', 'name': '默认分类'})
-                        default_item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-                        self.tree.insertTopLevelItem(0, default_item)
-                        print("[调试] on_tree_drop_event: 将默认分类恢复为顶级分类")
-                        continue
-                        
-                    for j in range(parent_item.childCount()):
-                        child = parent_item.child(j)
-                        if child.text(0) == source_name and child.data(0, Qt.ItemDataRole.UserRole)['type'] == 'category':
-                            # 找到了被拖入的分类，将其转为二级分类
-                            full_path = f"{parent_name}/{source_name}"
-                            
-                            # 更新数据
-                            child.setData(0, Qt.ItemDataRole.UserRole, {
-                                'type': 'subcategory',
-                                'name': source_name,
-                                'full_path': full_path
-                            })
-                            
-                            # 更新该分类下所有MOD的分类信息
-                            updated_count = 0
-                            for mod_id, category in mod_categories.items():
-                                if category == source_name:
-                                    mod_info = mods.get(mod_id)
-                                    if mod_info:
-                                        mod_info['category'] = full_path
-                                        self.config.update_mod(mod_id, mod_info)
-                                        updated_count += 1
-                                        print(f"[调试] on_tree_drop_event: 更新MOD {mod_id} 的分类为 {full_path}")
-                            
-                            print(f"[调试] on_tree_drop_event: 已更新 {updated_count} 个MOD的分类信息")
-                            break
+        self.select_category_by_name(new_path)
         
         # 刷新MOD列表
         self.refresh_mod_list()
     
     def select_category_by_name(self, category_name):
-        """根据分类名称选择分类"""
+        """根据分类路径选择分类，支持任意层级"""
         if not category_name:
             return False
             
-        # 检查是否是二级分类
-        if '/' in category_name:
-            parent_name, sub_name = category_name.split('/', 1)
-            # 查找父分类
-            for i in range(self.tree.topLevelItemCount()):
-                parent_item = self.tree.topLevelItem(i)
-                if parent_item.text(0) == parent_name:
-                    # 展开父分类
-                    self.tree.expandItem(parent_item)
-                    # 查找子分类
-                    for j in range(parent_item.childCount()):
-                        child = parent_item.child(j)
-                        if child.data(0, Qt.ItemDataRole.UserRole)['type'] == 'subcategory' and child.text(0) == sub_name:
-                            self.tree.setCurrentItem(child)
-                            print(f"[调试] select_category_by_name: 选中二级分类 {category_name}")
-                            return True
-        else:
-            # 查找一级分类
-            for i in range(self.tree.topLevelItemCount()):
-                item = self.tree.topLevelItem(i)
-                if item.text(0) == category_name:
-                    self.tree.setCurrentItem(item)
-                    print(f"[调试] select_category_by_name: 选中一级分类 {category_name}")
-                    return True
-                    
-        print(f"[警告] select_category_by_name: 找不到分类 {category_name}")
-        return False
-
-    def update_tree_items_data(self):
-        """更新目录树中所有项目的数据"""
-        print("[调试] update_tree_items_data: 开始更新树形控件数据")
-        
-        # 保存当前分类列表，用于检测是否有分类被删除
-        current_categories = set()
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            current_categories.add(item.text(0))
-            
-            # 检查二级分类
-            for j in range(item.childCount()):
-                child = item.child(j)
-                child_data = child.data(0, Qt.ItemDataRole.UserRole)
-                if child_data and child_data.get('type') == 'subcategory':
-                    full_path = f"{item.text(0)}/{child.text(0)}"
-                    current_categories.add(full_path)
-        
-        # 获取配置中的所有分类
-        config_categories = set(self.config.get_categories())
-        
-        # 检查是否有分类在树中消失
-        missing_categories = config_categories - current_categories
-        if missing_categories:
-            print(f"[警告] update_tree_items_data: 发现消失的分类: {missing_categories}")
-            
-            # 恢复消失的分类
-            for cat in missing_categories:
-                if '/' in cat:
-                    # 二级分类
-                    main_cat, sub_cat = cat.split('/', 1)
-                    # 查找父分类
-                    parent_item = None
-                    for i in range(self.tree.topLevelItemCount()):
-                        if self.tree.topLevelItem(i).text(0) == main_cat:
-                            parent_item = self.tree.topLevelItem(i)
-                            break
-                    
-                    # 如果父分类存在，添加子分类
-                    if parent_item:
-                        sub_item = QTreeWidgetItem([sub_cat])
-                        sub_item.setData(0, Qt.ItemDataRole.UserRole, {
-                            'type': 'subcategory', 
-                            'name': sub_cat,
-                            'full_path': cat
-                        })
-                        sub_item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-                        parent_item.addChild(sub_item)
-                        print(f"[调试] update_tree_items_data: 恢复二级分类 {cat}")
-                    else:
-                        # 如果父分类不存在，先创建父分类
-                        parent_item = QTreeWidgetItem([main_cat])
-                        parent_item.setData(0, Qt.ItemDataRole.UserRole, {'type': 'category', 'name': main_cat})
-                        parent_item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-                        self.tree.addTopLevelItem(parent_item)
-                        
-                        # 然后添加子分类
-                        sub_item = QTreeWidgetItem([sub_cat])
-                        sub_item.setData(0, Qt.ItemDataRole.UserRole, {
-                            'type': 'subcategory', 
-                            'name': sub_cat,
-                            'full_path': cat
-                        })
-                        sub_item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-                        parent_item.addChild(sub_item)
-                        print(f"[调试] update_tree_items_data: 恢复一级分类 {main_cat} 和二级分类 {cat}")
-                else:
-                    # 一级分类
-                    item = QTreeWidgetItem([cat])
-                    item.setData(0, Qt.ItemDataRole.UserRole, {'type': 'category', 'name': cat})
-                    item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-                    self.tree.addTopLevelItem(item)
-                    print(f"[调试] update_tree_items_data: 恢复一级分类 {cat}")
-        
-        # 更新一级分类
-        default_category_exists = False
+        item = self.find_category_item(category_name)
+        if item is None:
+            print(f"[警告] select_category_by_name: 找不到分类 {category_name}")
+            return False
         
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            cat_name = item.text(0)
-            
-            # 检查是否是默认分类
-            if cat_name == '默认分类':
-                default_category_exists = True
-            
-            # 确保一级分类有正确的数据
-            item.setData(0, Qt.ItemDataRole.UserRole, {
-                'type': 'category', 
-                'name': cat_name
-            })
-            
-            # 更新二级分类
-            for j in range(item.childCount()):
-                child = item.child(j)
-                child_data = child.data(0, Qt.ItemDataRole.UserRole)
-                child_type = child_data.get('type') if child_data else None
-                
-                # 检查是否是默认分类被拖为二级分类
-                if child.text(0) == '默认分类':
-                    # 将这个默认分类子项移除
-                    item.removeChild(child)
-                    j -= 1  # 调整循环计数
-                    continue
-                
-                # 如果是二级分类或者被拖拽的一级分类
-                if child_type in ['subcategory', 'category']:
-                    sub_cat_name = child.text(0)
-                    # 更新二级分类数据
-                    full_path = f"{cat_name}/{sub_cat_name}"
-                    child.setData(0, Qt.ItemDataRole.UserRole, {
-                        'type': 'subcategory',
-                        'name': sub_cat_name,
-                        'full_path': full_path
-                    })
-                    
-                    # 更新该二级分类下的所有MOD
-                    for k in range(child.childCount()):
-                        mod_item = child.child(k)
-                        mod_data = mod_item.data(0, Qt.ItemDataRole.UserRole)
-                        if mod_data and mod_data.get('type') == 'mod':
-                            mod_id = mod_data.get('id')
-                            mod_info = mod_data.get('info', {})
-                            # 更新MOD的分类信息
-                            mod_info['category'] = full_path
-                            self.config.update_mod(mod_id, mod_info)
-                            # 更新MOD项的数据
-                            mod_item.setData(0, Qt.ItemDataRole.UserRole, {
-                                'type': 'mod',
-                                'id': mod_id,
-                                'info': mod_info
-                            })
-                
-                # 如果是MOD
-                elif child_type == 'mod':
-                    mod_id = child_data.get('id')
-                    mod_info = child_data.get('info', {})
-                    # 更新MOD的分类信息
-                    mod_info['category'] = cat_name
-                    self.config.update_mod(mod_id, mod_info)
-                    # 更新MOD项的数据
-                    child.setData(0, Qt.ItemDataRole.UserRole, {
-                        'type': 'mod',
-                        'id': mod_id,
-                        'info': mod_info
-                    })
-        
-        # 如果默认分类不存在，添加默认分类
-        if not default_category_exists:
-            print("[调试] update_tree_items_data: 添加默认分类")
-            default_item = QTreeWidgetItem(['默认分类'])
-            default_item.setData(0, Qt.ItemDataRole.UserRole, {'type': 'category', 'name': '默认分类'})
-            default_item.setIcon(0, QIcon(resource_path('icons/文件夹.svg')))
-            self.tree.insertTopLevelItem(0, default_item)
-            
-        print("[调试] update_tree_items_data: 更新完成")
+        # 展开所有上级分类
+        parent = item.parent()
+        while parent is not None:
+            self.tree.expandItem(parent)
+            parent = parent.parent()
+        self.tree.setCurrentItem(item)
+        print(f"[调试] select_category_by_name: 选中分类 {category_name}")
+        return True
+
+    def _collect_category_paths(self):
+        """按目录树当前顺序收集所有分类路径"""
+        paths = []
+        stack = [self.tree.topLevelItem(i) for i in reversed(range(self.tree.topLevelItemCount()))]
+        while stack:
+            item = stack.pop()
+            data = item.data(0, Qt.ItemDataRole.UserRole)
+            if not data or data.get('type') not in ('category', 'subcategory'):
+                continue
+            paths.append(data.get('full_path', data.get('name')))
+            stack.extend(item.child(j) for j in reversed(range(item.childCount())))
+        return paths
 
     def save_category_order(self):
         """保存当前目录树结构到配置"""
-        # 获取所有一级分类和二级分类
-        categories = []
-        all_categories = []
-        
-        # 收集所有一级分类
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            cat_name = item.text(0)
-            categories.append(cat_name)
-            all_categories.append(cat_name)
-            
-            # 收集该一级分类下的所有二级分类
-            for j in range(item.childCount()):
-                child = item.child(j)
-                child_data = child.data(0, Qt.ItemDataRole.UserRole)
-                if child_data and child_data.get('type') == 'subcategory':
-                    sub_cat_name = child_data.get('name')
-                    full_path = child_data.get('full_path')
-                    if not full_path:  # 如果没有完整路径，则构造一个
-                        full_path = f"{cat_name}/{sub_cat_name}"
-                    all_categories.append(full_path)
+        all_categories = self._collect_category_paths()
         
         # 确保默认分类始终存在
-        if '默认分类' not in all_categories:
-            all_categories.insert(0, '默认分类')
-            
-        # 获取现有配置中的分类，保持原有的时间戳顺序
-        existing_categories = self.config.get_categories()
-        
-        # 创建一个合并后的分类列表，保持时间戳顺序
-        merged_categories = []
-        
-        # 先添加现有配置中的分类（保持顺序）
-        for cat in existing_categories:
-            if cat in all_categories:
-                merged_categories.append(cat)
-                
-        # 再添加新的分类
-        for cat in all_categories:
-            if cat not in merged_categories:
-                merged_categories.append(cat)
-        
-        # 确保默认分类在最前面
-        if '默认分类' in merged_categories:
-            merged_categories.remove('默认分类')
-            merged_categories.insert(0, '默认分类')
-        
-        # 保存完整分类列表到配置文件
-        print(f"[调试] save_category_order: 保存分类列表: {merged_categories}")
-        self.config.set_categories(merged_categories)
-        
-        # 将当前分类列表保存到临时文件，确保刷新时能恢复
-        temp_config_file = Path(self.config.config_dir) / "temp_categories.json"
-        try:
-            with open(temp_config_file, 'w', encoding='utf-8') as f:
-                import json
-                json.dump(merged_categories, f, ensure_ascii=False)
-            print(f"[调试] save_category_order: 已保存临时分类列表到 {temp_config_file}")
-        except Exception as e:
-            print(f"[调试] save_category_order: 保存临时分类列表失败: {e}")
+        if self.config.default_category_name not in all_categories:
+            all_categories.insert(0, self.config.default_category_name)
         
-        # 更新所有MOD的分类信息，确保它们的分类路径正确
-        self.update_mod_categories()
+        # 按目录树顺序保存，目录树中不存在的分类会被删除，其中的MOD移到上级分类
+        print(f"[调试] save_category_order: 保存分类列表: {all_categories}")
+        self.config.set_categories(all_categories)
 
     def update_mod_categories(self):
-        """更新所有MOD的分类信息，确保它们的分类路径正确"""
+        """更新所有MOD的分类信息，确保它们引用的分类存在"""
         # 收集所有有效的分类路径
-        valid_categories = set()
-        for i in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(i)
-            cat_name = item.text(0)
-            valid_categories.add(cat_name)
-            
-            # 添加二级分类
-            for j in range(item.childCount()):
-                child = item.child(j)
-                if child.data(0, Qt.ItemDataRole.UserRole)['type'] == 'subcategory':
-                    sub_cat_name = child.data(0, Qt.ItemDataRole.UserRole)['name']
-                    full_path = f"{cat_name}/{sub_cat_name}"
-                    valid_categories.add(full_path)
+        valid_categories = set(self._collect_category_paths())
         
         # 确保默认分类始终存在
-        valid_categories.add('默认分类')
+        valid_categories.add(self.config.default_category_name)
         print(f"[调试] update_mod_categories: 有效分类列表: {valid_categories}")
         
-        # 更新配置中的分类列表
-        self.config.set_categories(list(valid_categories))
-        
         # 委托给ConfigManager处理MOD分类更新
-        if hasattr(self.config, 'update_mod_categories'):
-            updated_count = self.config.update_mod_categories(valid_categories)
-            print(f"[调试] update_mod_categories: 配置管理器更新了 {updated_count} 个MOD的分类信息")
-        else:
-            # 如果ConfigManager没有实现该方法，保留原来的逻辑
-            mods = self.config.get_mods()
-            updated_count = 0
-            for mod_id, mod_info in mods.items():
-                current_category = mod_info.get('category', '默认分类')
-                if current_category not in valid_categories:
-                    # 如果分类不存在，检查父级分类是否存在
-                    parent_category = None
-                    if '/' in current_category:
-                        parent_name = current_category.split('/', 1)[0]
-                        if parent_name in valid_categories:
-                            parent_category = parent_name
-                    
-                    # 如果父级分类存在，将MOD移至父级分类；否则移至默认分类
-                    old_category = current_category
-                    if parent_category:
-                        mod_info['category'] = parent_category
-                        print(f"[调试] update_mod_categories: MOD {mod_id} 的分类从 {old_category} 更新为父级分类 {parent_category}")
-                    else:
-                        mod_info['category'] = '默认分类'
-                        print(f"[调试] update_mod_categories: MOD {mod_id} 的分类从 {old_category} 更新为默认分类")
-                    
-                    self.config.update_mod(mod_id, mod_info)
-                    updated_count += 1
-            
-            if updated_count > 0:
-                print(f"[调试] update_mod_categories: 已更新 {updated_count} 个MOD的分类信息")
+        updated_count = self.config.update_mod_categories(valid_categories)
+        print(f"[调试] update_mod_categories: 配置管理器更新了 {updated_count} 个MOD的分类信息")
         
         return updated_count
 
@@ -3332,6 +3154,7 @@ class MainWindow(QMainWindow):
                 if mods_path.exists():
                     self.config.set_mods_path(str(mods_path))
                     self.mod_manager.mods_path = mods_path
+                    self.start_mod_watcher()
                     print(f"[调试] MOD文件夹已设置为: {mods_path}")
                     self.statusBar().showMessage(f'MOD文件夹已自动设置为: {mods_path}', 5000)
                     
@@ -3614,29 +3437,36 @@ class MainWindow(QMainWindow):
             
             self.statusBar().showMessage(f"正在{'启用' if enable else '禁用'}选中的MOD...")
             
-            for item in selected_items:
-                mod_id = item.data(Qt.UserRole)
-                mod_info = mods.get(mod_id)
-                if not mod_info:
-                    continue
-                    
-                # 如果状态已经符合目标状态，则跳过
-                if mod_info.get('enabled', False) == enable:
-                    continue
-                    
-                # 启用或禁用MOD
-                try:
-                    if enable:
-                        self.mod_manager.enable_mod(mod_id)
-                        mod_info['enabled'] = True
-                    else:
-                        self.mod_manager.disable_mod(mod_id)
-                        mod_info['enabled'] = False
+            # 所有状态变更合并为一次配置写入，备份目录等的列表在整批操作中共用
+            fs_cache = FsCache()
+            with self.config.batch():
+                pending = []
+                for item in selected_items:
+                    mod_id = item.data(Qt.UserRole)
+                    mod_info = mods.get(mod_id)
+                    if not mod_info:
+                        continue
+                        
+                    # 如果状态已经符合目标状态，则跳过
+                    if mod_info.get('enabled', False) == enable:
+                        continue
+                    pending.append(mod_id)
                     
-                    self.config.update_mod(mod_id, mod_info)
-                    processed += 1
-                except Exception as e:
-                    print(f"[警告] 处理MOD {mod_id} 失败: {str(e)}")
+                # 启用或禁用MOD（ModManager会自行更新enabled状态）
+                if enable:
+                    # 批量启用时所有MOD的复制任务一起并行执行
+                    try:
+                        results = self.mod_manager.enable_mods(pending, fs_cache=fs_cache)
+                        processed = sum(1 for result in results.values() if result)
+                    except Exception as e:
+                        print(f"[警告] 批量启用MOD失败: {str(e)}")
+                else:
+                    for mod_id in pending:
+                        try:
+                            if self.mod_manager.disable_mod(mod_id, fs_cache=fs_cache):
+                                processed += 1
+                        except Exception as e:
+                            print(f"[警告] 处理MOD {mod_id} 失败: {str(e)}")
             
             # 刷新界面
             self.load_mods()
@@ -3710,20 +3540,22 @@ class MainWindow(QMainWindow):
             processed = 0
             failed = 0
             
-            for item in selected_items:
-                mod_id = item.data(Qt.UserRole)
-                try:
-                    self.mod_manager.delete_mod(mod_id)
-                    self.config.remove_mod(mod_id)
-                    processed += 1
-                except Exception as e:
-                    print(f"[警告] 删除MOD {mod_id} 失败: {str(e)}")
-                    # 如果是MOD不存在的错误，仍然从配置中移除
-                    if 'MOD不存在' in str(e):
+            # 所有删除合并为一次配置写入
+            with self.config.batch():
+                for item in selected_items:
+                    mod_id = item.data(Qt.UserRole)
+                    try:
+                        self.mod_manager.delete_mod(mod_id)
                         self.config.remove_mod(mod_id)
                         processed += 1
-                    else:
-                        failed += 1
+                    except Exception as e:
+                        print(f"[警告] 删除MOD {mod_id} 失败: {str(e)}")
+                        # 如果是MOD不存在的错误，仍然从配置中移除
+                        if 'MOD不存在' in str(e):
+                            self.config.remove_mod(mod_id)
+                            processed += 1
+                        else:
+                            failed += 1
             
             # 刷新界面
             self.load_mods()
@@ -3752,14 +3584,16 @@ class MainWindow(QMainWindow):
             
             self.statusBar().showMessage(f"正在移动MOD到分类 {category}...")
             
-            for item in selected_items:
-                mod_id = item.data(Qt.UserRole)
-                if self.config.set_mod_category(mod_id, category):
-                    processed += 1
-                    moved_mod_ids.append(mod_id)
+            # 分类变更合并为一次配置写入
+            with self.config.batch():
+                for item in selected_items:
+                    mod_id = item.data(Qt.UserRole)
+                    if self.config.set_mod_category(mod_id, category):
+                        processed += 1
+                        moved_mod_ids.append(mod_id)
                     
-            # 更新分类的内容
-            self.update_mod_categories()
+                # 更新分类的内容
+                self.update_mod_categories()
             
             # 切换到目标分类
             self.select_category_by_name(category)
@@ -0,0 +1,214 @@
+import os
+import shutil
+import tempfile
+import zipfile
+from utils.mod_scanner import MOD_EXTENSIONS
+
+# 会被继续解压的嵌套压缩包
+ARCHIVE_EXTENSIONS = (".zip", ".7z", ".rar")
+# 可选解压的预览图
+PREVIEW_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp", ".gif")
+
+
+def archive_kind(archive, name=None):
+    """压缩包格式："zip"、"7z"、"rar"，无法识别时为None
+
+    Args:
+        archive: 压缩包路径或已打开的文件对象（例如内存中的嵌套压缩包），None时只按name的扩展名判断
+        name: 文件对象对应的成员名，用于按扩展名判断
+    """
+    if name is None and not hasattr(archive, 'read'):
+        name = os.fspath(archive)
+    lower = (name or '').lower()
+    if lower.endswith('.7z'):
+        return "7z"
+    if lower.endswith('.rar'):
+        return "rar"
+    if archive is None:
+        return "zip" if lower.endswith('.zip') else None
+    try:
+        if zipfile.is_zipfile(archive):
+            return "zip"
+    except OSError:
+        pass
+    finally:
+        if hasattr(archive, 'seek'):
+            archive.seek(0)
+    return None
+
+
+def _open_source(archive):
+    """路径原样返回；文件对象回到开头（同一个对象会被多次打开）"""
+    if hasattr(archive, 'seek'):
+        archive.seek(0)
+        return archive
+    return os.fspath(archive)
+
+
+def list_members(archive_path, kind=None):
+    """读取压缩包的成员列表（只读目录，不解压）
+
+    Args:
+        archive_path: 压缩包路径或已打开的文件对象
+        kind: 压缩包格式，None时由archive_kind()判断
+
+    Returns:
+        list: [(成员名, 解压后大小, 是否目录)]，格式不支持或无法读取时返回None
+    """
+    kind = kind or archive_kind(archive_path)
+    try:
+        source = _open_source(archive_path)
+        if kind == "zip":
+            with zipfile.ZipFile(source, 'r') as z:
+                return [(info.filename, info.file_size, info.is_dir()) for info in z.infolist()]
+        if kind == "7z":
+            import py7zr
+            with py7zr.SevenZipFile(source, 'r') as sz:
+                return [(info.filename, info.uncompressed or 0, info.is_directory) for info in sz.list()]
+        if kind == "rar":
+            import rarfile
+            with rarfile.RarFile(source) as rf:
+                return [(info.filename, info.file_size, info.is_dir()) for info in rf.infolist()]
+    except Exception as e:
+        print(f"[警告] list_members: 无法读取压缩包成员列表 {archive_path}: {e}")
+    return None
+
+
+def plan_extraction(members, include_previews=False):
+    """根据成员列表决定需要解压哪些成员
+
+    成员按所在目录和文件名（不含扩展名）分组，只选出pak/ucas/utoc三个文件齐全的组，
+    以及嵌套压缩包；include_previews为True时同时选出图片作为预览图。
+    截图、视频、缺文件的配色变体等其他成员都跳过。
+
+    Args:
+        members: list_members()的结果
+
+    Returns:
+        dict: {"members": 要解压的成员名列表, "groups": 完整MOD组的名称列表,
+               "mod_groups": [(MOD组名称, [pak, ucas, utoc成员名])],
+               "archives": 嵌套压缩包成员名列表, "archive_sizes": 嵌套压缩包成员名 -> 大小,
+               "selected_bytes", "skipped_files", "skipped_bytes"}
+    """
+    groups = {}
+    archives = []
+    previews = []
+    sizes = {}
+    for name, size, is_dir in members:
+        if is_dir:
+            continue
+        sizes[name] = size
+        normalized = name.replace('\\', '/')
+        directory, base = os.path.split(normalized)
+        stem, ext = os.path.splitext(base)
+        ext = ext.lower()
+        if ext in MOD_EXTENSIONS:
+            groups.setdefault((directory, stem), {})[ext] = name
+        elif ext in ARCHIVE_EXTENSIONS:
+            archives.append(name)
+        elif ext in PREVIEW_EXTENSIONS:
+            previews.append(name)
+
+    selected = []
+    complete = []
+    mod_groups = []
+    for (directory, stem), files in groups.items():
+        if len(files) == len(MOD_EXTENSIONS):
+            group_members = [files[ext] for ext in MOD_EXTENSIONS]
+            complete.append(stem)
+            mod_groups.append((stem, group_members))
+            selected.extend(group_members)
+    selected.extend(archives)
+    if include_previews:
+        selected.extend(previews)
+
+    selected_set = set(selected)
+    selected_bytes = sum(sizes[name] for name in selected)
+    skipped = [name for name in sizes if name not in selected_set]
+    return {
+        "members": selected,
+        "groups": complete,
+        "mod_groups": mod_groups,
+        "archives": archives,
+        "archive_sizes": {name: sizes[name] for name in archives},
+        "selected_bytes": selected_bytes,
+        "skipped_files": len(skipped),
+        "skipped_bytes": sum(sizes[name] for name in skipped),
+    }
+
+
+def member_path(to_dir, name):
+    """成员解压后的路径（与zipfile相同的处理：去掉盘符、绝对路径和..，防止写到目标目录之外）"""
+    parts = [part for part in name.replace('\\', '/').split('/') if part not in ('', '.', '..')]
+    if parts:
+        parts[0] = os.path.splitdrive(parts[0])[1] or parts[0]
+    return os.path.join(os.fspath(to_dir), *parts)
+
+
+def extract_members(archive_path, members, to_dir, copy_stream=None, kind=None):
+    """只解压指定的成员（zip和7z；rar见extract_rar_with_rarfile的members参数）
+
+    Args:
+        archive_path: 压缩包路径或已打开的文件对象
+        copy_stream: zip成员的写入函数(读取流, 目标路径, 大小)，例如CopyEngine.copy_stream，
+            提供时解压也有进度和取消；None时使用zipfile自身的解压
+        kind: 压缩包格式，None时由archive_kind()判断
+    """
+    kind = kind or archive_kind(archive_path)
+    source = _open_source(archive_path)
+    if kind == "zip":
+        with zipfile.ZipFile(source, 'r') as z:
+            if copy_stream is None:
+                z.extractall(to_dir, members=members)
+                return
+            for name in members:
+                info = z.getinfo(name)
+                if info.is_dir():
+                    continue
+                dest = member_path(to_dir, name)
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                with z.open(info) as fsrc:
+                    copy_stream(fsrc, dest, info.file_size)
+        return
+    if kind == "7z":
+        import py7zr
+        with py7zr.SevenZipFile(source, 'r') as sz:
+            sz.extract(path=to_dir, targets=list(members))
+        return
+    raise ValueError(f"不支持按成员解压: {archive_path}")
+
+
+def read_member(archive_path, name, max_memory, kind=None):
+    """把一个成员（嵌套压缩包）读入临时文件对象，不超过max_memory字节时只在内存中
+
+    使用SpooledTemporaryFile：成员实际大小超过max_memory（例如目录中记录的大小不准确）时自动转存到磁盘。
+
+    Returns:
+        SpooledTemporaryFile，格式不支持按成员读取时返回None
+    """
+    kind = kind or archive_kind(archive_path)
+    source = _open_source(archive_path)
+    buffer = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    try:
+        if kind == "zip":
+            with zipfile.ZipFile(source, 'r') as z, z.open(name) as fsrc:
+                shutil.copyfileobj(fsrc, buffer, 1024 * 1024)
+        elif kind == "7z":
+            import py7zr
+            with py7zr.SevenZipFile(source, 'r') as sz:
+                if not hasattr(sz, 'read'):
+                    buffer.close()
+                    return None
+                data = sz.read(targets=[name]).get(name)
+                if data is None:
+                    buffer.close()
+                    return None
+                shutil.copyfileobj(data, buffer, 1024 * 1024)
+        else:
+            buffer.close()
+            return None
+    except Exception:
+        buffer.close()
+        raise
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,218 @@
+import os
+import zipfile
+from pathlib import Path
+from utils.mod_scanner import MOD_EXTENSIONS
+from utils.archive_planner import ARCHIVE_EXTENSIONS, archive_kind, extract_members, member_path, read_member
+
+
+class ArchiveGraph:
+    """导入时遍历到的压缩包树
+
+    每个压缩包（包括嵌套压缩包）是一个节点，只访问一次。节点记录父节点、深度、成员数、
+    找到的MOD组以及处理方式，导入结果和日志通过它说明每个MOD来自哪一层压缩包。
+    """
+
+    def __init__(self):
+        self.nodes = []
+
+    def add(self, name, parent=None, kind=None, size=0, location="disk"):
+        """添加节点，返回节点ID
+
+        Args:
+            name: 压缩包名称（最外层为文件名，嵌套压缩包为在父压缩包中的成员名）
+            parent: 父节点ID，最外层为None
+            kind: 压缩包格式
+            size: 压缩包大小（字节）
+            location: 处理方式："disk"（磁盘上的文件）或"memory"（在内存中处理）
+        """
+        depth = self.nodes[parent]["depth"] + 1 if parent is not None else 0
+        path = f"{self.nodes[parent]['path']}/{name}" if parent is not None else name
+        node = {
+            "id": len(self.nodes),
+            "name": name,
+            "path": path,
+            "parent": parent,
+            "children": [],
+            "depth": depth,
+            "kind": kind,
+            "size": size,
+            "location": location,
+            "members": 0,
+            "mod_groups": [],
+            "extraction": None,
+            "error": None,
+        }
+        self.nodes.append(node)
+        if parent is not None:
+            self.nodes[parent]["children"].append(node["id"])
+        return node["id"]
+
+    def get(self, node_id):
+        return self.nodes[node_id]
+
+    def update(self, node_id, **values):
+        self.nodes[node_id].update(values)
+
+    @property
+    def max_depth(self):
+        return max((node["depth"] for node in self.nodes), default=0)
+
+    def mod_count(self):
+        return sum(len(node["mod_groups"]) for node in self.nodes)
+
+    def describe(self):
+        """按树形结构输出每个节点，用于日志"""
+        lines = []
+
+        def visit(node_id):
+            node = self.nodes[node_id]
+            detail = f"{node['kind'] or '?'}，{node['members']} 个成员，{node['location']}"
+            if node["extraction"]:
+                detail += f"，{node['extraction']}"
+            if node["mod_groups"]:
+                detail += f"，MOD: {', '.join(node['mod_groups'])}"
+            if node["error"]:
+                detail += f"，错误: {node['error']}"
+            lines.append(f"{'  ' * node['depth']}{node['name']}（{detail}）")
+            for child in node["children"]:
+                visit(child)
+
+        for node in self.nodes:
+            if node["parent"] is None:
+                visit(node["id"])
+        return lines
+
+    def to_list(self):
+        """节点列表的副本（可以保存为JSON）"""
+        return [dict(node, children=list(node["children"]), mod_groups=list(node["mod_groups"])) for node in self.nodes]
+
+
+class ArchiveWalker:
+    """用工作栈遍历压缩包树，每个压缩包（包括嵌套压缩包）只访问一次
+
+    导入单个压缩包（ModManager）和批量导入的工作进程共用，不依赖Qt。深度优先：内存中等待处理的
+    嵌套压缩包只有当前路径上的兄弟节点。不超过memory_limit的zip/7z嵌套压缩包在内存中处理，
+    在内存中等待的嵌套压缩包合计不超过memory_budget，其余写到该节点在work_dir下的目录。
+    遍历结束（包括出错和取消）时，未处理的内存中的嵌套压缩包都会关闭。
+    """
+
+    MAX_DEPTH = 10
+
+    def __init__(self, work_dir, memory_limit, memory_budget, extract=None):
+        """
+        Args:
+            work_dir: 工作目录，每个节点使用其中的node<ID>目录
+            extract: 解压指定成员的函数(来源, 成员列表, 目标目录, 格式)，None时使用extract_members
+        """
+        self.graph = ArchiveGraph()
+        self.work_dir = Path(work_dir)
+        self.memory_limit = memory_limit
+        self.memory_budget = memory_budget
+        self.extract = extract or (lambda source, members, to_dir, kind: extract_members(source, members, to_dir, kind=kind))
+        # 在内存中等待处理的嵌套压缩包的总字节数
+        self.memory_held = 0
+
+    def node_dir(self, node_id):
+        return self.work_dir / f"node{node_id}"
+
+    def nested_in(self, node_id):
+        """节点在最外层压缩包中的位置，最外层为None"""
+        node = self.graph.get(node_id)
+        return node['path'].split('/', 1)[1] if node['parent'] is not None else None
+
+    def nested_children(self, node_id, source, plan):
+        """解压计划中的嵌套压缩包：能放进内存的读入内存，其余写到该节点的目录
+
+        Returns:
+            list: 子节点[(来源, 格式, 成员名, 大小)]
+        """
+        kind = self.graph.get(node_id)['kind']
+        node_dir = self.node_dir(node_id)
+        children = []
+        try:
+            for member in plan['archives']:
+                size = plan['archive_sizes'].get(member, 0)
+                member_kind = archive_kind(None, member)
+                if (member_kind in ("zip", "7z") and size <= self.memory_limit
+                        and self.memory_held + size <= self.memory_budget):
+                    buffer = read_member(source, member, self.memory_limit, kind)
+                    if buffer is not None:
+                        self.memory_held += size
+                        children.append((buffer, member_kind, member, size))
+                        continue
+                self.extract(source, [member], node_dir, kind)
+                children.append((Path(member_path(node_dir, member)), member_kind, member, size))
+        except BaseException:
+            self.release(children)
+            raise
+        return children
+
+    def release(self, entries):
+        """关闭未处理的内存中的嵌套压缩包，归还内存预算（条目的最后一项是大小）"""
+        for entry in entries:
+            if hasattr(entry[0], 'read'):
+                entry[0].close()
+                self.memory_held -= entry[-1]
+
+    def walk(self, root, visit, on_error=None):
+        """遍历以root为根的压缩包树
+
+        Args:
+            visit: 处理一个节点的函数(节点ID, 来源)，返回子节点列表[(来源, 格式, 成员名, 大小)]
+            on_error: 节点处理失败时调用(节点ID, 异常)，返回False时停止遍历；可以重新抛出异常（例如取消）。
+                None时记录错误后继续处理其他节点
+        """
+        root = Path(root)
+        # 最外层压缩包的大小在处理节点时读取，读取失败（文件被删除、无权限）同样交给on_error
+        stack = [(root, archive_kind(root), root.name, None, None)]
+        try:
+            while stack:
+                source, kind, name, parent, size = stack.pop()
+                in_memory = hasattr(source, 'read')
+                node_id = self.graph.add(name, parent, kind, size or 0, "memory" if in_memory else "disk")
+                try:
+                    if size is None:
+                        self.graph.update(node_id, size=source.stat().st_size)
+                    if self.graph.get(node_id)['depth'] > self.MAX_DEPTH:
+                        raise RuntimeError(f"递归解压深度过大，可能存在嵌套死循环: {self.graph.get(node_id)['path']}")
+                    children = visit(node_id, source)
+                    stack.extend((child_source, child_kind, child_name, node_id, child_size)
+                                 for child_source, child_kind, child_name, child_size in reversed(children))
+                except Exception as e:
+                    self.graph.update(node_id, error=str(e))
+                    if on_error is not None and not on_error(node_id, e):
+                        break
+                finally:
+                    if in_memory:
+                        source.close()
+                        self.memory_held -= size
+        finally:
+            self.release(stack)
+        return self.graph
+
+
+def scan_extracted(directory):
+    """遍历一次解压目录，找出完整的MOD组和嵌套压缩包
+
+    每个文件只检查一次：同目录同名的pak/ucas/utoc组成MOD组；扩展名为.zip/.7z/.rar的文件作为嵌套压缩包。
+    只有没有扩展名的文件才读取文件头判断是否是zip，其他文件（预览图、说明文档等）不打开。
+
+    Returns:
+        tuple: (MOD组列表[{'name', 'files': [pak, ucas, utoc的Path], 'dir'}], 嵌套压缩包Path列表)
+    """
+    groups = []
+    archives = []
+    for dir_path, _, file_names in os.walk(directory):
+        stems = {}
+        for file_name in sorted(file_names):
+            path = os.path.join(dir_path, file_name)
+            stem, ext = os.path.splitext(file_name)
+            ext = ext.lower()
+            if ext in MOD_EXTENSIONS:
+                stems.setdefault(stem, {})[ext] = Path(path)
+            elif ext in ARCHIVE_EXTENSIONS or (not ext and zipfile.is_zipfile(path)):
+                archives.append(Path(path))
+        for stem, files in stems.items():
+            if len(files) == len(MOD_EXTENSIONS):
+                groups.append({'name': stem, 'files': [files[ext] for ext in MOD_EXTENSIONS], 'dir': Path(dir_path)})
+    return groups, archives
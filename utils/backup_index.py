@@ -0,0 +1,258 @@
+import json
+import os
+import threading
+import traceback
+from utils.config_storage import atomic_write_text
+
+
+class BackupIndex:
+    """备份目录索引，保存在配置文件旁边（backup_index.json）
+
+    记录每个MOD ID对应的备份目录（相对备份根目录的名称）和文件清单（文件名 -> 大小、修改时间、内容哈希），
+    启用MOD时直接按ID查找，不再按名称猜测或遍历整个备份目录。
+    索引在第一次使用时根据现有备份目录建立一次，之后由备份、重命名和删除MOD时增量维护，
+    verify()可以随时检查清单与磁盘是否一致。预览图不属于MOD文件，不记录在清单中。
+    修改只作用于内存并标记为脏，由调用方在合适的时候调用save()写盘。
+    """
+
+    VERSION = 1
+
+    def __init__(self, index_file):
+        self.index_file = index_file
+        self.root = None
+        # MOD ID -> {"dir": 备份目录名, "files": {文件名: [大小, mtime_ns, 哈希]}}
+        # 哈希是文件在对象库中的对象名，没有存入对象库的文件没有哈希
+        self.entries = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """读取索引文件，不存在或损坏时为空索引（之后由build重建）"""
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                print("[调试] BackupIndex.load: 索引版本不匹配，将重建")
+                return
+            self.root = data.get("root")
+            self.entries = data.get("entries", {})
+            print(f"[调试] BackupIndex.load: 读取备份索引，共 {len(self.entries)} 个MOD")
+        except Exception as e:
+            print(f"[警告] BackupIndex.load: 读取备份索引失败，将重建: {e}")
+            self.root = None
+            self.entries = {}
+
+    def save(self):
+        """有修改时写回索引文件"""
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                data = {"version": self.VERSION, "root": self.root, "entries": self.entries}
+                atomic_write_text(self.index_file, json.dumps(data, ensure_ascii=False))
+                self._dirty = False
+            except Exception as e:
+                print(f"[错误] BackupIndex.save: 保存备份索引失败: {e}")
+                traceback.print_exc()
+
+    def is_built_for(self, backup_root):
+        return self.root is not None and self.root == self._normalize_root(backup_root)
+
+    def build(self, backup_root, mods):
+        """根据现有备份目录建立索引（备份根目录变化或没有索引文件时调用一次）
+
+        优先使用与MOD ID同名的目录；其余MOD再按旧版启用逻辑中的候选名称
+        （real_name、display_name、mod_name、folder_name、name）匹配尚未被其他MOD占用的目录。
+        不再退回到"任意一个非空目录"，避免恢复出别的MOD。
+        """
+        with self._lock:
+            self.root = self._normalize_root(backup_root)
+            self.entries = {}
+            self._dirty = True
+            if not self.root or not os.path.isdir(self.root):
+                self.save()
+                return 0
+            try:
+                with os.scandir(self.root) as it:
+                    existing = {entry.name for entry in it if entry.is_dir()}
+            except OSError as e:
+                print(f"[警告] BackupIndex.build: 无法读取备份目录 {self.root}: {e}")
+                existing = set()
+            claimed = set()
+            # 第一轮：与MOD ID同名的目录
+            for mod_id in mods:
+                if mod_id in existing:
+                    claimed.add(mod_id)
+                    self._set_entry(mod_id, mod_id)
+            # 第二轮：按候选名称匹配剩余的目录
+            for mod_id, mod_info in mods.items():
+                if mod_id in self.entries:
+                    continue
+                for name in self.candidate_names(mod_info):
+                    if name in existing and name not in claimed:
+                        claimed.add(name)
+                        self._set_entry(mod_id, name)
+                        break
+            # 没有MOD文件的目录不算有效备份
+            for mod_id in [mod_id for mod_id, entry in self.entries.items() if not entry["files"]]:
+                del self.entries[mod_id]
+            self.save()
+            print(f"[调试] BackupIndex.build: 建立备份索引，{len(self.entries)}/{len(mods)} 个MOD有备份")
+            return len(self.entries)
+
+    @staticmethod
+    def candidate_names(mod_info):
+        names = []
+        for key in ('real_name', 'display_name', 'mod_name', 'folder_name', 'name'):
+            name = mod_info.get(key, '')
+            if name and name not in names:
+                names.append(name)
+        return names
+
+    def record(self, mod_id, backup_dir, digests=None):
+        """记录（或刷新）MOD的备份目录和文件清单
+
+        Args:
+            digests: 文件名 -> 内容哈希；没有给出的文件沿用原清单中大小和修改时间都没变的哈希
+        """
+        with self._lock:
+            name = self._dir_name(backup_dir)
+            if name is None:
+                print(f"[警告] BackupIndex.record: 备份目录 {backup_dir} 不在备份根目录 {self.root} 下，未记录")
+                return False
+            self._set_entry(mod_id, name, digests, self.entries.get(mod_id))
+            return True
+
+    def rename(self, old_mod_id, new_mod_id, backup_dir=None):
+        """MOD ID变化时更新索引；backup_dir为重命名后的备份目录，None表示目录没有变化"""
+        with self._lock:
+            entry = self.entries.pop(old_mod_id, None)
+            if backup_dir is not None:
+                name = self._dir_name(backup_dir)
+                if name is not None:
+                    self._set_entry(new_mod_id, name, None, entry)
+            elif entry is not None:
+                self.entries[new_mod_id] = entry
+            self._dirty = True
+
+    def remove(self, mod_id):
+        with self._lock:
+            if self.entries.pop(mod_id, None) is not None:
+                self._dirty = True
+
+    def get(self, mod_id):
+        return self.entries.get(mod_id)
+
+    def digests(self, mod_id):
+        """MOD清单中引用的对象哈希集合"""
+        entry = self.entries.get(mod_id)
+        if entry is None:
+            return set()
+        return {info[2] for info in entry["files"].values() if len(info) > 2 and info[2]}
+
+    def object_refs(self):
+        """对象哈希 -> 引用它的清单文件数"""
+        refs = {}
+        with self._lock:
+            for entry in self.entries.values():
+                for info in entry["files"].values():
+                    if len(info) > 2 and info[2]:
+                        refs[info[2]] = refs.get(info[2], 0) + 1
+        return refs
+
+    def backup_dir(self, mod_id):
+        """返回MOD备份目录的完整路径，没有记录时返回None"""
+        entry = self.entries.get(mod_id)
+        if entry is None or not self.root:
+            return None
+        return os.path.join(self.root, entry["dir"])
+
+    def backup_files(self, mod_id):
+        """返回清单中的文件完整路径列表"""
+        directory = self.backup_dir(mod_id)
+        if directory is None:
+            return []
+        return [os.path.join(directory, name) for name in self.entries[mod_id]["files"]]
+
+    def verify(self, mod_ids=None):
+        """检查清单与磁盘是否一致
+
+        Args:
+            mod_ids: 只检查这些MOD，None表示全部
+
+        Returns:
+            dict: MOD ID -> 问题描述列表，只包含有问题的MOD
+        """
+        problems = {}
+        for mod_id in list(mod_ids if mod_ids is not None else self.entries):
+            entry = self.entries.get(mod_id)
+            if entry is None:
+                problems[mod_id] = ["没有备份记录"]
+                continue
+            directory = os.path.join(self.root, entry["dir"])
+            actual = self._manifest(directory)
+            if actual is None:
+                problems[mod_id] = [f"备份目录不存在: {directory}"]
+                continue
+            issues = []
+            for name, info in entry["files"].items():
+                current = actual.get(name)
+                if current is None:
+                    issues.append(f"缺少文件: {name}")
+                elif current[0] != info[0]:
+                    issues.append(f"文件大小不一致: {name} ({info[0]} -> {current[0]})")
+                elif current[1] != info[1]:
+                    issues.append(f"文件已被修改: {name}")
+            for name in actual:
+                if name not in entry["files"]:
+                    issues.append(f"多出文件: {name}")
+            if issues:
+                problems[mod_id] = issues
+        return problems
+
+    def _set_entry(self, mod_id, dir_name, digests=None, previous=None):
+        files = self._manifest(os.path.join(self.root, dir_name)) or {}
+        old_files = previous["files"] if previous else {}
+        for name, info in files.items():
+            digest = (digests or {}).get(name)
+            if digest is None:
+                old = old_files.get(name)
+                if old is not None and len(old) > 2 and old[0] == info[0] and old[1] == info[1]:
+                    digest = old[2]
+            if digest:
+                info.append(digest)
+        self.entries[mod_id] = {"dir": dir_name, "files": files}
+        self._dirty = True
+
+    @staticmethod
+    def _manifest(directory):
+        """目录中MOD文件的清单（不含子目录和预览图），目录不存在时返回None"""
+        manifest = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if not entry.is_file() or os.path.splitext(entry.name)[0] == "preview":
+                        continue
+                    st = entry.stat()
+                    manifest[entry.name] = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            return None
+        return manifest
+
+    def _dir_name(self, backup_dir):
+        """备份目录相对备份根目录的名称，不在根目录下时返回None"""
+        if not self.root:
+            return None
+        backup_dir = os.path.abspath(os.fspath(backup_dir))
+        if os.path.normcase(os.path.dirname(backup_dir)) != os.path.normcase(self.root):
+            return None
+        return os.path.basename(backup_dir)
+
+    @staticmethod
+    def _normalize_root(backup_root):
+        if not backup_root or not str(backup_root).strip():
+            return None
+        return os.path.abspath(os.fspath(backup_root))
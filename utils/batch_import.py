@@ -0,0 +1,91 @@
+import os
+import time
+from utils.archive_planner import list_members, plan_extraction, extract_members, member_path
+from utils.archive_walker import ArchiveWalker
+
+# 批量导入中每个任务的状态
+JOB_STATES = ("queued", "extracting", "placing", "backing_up", "done", "failed")
+JOB_STATE_NAMES = {
+    "queued": "排队中",
+    "extracting": "解压中",
+    "placing": "移入MOD目录",
+    "backing_up": "备份中",
+    "done": "完成",
+    "failed": "失败",
+}
+
+
+def default_import_workers(job_count):
+    """批量导入的进程数：不超过CPU核数和任务数，最多4个（解压同时也在读写磁盘）"""
+    return max(1, min(job_count, os.cpu_count() or 1, 4))
+
+
+def extract_archive_job(archive_path, work_dir, memory_limit=64 * 1024 * 1024, memory_budget=256 * 1024 * 1024,
+                        include_previews=False):
+    """在工作进程中解压一个压缩包（包括嵌套压缩包）中所有完整的MOD组
+
+    不依赖Qt和ModManager，可以在ProcessPoolExecutor的子进程中运行。与导入单个压缩包使用同一个
+    ArchiveWalker，嵌套压缩包的内存上限和内存预算相同。work_dir应与MOD目录在同一卷上，
+    主进程移入MOD目录时只需要改名。
+    只处理能读取成员列表的zip/7z；遇到rar（UnRAR的配置在ModManager中）、无法读取或解压失败的压缩包时
+    停止并返回error，主进程对这个压缩包改用ModManager.import_mod()。
+
+    Args:
+        memory_budget: 本进程在内存中等待处理的嵌套压缩包的总字节数上限
+        include_previews: 与设置项import_previews相同，决定解压计划是否包含预览图
+
+    Returns:
+        dict: {"archive", "groups": [{"name", "files", "nested_in", "archive_size"}],
+               "graph": ArchiveGraph.to_list()的结果, "bytes": 解压的字节数, "seconds",
+               "error": 无法在工作进程中处理时的错误信息，否则为None}
+    """
+    start = time.perf_counter()
+    archive_path = os.fspath(archive_path)
+    walker = ArchiveWalker(work_dir, memory_limit, memory_budget)
+    graph = walker.graph
+    groups = []
+    names = set()
+    result = {"bytes": 0, "error": None}
+
+    def visit(node_id, source):
+        node = graph.get(node_id)
+        kind = node["kind"]
+        if kind not in ("zip", "7z"):
+            raise RuntimeError(f"工作进程不处理此格式（{kind or '未知'}）: {node['path']}")
+        members = list_members(source, kind)
+        if members is None:
+            raise RuntimeError(f"无法读取压缩包成员列表: {node['path']}")
+        sizes = {name: size for name, size, _ in members}
+        plan = plan_extraction(members, include_previews=include_previews)
+        graph.update(node_id, members=len(plan["members"]) + plan["skipped_files"], extraction="解压到暂存目录")
+        node_dir = walker.node_dir(node_id)
+        new_groups = [(name, files) for name, files in plan["mod_groups"] if name not in names]
+        group_members = [member for _, files in new_groups for member in files]
+        if group_members:
+            extract_members(source, group_members, node_dir, kind=kind)
+            result["bytes"] += sum(sizes[member] for member in group_members)
+        for group_name, files in new_groups:
+            names.add(group_name)
+            node["mod_groups"].append(group_name)
+            groups.append({
+                "name": group_name,
+                "files": [member_path(node_dir, member) for member in files],
+                "nested_in": walker.nested_in(node_id),
+                "archive_size": node["size"],
+            })
+        return walker.nested_children(node_id, source, plan)
+
+    def on_error(node_id, error):
+        print(f"[警告] extract_archive_job: {os.path.basename(archive_path)} 交给单个导入流程处理: {error}")
+        result["error"] = str(error)
+        return False
+
+    walker.walk(archive_path, visit, on_error)
+    return {
+        "archive": archive_path,
+        "groups": groups,
+        "graph": graph.to_list(),
+        "bytes": result["bytes"],
+        "seconds": time.perf_counter() - start,
+        "error": result["error"],
+    }
@@ -0,0 +1,221 @@
+class CategoryTree:
+    """分类树
+
+    每个节点包含ID、父ID、名称和排序序号，根节点的父ID为None，嵌套层数不限。
+    MOD只保存所属分类的ID，因此重命名或移动分类只需修改一个节点；
+    "一级/二级/三级"这样的路径字符串只在需要显示或兼容旧配置时按需生成。
+    """
+
+    SEPARATOR = "/"
+
+    def __init__(self, nodes=None):
+        # ID -> 节点
+        self.nodes = {}
+        # 父ID -> 按排序排列的子节点ID列表
+        self._children = {None: []}
+        # 父ID -> {名称: ID}，用于按路径查找
+        self._names = {None: {}}
+        self._next_id = 1
+        if nodes:
+            # 先按排序插入，保证同级顺序与保存时一致
+            for node in sorted(nodes, key=lambda n: (n.get("sort_order", 0), n["id"])):
+                self._link(dict(node))
+            # 父节点缺失的节点挂到根下，避免数据损坏时丢失分类
+            for node_id, node in list(self.nodes.items()):
+                if node["parent_id"] is not None and node["parent_id"] not in self.nodes:
+                    print(f"[警告] CategoryTree: 分类 {node['name']} 的父分类不存在，移至根级")
+                    try:
+                        self.move(node_id, None)
+                    except ValueError as e:
+                        print(f"[警告] CategoryTree: 移动分类失败，删除该分类: {e}")
+                        self.remove(node_id)
+
+    @classmethod
+    def from_paths(cls, paths):
+        """从旧版的路径字符串列表构建分类树"""
+        tree = cls()
+        for path in paths:
+            tree.ensure_path(path)
+        return tree
+
+    def to_list(self):
+        """转换为可保存的节点列表（深度优先顺序）"""
+        return [dict(self.nodes[node_id]) for node_id in self.walk()]
+
+    def add(self, name, parent_id=None, index=None):
+        """添加分类节点，返回新节点ID"""
+        name = self._check_name(name, parent_id)
+        if parent_id is not None and parent_id not in self.nodes:
+            raise ValueError(f"父分类不存在: {parent_id}")
+        node = {"id": self._next_id, "parent_id": parent_id, "name": name, "sort_order": 0}
+        self._link(node, index)
+        return node["id"]
+
+    def rename(self, node_id, new_name):
+        """重命名分类节点，子分类和MOD都不需要修改"""
+        node = self.nodes[node_id]
+        if new_name == node["name"]:
+            return
+        new_name = self._check_name(new_name, node["parent_id"])
+        del self._names[node["parent_id"]][node["name"]]
+        node["name"] = new_name
+        self._names[node["parent_id"]][new_name] = node_id
+
+    def move(self, node_id, new_parent_id, index=None):
+        """把分类节点（连同子分类）移动到新的父节点下
+
+        Args:
+            node_id: 要移动的节点
+            new_parent_id: 新的父节点ID，None表示根级
+            index: 在新父节点下的位置，None表示末尾
+        """
+        node = self.nodes[node_id]
+        if new_parent_id is not None:
+            if new_parent_id not in self.nodes:
+                raise ValueError(f"父分类不存在: {new_parent_id}")
+            # 不允许移动到自身或自身的子孙节点下，避免形成环
+            ancestor = new_parent_id
+            while ancestor is not None:
+                if ancestor == node_id:
+                    raise ValueError(f"不能把分类 {node['name']} 移动到它自己的子分类下")
+                ancestor = self.nodes[ancestor]["parent_id"]
+        if new_parent_id != node["parent_id"]:
+            existing = self._names.get(new_parent_id, {}).get(node["name"])
+            if existing is not None:
+                raise ValueError(f"目标位置已存在同名分类: {node['name']}")
+        self._unlink(node_id)
+        node["parent_id"] = new_parent_id
+        self._link(node, index)
+
+    def remove(self, node_id):
+        """删除分类节点及其所有子分类，返回被删除的节点ID列表"""
+        removed = self.subtree(node_id)
+        self._unlink(node_id)
+        for removed_id in removed:
+            self.nodes.pop(removed_id, None)
+            self._children.pop(removed_id, None)
+            self._names.pop(removed_id, None)
+        return removed
+
+    def get(self, node_id):
+        return self.nodes.get(node_id)
+
+    def name(self, node_id):
+        return self.nodes[node_id]["name"]
+
+    def parent(self, node_id):
+        return self.nodes[node_id]["parent_id"]
+
+    def children(self, parent_id=None):
+        """返回按排序排列的子节点ID列表"""
+        return list(self._children.get(parent_id, []))
+
+    def child_by_name(self, parent_id, name):
+        return self._names.get(parent_id, {}).get(name)
+
+    def index_of(self, node_id):
+        """返回节点在同级中的位置"""
+        return self._children[self.nodes[node_id]["parent_id"]].index(node_id)
+
+    def path(self, node_id):
+        """返回节点的路径字符串，如"一级/二级" """
+        names = []
+        while node_id is not None:
+            node = self.nodes[node_id]
+            names.append(node["name"])
+            node_id = node["parent_id"]
+        return self.SEPARATOR.join(reversed(names))
+
+    def depth(self, node_id):
+        """根级节点深度为0"""
+        depth = -1
+        while node_id is not None:
+            depth += 1
+            node_id = self.nodes[node_id]["parent_id"]
+        return depth
+
+    def find(self, path):
+        """按路径字符串查找节点ID，找不到返回None"""
+        if not path:
+            return None
+        node_id = None
+        for name in path.split(self.SEPARATOR):
+            node_id = self._names.get(node_id, {}).get(name)
+            if node_id is None:
+                return None
+        return node_id
+
+    def ensure_path(self, path):
+        """按路径查找节点，缺失的各级分类自动创建，返回最后一级的ID"""
+        node_id = None
+        for name in path.split(self.SEPARATOR):
+            if not name:
+                continue
+            child_id = self._names.get(node_id, {}).get(name)
+            if child_id is None:
+                child_id = self.add(name, node_id)
+            node_id = child_id
+        if node_id is None:
+            raise ValueError(f"无效的分类路径: {path}")
+        return node_id
+
+    def subtree(self, node_id):
+        """返回节点及其所有子孙节点的ID"""
+        result = [node_id]
+        result.extend(self.walk(node_id))
+        return result
+
+    def walk(self, parent_id=None):
+        """深度优先遍历parent_id下的所有节点（不含parent_id本身）"""
+        result = []
+        stack = list(reversed(self._children.get(parent_id, [])))
+        while stack:
+            node_id = stack.pop()
+            result.append(node_id)
+            stack.extend(reversed(self._children.get(node_id, [])))
+        return result
+
+    def paths(self):
+        """按树的顺序返回所有分类的路径字符串"""
+        return [self.path(node_id) for node_id in self.walk()]
+
+    def __contains__(self, node_id):
+        return node_id in self.nodes
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _check_name(self, name, parent_id):
+        name = (name or "").strip()
+        if not name:
+            raise ValueError("分类名称不能为空")
+        if self.SEPARATOR in name:
+            raise ValueError(f"分类名称不能包含 {self.SEPARATOR}")
+        if name in self._names.get(parent_id, {}):
+            raise ValueError(f"同级已存在分类: {name}")
+        return name
+
+    def _link(self, node, index=None):
+        node_id = node["id"]
+        parent_id = node["parent_id"]
+        self.nodes[node_id] = node
+        self._next_id = max(self._next_id, node_id + 1)
+        self._children.setdefault(node_id, [])
+        self._names.setdefault(node_id, {})
+        siblings = self._children.setdefault(parent_id, [])
+        if index is None or index > len(siblings):
+            index = len(siblings)
+        siblings.insert(max(0, index), node_id)
+        self._names.setdefault(parent_id, {})[node["name"]] = node_id
+        self._renumber(parent_id)
+
+    def _unlink(self, node_id):
+        node = self.nodes[node_id]
+        parent_id = node["parent_id"]
+        self._children[parent_id].remove(node_id)
+        self._names[parent_id].pop(node["name"], None)
+        self._renumber(parent_id)
+
+    def _renumber(self, parent_id):
+        for order, child_id in enumerate(self._children.get(parent_id, [])):
+            self.nodes[child_id]["sort_order"] = order
@@ -1,4 +1,3 @@
-import json
 import os
 import shutil
 from pathlib import Path
@@ -6,33 +5,94 @@ import datetime
 import zipfile
 import time
 import sys
+import threading
+import atexit
+import copy
+from contextlib import contextmanager
+from utils.config_storage import JsonConfigStorage, JournalConfigStorage, SqliteConfigStorage
+from utils.mod_index import ModIndex
+from utils.category_tree import CategoryTree
+from utils.mod_record import ModRecord
+from utils.fs_cache import FsCache
+from utils.backup_index import BackupIndex
+from utils.fingerprint import FingerprintService
+from utils.object_store import ObjectStore
+from utils.deploy import DEPLOY_MODES, resolve_deploy_mode, deploy_file
+from utils.copy_engine import CopyEngine, CopyCancelled
+from utils.copy_scheduler import CopyScheduler
 
 class ConfigManager:
-    def __init__(self):
-        """初始化配置管理器"""
+    def __init__(self, storage_backend=None):
+        """初始化配置管理器
+        
+        Args:
+            storage_backend: 存储后端，"json"、"journal" 或 "sqlite"；为None时自动选择
+        """
         # 配置目录和文件路径 - 总是使用当前工作目录
         self.config_dir = os.getcwd()
         self.config_file = os.path.join(self.config_dir, "config.json")
+        self.db_file = os.path.join(self.config_dir, "config.db")
         print(f"[调试] ConfigManager初始化: 配置文件路径：{self.config_file}")
         
         # 初始化配置
         self.config = {}
         
+        # MOD表的二级索引，随每次MOD修改增量更新
+        self.mod_index = ModIndex()
+        
+        # 备份目录索引：MOD ID -> 备份目录和文件清单
+        self.backup_index = BackupIndex(os.path.join(self.config_dir, "backup_index.json"))
+        # 文件内容指纹缓存，备份去重和备份校验共用
+        self.fingerprints = FingerprintService(os.path.join(self.config_dir, "fingerprint_cache.json"))
+        # 复制引擎：备份、启用和导入时的文件复制都经过它，提供进度、取消和吞吐量统计
+        self.copy_engine = CopyEngine()
+        # 备份目录下的去重对象库，随备份根目录创建
+        self.object_store = None
+        # batch()期间删除的MOD引用过的对象，退出时统一回收
+        self._pending_gc = set()
+        
+        # 批量修改状态：batch()期间的写入只记录，退出时一次性提交
+        self._batch_lock = threading.RLock()
+        self._batch_depth = 0
+        self._pending_mods = set()
+        self._pending_settings = set()
+        self._pending_categories = False
+        self._pending_full = False
+        
+        # 延迟写入状态：修改先标记为脏，由后台写入线程在合并窗口结束后统一写盘
+        self._write_behind_ms = 0
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._dirty_event = threading.Event()
+        self._writer_thread = None
+        self._writer_stop = False
+        # 最近一次标记为脏时的配置副本，后台写入线程序列化它而不是界面线程正在修改的self.config
+        self._pending_snapshot = None
+        self._queued_saves = 0
+        self._committed_saves = 0
+        
+        # 选择存储后端
+        self.storage = self._create_storage(storage_backend)
+        print(f"[调试] ConfigManager初始化: 使用存储后端: {self.storage.name}")
+        
         # 默认分类名称（可以被重命名）
         self.default_category_name = "默认分类"
         
+        # 分类树，MOD通过category_id引用其中的节点
+        self.category_tree = CategoryTree()
+        self.default_category_id = None
+        self.category_timestamps = {}
+        
         # 加载配置文件
         self._load_config()
         
-        # 初始化分类创建时间戳
-        if not hasattr(self, 'category_timestamps'):
-            self.category_timestamps = {}
-            
-        # 确保默认分类存在并有时间戳
-        if self.default_category_name not in self.category_timestamps:
-            # 默认分类的时间戳设为最早，确保排在最前面
-            self.category_timestamps[self.default_category_name] = 0
-            
+        # 把MOD信息转换为紧凑的ModRecord
+        mods = self.config.get("mods", {})
+        self.config["mods"] = {mod_id: ModRecord.from_json(mod_info) for mod_id, mod_info in mods.items()}
+        
+        self._init_category_tree()
+        self.mod_index.rebuild(self.config.get("mods", {}))
+        
         # 确保备份路径存在
         backup_path = self.get_backup_path()
         if backup_path:
@@ -40,40 +100,75 @@ class ConfigManager:
             if not backup_dir.exists():
                 backup_dir.mkdir(parents=True, exist_ok=True)
                 
+        # 备份根目录变化或还没有索引时重建备份索引
+        self._ensure_backup_index()
+                
         # 重置通知标志，确保每次重新初始化配置时都会显示提醒
         self.config['game_path_notified'] = False
         self.config['mods_path_notified'] = False
         
+        # 延迟写入的合并窗口（毫秒），设置为0时恢复同步写入
+        try:
+            self._write_behind_ms = max(0, int(self.config.get("write_behind_ms", 250)))
+        except (TypeError, ValueError):
+            self._write_behind_ms = 250
+        print(f"[调试] ConfigManager初始化: 延迟写入窗口: {self._write_behind_ms} ms")
+        
+    def _create_storage(self, storage_backend=None):
+        """创建存储后端
+        
+        config.db存在时使用SQLite；否则读取config.json中的storage_backend设置，
+        设置为"sqlite"时会把现有JSON配置一次性迁移到config.db；
+        设置为"journal"时继续以config.json为快照，修改追加到config.journal。
+        """
+        json_storage = JsonConfigStorage(self.config_file)
+        
+        if storage_backend is None:
+            if os.path.exists(self.db_file):
+                storage_backend = "sqlite"
+            elif json_storage.exists():
+                try:
+                    storage_backend = json_storage.load().get("storage_backend", "json")
+                except Exception as e:
+                    print(f"[警告] _create_storage: 读取存储后端设置失败: {e}")
+                    storage_backend = "json"
+            else:
+                storage_backend = "json"
+        
+        if storage_backend == "sqlite":
+            try:
+                sqlite_storage = SqliteConfigStorage(self.db_file)
+                if not sqlite_storage.exists() and json_storage.exists():
+                    # 一次性迁移：把config.json的全部内容写入数据库
+                    print(f"[调试] _create_storage: 从 {self.config_file} 迁移配置到 {self.db_file}")
+                    config = json_storage.load()
+                    config["storage_backend"] = "sqlite"
+                    sqlite_storage.import_config(config)
+                return sqlite_storage
+            except Exception as e:
+                print(f"[错误] _create_storage: 初始化SQLite存储失败，回退到JSON: {e}")
+                import traceback
+                traceback.print_exc()
+        
+        if storage_backend == "journal":
+            return JournalConfigStorage(self.config_file)
+        
+        return json_storage
+        
     def _load_config(self):
         """加载配置文件"""
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
-                    print("[调试] _load_config: 成功加载配置文件")
-                    
-                    # 加载默认分类名称，如果存在
-                    if "default_category_name" in self.config:
-                        self.default_category_name = self.config["default_category_name"]
-                        print(f"[调试] _load_config: 加载默认分类名称: {self.default_category_name}")
-                    
-                    # 加载分类时间戳，如果存在
-                    if "category_timestamps" in self.config:
-                        self.category_timestamps = self.config["category_timestamps"]
-                    else:
-                        # 初始化分类时间戳
-                        self.category_timestamps = {}
-                        # 为现有分类生成时间戳
-                        for index, cat in enumerate(self.get_categories()):
-                            if cat == self.default_category_name:
-                                self.category_timestamps[cat] = 0  # 默认分类永远是最早的
-                            else:
-                                # 为其他分类生成递增的时间戳，确保顺序一致
-                                self.category_timestamps[cat] = int(time.time()) + index
-                                
-                        # 保存时间戳到配置
-                        self.config["category_timestamps"] = self.category_timestamps
-                        self._save_config()
+            if self.storage.exists():
+                self.config = self.storage.load()
+                print("[调试] _load_config: 成功加载配置文件")
+                
+                # 加载默认分类名称，如果存在
+                if "default_category_name" in self.config:
+                    self.default_category_name = self.config["default_category_name"]
+                    print(f"[调试] _load_config: 加载默认分类名称: {self.default_category_name}")
+                
+                # 加载分类时间戳（旧版配置用它排序，迁移到分类树时使用）
+                self.category_timestamps = self.config.get("category_timestamps", {})
             else:
                 # 创建默认配置
                 self.config = {
@@ -107,24 +202,300 @@ class ConfigManager:
             self.category_timestamps = {self.default_category_name: 0}
             self._save_config()
 
+    def _init_category_tree(self):
+        """从配置加载分类树，旧版配置（分类路径列表+时间戳）在这里一次性迁移"""
+        migrated = False
+        nodes = self.config.get("category_tree")
+        if nodes:
+            self.category_tree = CategoryTree(nodes)
+            self.default_category_id = self.config.get("default_category_id")
+        else:
+            # 旧版按时间戳排序，默认分类在最前
+            categories = list(self.config.get("categories", []))
+            if self.default_category_name in categories:
+                categories.remove(self.default_category_name)
+            categories.sort(key=lambda x: self.category_timestamps.get(x, 0))
+            categories.insert(0, self.default_category_name)
+            self.category_tree = CategoryTree.from_paths(categories)
+            self.default_category_id = self.category_tree.find(self.default_category_name)
+            migrated = True
+            print(f"[调试] _init_category_tree: 从分类列表迁移到分类树，共 {len(self.category_tree)} 个分类")
+            
+        # 确保默认分类存在，并且始终是第一个根级分类
+        if self.default_category_id not in self.category_tree:
+            self.default_category_id = self.category_tree.find(self.default_category_name)
+            if self.default_category_id is None:
+                self.default_category_id = self.category_tree.add(self.default_category_name, None, 0)
+            migrated = True
+        if self.category_tree.parent(self.default_category_id) is not None or self.category_tree.index_of(self.default_category_id) != 0:
+            self.category_tree.move(self.default_category_id, None, 0)
+            migrated = True
+        self.default_category_name = self.category_tree.name(self.default_category_id)
+        
+        # 把MOD的分类路径转换为分类ID
+        for mod_info in self.config.get("mods", {}).values():
+            if "category" in mod_info or mod_info.get("category_id") not in self.category_tree:
+                self._assign_category(mod_info)
+                migrated = True
+                
+        if migrated:
+            self._save_config()
+            
+    def _sync_category_config(self):
+        """把分类树同步到配置（同时生成旧版的分类列表和时间戳，保持兼容）"""
+        if self.default_category_id is None:
+            # 分类树尚未加载
+            return
+        categories = self.category_tree.paths()
+        self.category_timestamps = {cat: index for index, cat in enumerate(categories)}
+        self.config["category_tree"] = self.category_tree.to_list()
+        self.config["default_category_id"] = self.default_category_id
+        self.config["categories"] = categories
+        self.config["category_timestamps"] = self.category_timestamps
+        self.config["default_category_name"] = self.default_category_name
+        
     def _save_config(self):
         """保存配置到文件"""
-        # 保存分类时间戳到配置
-        self.config["category_timestamps"] = self.category_timestamps
+        # 同步分类树、分类列表和默认分类名称到配置
+        self._sync_category_config()
         
-        # 保存默认分类名称
-        self.config["default_category_name"] = self.default_category_name
+        self.mod_index.rebuild(self.config.get("mods", {}))
+        
+        if self._queue_write(full=True):
+            return
         
         try:
             # 保存配置
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=4)
-                print(f"[调试] _save_config: 配置已保存到 {self.config_file}")
+            self.storage.save_all(self.config)
         except Exception as e:
             print(f"[错误] _save_config: 保存配置文件失败: {str(e)}")
             import traceback
             traceback.print_exc()
             
+    def _save_mod(self, mod_id):
+        """只保存单个MOD的修改（SQLite后端为行级写入），同时更新索引"""
+        mod_info = self.config.get("mods", {}).get(mod_id)
+        if mod_info is not None and ("category" in mod_info or "category_id" not in mod_info):
+            # 调用方写入的分类路径在这里转换为分类ID
+            self._assign_category(mod_info)
+        self._reindex_mod(mod_id)
+        if self._queue_write(mod_ids=(mod_id,)):
+            return
+        try:
+            self.storage.save_mod(self.config, mod_id)
+        except Exception as e:
+            print(f"[错误] _save_mod: 保存MOD {mod_id} 失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            
+    def _delete_mod_record(self, mod_id):
+        """从存储中删除单个MOD记录，同时更新索引"""
+        self.mod_index.remove(mod_id)
+        if self._queue_write(mod_ids=(mod_id,)):
+            return
+        try:
+            self.storage.delete_mod(self.config, mod_id)
+        except Exception as e:
+            print(f"[错误] _delete_mod_record: 删除MOD {mod_id} 失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            
+    def _reindex_mod(self, mod_id):
+        """按MOD当前内容重新索引"""
+        mod_info = self.config.get("mods", {}).get(mod_id)
+        if mod_info is None:
+            self.mod_index.remove(mod_id)
+        else:
+            self.mod_index.update(mod_id, mod_info)
+            
+    def _save_categories(self):
+        """保存分类树、分类列表和默认分类名称"""
+        self._sync_category_config()
+        settings = ("category_tree", "default_category_id", "default_category_name")
+        if self._queue_write(categories=True, settings=settings):
+            return
+        try:
+            self.storage.save_categories(self.config)
+            for key in settings:
+                self.storage.save_setting(self.config, key)
+        except Exception as e:
+            print(f"[错误] _save_categories: 保存分类失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            
+    def _save_setting(self, key):
+        """保存单个设置项"""
+        if self._queue_write(settings=(key,)):
+            return
+        try:
+            self.storage.save_setting(self.config, key)
+        except Exception as e:
+            print(f"[错误] _save_setting: 保存设置 {key} 失败: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            
+    @contextmanager
+    def batch(self):
+        """批量修改上下文
+        
+        期间调用的add_mod/update_mod/remove_mod/set_mod_category等修改都会立即作用于内存，
+        但只在最外层上下文退出时合并为一次写入。可以嵌套使用。
+        
+        用法:
+            with config.batch():
+                for mod_id in mod_ids:
+                    config.set_mod_category(mod_id, category)
+        """
+        with self._batch_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._batch_lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    if self._write_behind_ms:
+                        self._mark_dirty()
+                    else:
+                        self._commit_batch()
+                    self.backup_index.save()
+                    if self._pending_gc:
+                        digests = self._pending_gc
+                        self._pending_gc = set()
+                        self._collect_garbage(digests)
+                        
+    def _queue_write(self, mod_ids=(), settings=(), categories=False, full=False):
+        """在batch()期间或延迟写入模式下把修改加入待写队列
+        
+        Returns:
+            bool: 已加入队列返回True，调用方无需再同步写入
+        """
+        if not (self._batch_depth or self._write_behind_ms):
+            return False
+        with self._batch_lock:
+            self._pending_mods.update(mod_ids)
+            self._pending_settings.update(settings)
+            self._pending_categories = self._pending_categories or categories
+            self._pending_full = self._pending_full or full
+            self._queued_saves += 1
+            if not self._batch_depth:
+                self._mark_dirty()
+        return True
+        
+    def _mark_dirty(self):
+        """标记有未写入的修改，并唤醒后台写入线程
+        
+        在修改配置的线程中（持有队列锁）拍下配置副本，写入线程只序列化这个副本。
+        """
+        with self._batch_lock:
+            self._pending_snapshot = self._snapshot_config()
+            if self._dirty:
+                return
+            self._dirty = True
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(target=self._writer_loop, name="ConfigWriter", daemon=True)
+                self._writer_thread.start()
+                # 写入线程是守护线程，进程退出前确保写完
+                atexit.register(self.flush)
+            self._dirty_event.set()
+            
+    def _snapshot_config(self):
+        """深拷贝当前配置；其他线程恰好在修改时重试几次，仍失败则返回None（写入时直接使用self.config）"""
+        for _ in range(3):
+            try:
+                return copy.deepcopy(self.config)
+            except RuntimeError as e:
+                error = e
+        print(f"[警告] _snapshot_config: 拷贝配置失败: {error}")
+        return None
+        
+    def _writer_loop(self):
+        """后台写入线程：被唤醒后等待一个合并窗口，再把窗口内的所有修改一次写盘"""
+        while not self._writer_stop:
+            self._dirty_event.wait()
+            if self._writer_stop:
+                break
+            time.sleep(self._write_behind_ms / 1000.0)
+            self.flush()
+            
+    def flush(self):
+        """立即写入所有待写修改"""
+        with self._batch_lock:
+            self._dirty = False
+            self._dirty_event.clear()
+        if not self._commit_batch() and self._write_behind_ms and not self._writer_stop:
+            # 写入失败的修改已放回队列，等待下一轮重试
+            self._mark_dirty()
+            
+    @property
+    def saves_avoided(self):
+        """因合并而省掉的写入次数"""
+        return max(0, self._queued_saves - self._committed_saves)
+        
+    def _commit_batch(self):
+        """提交batch()或延迟写入期间积累的修改
+        
+        Returns:
+            bool: 写入成功或没有待写内容时返回True
+        """
+        with self._batch_lock:
+            mod_ids = self._pending_mods
+            settings = self._pending_settings
+            categories = self._pending_categories
+            full = self._pending_full
+            snapshot = self._pending_snapshot
+            self._pending_mods = set()
+            self._pending_settings = set()
+            self._pending_categories = False
+            self._pending_full = False
+            self._pending_snapshot = None
+        config = snapshot if snapshot is not None else self.config
+        
+        if not (mod_ids or settings or categories or full):
+            return True
+        
+        # 写盘在队列锁之外进行，写入期间界面线程仍可继续修改配置
+        with self._write_lock:
+            try:
+                if full:
+                    self.storage.save_all(config)
+                else:
+                    self.storage.save_batch(config, mod_ids, categories, settings)
+                self._committed_saves += 1
+                print(f"[调试] _commit_batch: 已提交修改，MOD: {len(mod_ids)}，分类: {categories}，设置: {len(settings)}，累计省掉写入: {self.saves_avoided}")
+                return True
+            except Exception as e:
+                # 其他线程同时修改配置时序列化可能失败，把修改放回队列
+                print(f"[错误] _commit_batch: 提交修改失败: {str(e)}")
+                import traceback
+                traceback.print_exc()
+                with self._batch_lock:
+                    self._pending_mods.update(mod_ids)
+                    self._pending_settings.update(settings)
+                    self._pending_categories = self._pending_categories or categories
+                    self._pending_full = self._pending_full or full
+                    if self._pending_snapshot is None:
+                        self._pending_snapshot = snapshot
+                return False
+            
+    def close(self):
+        """写入所有待写修改并关闭存储后端"""
+        try:
+            if self._writer_thread is not None:
+                self._writer_stop = True
+                self._dirty_event.set()
+                self._writer_thread.join()
+                self._writer_thread = None
+                # 不再需要在进程退出时写入，也不让atexit一直持有这个实例
+                atexit.unregister(self.flush)
+            self.flush()
+            self.backup_index.save()
+            self.fingerprints.prune()
+            self.fingerprints.save()
+            self.storage.close()
+        except Exception as e:
+            print(f"[错误] close: 关闭存储失败: {str(e)}")
+            
     def is_initialized(self):
         """检查是否已初始化"""
         return self.config.get("initialized", False)
@@ -133,20 +504,219 @@ class ConfigManager:
         """设置游戏可执行文件路径"""
         self.config["game_path"] = str(path)
         self.config["initialized"] = True
-        self._save_config()
+        self._save_setting("game_path")
+        self._save_setting("initialized")
         
     def set_mods_path(self, path):
         """设置MOD文件夹路径"""
         self.config["mods_path"] = str(path)
-        self._save_config()
+        self._save_setting("mods_path")
         
     def set_backup_path(self, path):
         self.config["backup_path"] = str(path)
-        self._save_config()
+        self._save_setting("backup_path")
+        self._ensure_backup_index()
+        
+    def get_backup_root(self):
+        """备份根目录，未配置时为当前目录下的modbackup"""
+        backup_path = self.get_backup_path()
+        if not backup_path or not str(backup_path).strip():
+            backup_path = os.path.join(os.getcwd(), "modbackup")
+        return backup_path
+        
+    def _ensure_backup_index(self):
+        """备份索引不是针对当前备份根目录建立的时候重建"""
+        backup_root = self.get_backup_root()
+        if not self.backup_index.is_built_for(backup_root):
+            print(f"[调试] _ensure_backup_index: 为备份目录 {backup_root} 建立备份索引")
+            self.backup_index.build(backup_root, self.config.get("mods", {}))
+        if self.object_store is None or self.object_store.backup_root != os.path.abspath(backup_root):
+            self.object_store = ObjectStore(backup_root, self.fingerprints, self.copy_engine.copy_file)
+            
+    def get_deploy_mode(self):
+        """启用MOD时的部署方式（设置项deploy_mode），见utils.deploy.DEPLOY_MODES"""
+        mode = self.config.get("deploy_mode", "auto")
+        return mode if mode in DEPLOY_MODES else "auto"
+        
+    def set_deploy_mode(self, mode):
+        if mode not in DEPLOY_MODES:
+            raise ValueError(f"未知的部署方式: {mode}")
+        self.set("deploy_mode", mode)
+        
+    def get_copy_workers(self):
+        """批量复制的线程数：设置项copy_workers大于0时使用设置值，否则为None（由CopyScheduler根据存储类型选择）"""
+        configured = self.config.get("copy_workers", 0)
+        try:
+            configured = int(configured or 0)
+        except (TypeError, ValueError):
+            print(f"[警告] get_copy_workers: 无效的copy_workers配置: {configured}")
+            configured = 0
+        return configured if configured > 0 else None
+
+    def get_import_workers(self):
+        """批量导入的解压进程数：设置项import_workers大于0时使用设置值，否则为None（按CPU核数和任务数选择）"""
+        configured = self.config.get("import_workers", 0)
+        try:
+            configured = int(configured or 0)
+        except (TypeError, ValueError):
+            print(f"[警告] get_import_workers: 无效的import_workers配置: {configured}")
+            configured = 0
+        return configured if configured > 0 else None
+
+    def get_staging_path(self):
+        """禁用MOD时存放其文件的暂存目录
+        
+        默认为游戏Content目录下的~mods_disabled（与Paks同级，游戏不会加载），
+        MOD目录不在Paks下时放在MOD目录旁边。可以通过设置项staging_path指定。
+        """
+        staging_path = self.config.get("staging_path", "")
+        if staging_path:
+            return Path(staging_path)
+        return self._beside_mods_path("~mods_disabled")
+        
+    def get_import_staging_path(self):
+        """导入MOD时解压目标的暂存目录，与MOD目录在同一卷上，解压完成后整个MOD目录改名移入~mods"""
+        return self._beside_mods_path("~mods_importing")
+        
+    def _beside_mods_path(self, name):
+        """游戏Content目录下（与Paks同级，游戏不会加载）的目录，MOD目录不在Paks下时放在MOD目录旁边"""
+        mods_path = self.get_mods_path()
+        if not mods_path:
+            return None
+        parent = Path(mods_path).absolute().parent
+        if parent.name.lower() == "paks":
+            parent = parent.parent
+        return parent / name
+        
+    def staging_available(self):
+        """暂存目录是否可用：设置项use_staging开启，且与MOD目录在同一卷上（移动只是改名）"""
+        if not self.config.get("use_staging", True):
+            return False
+        staging_path = self.get_staging_path()
+        mods_path = self.get_mods_path()
+        if staging_path is None or not mods_path:
+            return False
+        try:
+            staging_path.mkdir(parents=True, exist_ok=True)
+            return os.stat(staging_path).st_dev == os.stat(mods_path).st_dev
+        except OSError as e:
+            print(f"[警告] staging_available: 无法使用暂存目录 {staging_path}: {e}")
+            return False
+        
+    def get_staging_dir(self, mod_id):
+        """MOD在暂存目录中的位置（不保证存在），暂存目录未配置时返回None"""
+        staging_path = self.get_staging_path()
+        return staging_path / mod_id if staging_path is not None else None
+        
+    def has_staged_files(self, mod_id):
+        staged_dir = self.get_staging_dir(mod_id)
+        if staged_dir is None or not staged_dir.is_dir():
+            return False
+        return any(files for _, _, files in os.walk(staged_dir))
+        
+    def discard_staged(self, mod_id):
+        """删除MOD在暂存目录中的文件（MOD重新导入、从备份启用或删除后不再需要）"""
+        staged_dir = self.get_staging_dir(mod_id)
+        if staged_dir is not None and staged_dir.exists():
+            print(f"[调试] discard_staged: 删除暂存目录 {staged_dir}")
+            shutil.rmtree(staged_dir, ignore_errors=True)
+        
+    def dedup_enabled(self):
+        """备份时是否存入去重对象库（设置项dedup_backups，默认开启）"""
+        return bool(self.config.get("dedup_backups", True)) and self.object_store.enabled
+        
+    def _collect_garbage(self, digests):
+        """回收不再被任何备份清单引用的对象；batch()期间推迟到最外层上下文退出时执行"""
+        if not digests:
+            return
+        if self._batch_depth:
+            self._pending_gc.update(digests)
+            return
+        try:
+            self.object_store.gc(self.backup_index.object_refs(), digests)
+        except Exception as e:
+            print(f"[错误] _collect_garbage: 回收备份对象失败: {e}")
+            import traceback
+            traceback.print_exc()
+            
+    def collect_backup_garbage(self):
+        """检查整个对象库，删除没有任何备份清单引用的对象
+        
+        Returns:
+            tuple: (删除的对象数, 释放的字节数)
+        """
+        return self.object_store.gc(self.backup_index.object_refs())
+        
+    def migrate_backups_to_store(self):
+        """把已有的按MOD分目录的备份收入去重对象库
+        
+        内容相同的文件改为指向同一个对象的硬链接，不复制数据；之后回收无引用的对象。
+        
+        Returns:
+            dict: 处理的文件数、其中重复的文件数、省掉的字节数
+        """
+        result = {"files": 0, "duplicates": 0, "bytes_saved": 0}
+        if not self.object_store.enabled:
+            print("[警告] migrate_backups_to_store: 备份目录不支持硬链接，无法去重")
+            return result
+        with self.batch():
+            for mod_id in list(self.backup_index.entries):
+                backup_dir = self.backup_index.backup_dir(mod_id)
+                digests = {}
+                for path in self.backup_index.backup_files(mod_id):
+                    try:
+                        digest, saved = self.object_store.adopt(path)
+                    except Exception as e:
+                        print(f"[错误] migrate_backups_to_store: 处理备份文件失败 {path}: {e}")
+                        continue
+                    if digest is None:
+                        continue
+                    digests[os.path.basename(path)] = digest
+                    result["files"] += 1
+                    if saved:
+                        result["duplicates"] += 1
+                        result["bytes_saved"] += saved
+                self.backup_index.record(mod_id, backup_dir, digests)
+        removed, freed = self.collect_backup_garbage()
+        self.fingerprints.save()
+        print(f"[调试] migrate_backups_to_store: 迁移完成 {result}，回收 {removed} 个对象")
+        return result
+            
+    def _save_backup_index(self):
+        """保存备份索引；batch()期间推迟到最外层上下文退出时保存"""
+        if not self._batch_depth:
+            self.backup_index.save()
+            
+    def get_backup_dir(self, mod_id):
+        """返回索引中MOD的备份目录，没有备份时返回None"""
+        return self.backup_index.backup_dir(mod_id)
+        
+    def verify_backups(self, mod_ids=None):
+        """检查备份索引中的文件清单与磁盘是否一致
+        
+        Returns:
+            dict: MOD ID -> 问题描述列表，只包含有问题的MOD
+        """
+        problems = self.backup_index.verify(mod_ids)
+        print(f"[调试] verify_backups: 检查完成，{len(problems)} 个MOD的备份有问题")
+        return problems
+        
+    def refresh_backup_index(self, mod_id):
+        """按磁盘上的备份目录重新生成MOD的文件清单"""
+        directory = self.backup_index.backup_dir(mod_id)
+        if directory is None:
+            return False
+        return self.record_backup(mod_id, directory)
+        
+    def record_backup(self, mod_id, backup_dir):
+        """把备份目录及其文件清单记录到备份索引"""
+        recorded = self.backup_index.record(mod_id, backup_dir)
+        self._save_backup_index()
+        return recorded
         
     def set_initialized(self, value=True):
         self.config["initialized"] = value
-        self._save_config()
+        self._save_setting("initialized")
         
     def get(self, key, default=None):
         """通用方法：获取任意配置项"""
@@ -155,7 +725,10 @@ class ConfigManager:
     def set(self, key, value):
         """通用方法：设置任意配置项"""
         self.config[key] = value
-        self._save_config()
+        if key in ("mods", "categories", "category_timestamps"):
+            self._save_config()
+        else:
+            self._save_setting(key)
         
     def get_game_path(self):
         """获取游戏可执行文件路径"""
@@ -170,211 +743,280 @@ class ConfigManager:
         return self.config.get("backup_path", "")
         
     def get_categories(self):
-        """获取所有分类，按创建时间排序"""
-        categories = self.config.get("categories", [self.default_category_name])
+        """获取所有分类的路径，按分类树顺序排列（默认分类在最前）"""
+        return self.category_tree.paths()
         
-        # 确保默认分类存在
-        if self.default_category_name not in categories:
-            categories.insert(0, self.default_category_name)
-            
-        # 确保所有分类都有时间戳
-        for cat in categories:
-            if cat not in self.category_timestamps:
-                # 如果是默认分类，设置为最早时间戳
-                if cat == self.default_category_name:
-                    self.category_timestamps[cat] = 0
-                else:
-                    # 为其他分类设置当前时间戳
-                    self.category_timestamps[cat] = int(time.time())
+    def get_category_id(self, category):
+        """根据分类路径获取分类ID，找不到返回None"""
+        if category == "默认分类":
+            return self.default_category_id
+        return self.category_tree.find(category)
         
-        # 按时间戳排序分类
-        try:
-            sorted_categories = sorted(categories, key=lambda x: self.category_timestamps.get(x, int(time.time())))
-            return sorted_categories
-        except Exception as e:
-            print(f"[错误] get_categories: 排序分类失败: {e}")
-            return categories
+    def get_category_path(self, category_id):
+        """根据分类ID获取分类路径，分类不存在时返回默认分类"""
+        if category_id not in self.category_tree:
+            category_id = self.default_category_id
+        return self.category_tree.path(category_id)
+        
+    def get_mod_category(self, mod_info):
+        """获取MOD所属分类的路径"""
+        if "category" in mod_info:
+            # 尚未保存的MOD信息中可能还是分类路径
+            return mod_info["category"] or self.default_category_name
+        return self.get_category_path(mod_info.get("category_id"))
+        
+    def _category_id_for(self, category):
+        """把分类路径转换为分类ID，分类不存在时自动创建"""
+        if not category:
+            return self.default_category_id
+        category_id = self.get_category_id(category)
+        if category_id is None:
+            category_id = self.category_tree.ensure_path(category)
+            print(f"[调试] _category_id_for: 自动创建分类 {category}")
+            self._save_categories()
+        return category_id
+        
+    def _assign_category(self, mod_info):
+        """把MOD信息中的分类路径转换为分类ID"""
+        category = mod_info.pop("category", None)
+        if category is not None:
+            try:
+                mod_info["category_id"] = self._category_id_for(category)
+                return
+            except ValueError as e:
+                print(f"[警告] _assign_category: 无效的分类 {category}: {e}")
+        if mod_info.get("category_id") not in self.category_tree:
+            mod_info["category_id"] = self.default_category_id
         
     def set_categories(self, categories):
-        """设置分类列表"""
-        # 确保默认分类始终存在
-        if self.default_category_name not in categories:
-            categories.insert(0, self.default_category_name)
+        """按分类路径列表设置分类
         
-        # 如果"默认分类"存在但不是当前默认分类名称，需要更新MOD的分类
-        if "默认分类" in categories and "默认分类" != self.default_category_name:
-            # 将所有使用"默认分类"的MOD更新为当前默认分类名称
-            mods = self.config.get("mods", {})
-            updated = 0
-            for mod_id, mod_info in mods.items():
-                if mod_info.get("category") == "默认分类":
-                    mod_info["category"] = self.default_category_name
-                    self.config["mods"][mod_id] = mod_info
-                    updated += 1
-            
-            if updated:
-                print(f"[调试] set_categories: 更新了 {updated} 个MOD的分类从 默认分类 到 {self.default_category_name}")
-            
-            # 从分类列表中移除旧的"默认分类"
-            categories = [cat for cat in categories if cat != "默认分类"]
-            
-        # 保存原有分类列表，用于检测删除的分类
-        old_categories = set(self.config.get("categories", [self.default_category_name]))
-        new_categories = set(categories)
-        
-        # 检测已删除的分类，清理它们的时间戳
-        deleted_categories = old_categories - new_categories
-        for cat in deleted_categories:
-            if cat in self.category_timestamps and cat != self.default_category_name:
-                del self.category_timestamps[cat]
-                print(f"[调试] set_categories: 删除分类时间戳: {cat}")
-                
-        # 更新分类时间戳，为新添加的分类创建时间戳
-        current_time = int(time.time())
+        列表中不存在的分类会被创建，同级分类按列表顺序排列；
+        分类树中有但列表中没有的分类会被删除，其中的MOD移到最近的上级分类（没有则移到默认分类）。
+        """
+        # 旧版名称"默认分类"始终指向当前默认分类
+        paths = []
         for cat in categories:
-            if cat not in self.category_timestamps:
-                self.category_timestamps[cat] = current_time
-                current_time += 1
-                print(f"[调试] set_categories: 新增分类时间戳: {cat} = {current_time}")
+            if cat == "默认分类" and self.default_category_name != "默认分类":
+                cat = self.default_category_name
+            if cat and cat not in paths:
+                paths.append(cat)
                 
-        # 确保默认分类的时间戳是最小的
-        if self.default_category_name in self.category_timestamps:
-            self.category_timestamps[self.default_category_name] = 0
-            
-        # 确保默认分类始终在第一位
-        if self.default_category_name in categories:
-            categories.remove(self.default_category_name)
-            categories.insert(0, self.default_category_name)
-                
-        # 按时间戳排序后保存
-        sorted_categories = sorted(categories, key=lambda x: self.category_timestamps.get(x, current_time))
-        self.config["categories"] = sorted_categories
-        self._save_config()
-        print(f"[调试] set_categories: 保存排序后的分类: {sorted_categories}")
+        with self.batch():
+            keep_ids = set()
+            order = {}
+            for path in paths:
+                try:
+                    node_id = self.category_tree.ensure_path(path)
+                except ValueError as e:
+                    print(f"[警告] set_categories: 跳过无效分类 {path}: {e}")
+                    continue
+                # 路径上的各级上级分类都保留
+                ancestor = node_id
+                while ancestor is not None and ancestor not in keep_ids:
+                    keep_ids.add(ancestor)
+                    ancestor = self.category_tree.parent(ancestor)
+                siblings = order.setdefault(self.category_tree.parent(node_id), [])
+                if node_id not in siblings:
+                    siblings.append(node_id)
+            keep_ids.add(self.default_category_id)
+            
+            self._prune_categories(keep_ids)
+            
+            # 同级分类按列表顺序排列，列表中未出现的上级分类保持原位置
+            for parent_id, ordered_ids in order.items():
+                for index, node_id in enumerate(ordered_ids):
+                    if self.category_tree.index_of(node_id) != index:
+                        self.category_tree.move(node_id, parent_id, index)
+            # 确保默认分类始终在第一位
+            self.category_tree.move(self.default_category_id, None, 0)
+            
+            self._save_categories()
+        print(f"[调试] set_categories: 保存分类: {self.get_categories()}")
+        
+    def _prune_categories(self, keep_ids):
+        """删除不在keep_ids中的分类，返回被移动的MOD数量"""
+        removed_roots = [node_id for node_id in self.category_tree.walk()
+                         if node_id not in keep_ids
+                         and self.category_tree.parent(node_id) in keep_ids | {None}]
+        moved = 0
+        for node_id in removed_roots:
+            parent_id = self.category_tree.parent(node_id)
+            moved += self._remove_category_node(node_id, parent_id if parent_id is not None else self.default_category_id)
+        return moved
+        
+    def _remove_category_node(self, node_id, move_to_id):
+        """删除分类节点及其子分类，其中的MOD移到move_to_id分类，返回被移动的MOD数量"""
+        path = self.category_tree.path(node_id)
+        removed_ids = self.category_tree.remove(node_id)
+        mods = self.config.get("mods", {})
+        moved = 0
+        with self.batch():
+            for mod_id in self.mod_index.lookup_any("category_id", removed_ids):
+                mods[mod_id]["category_id"] = move_to_id
+                self._save_mod(mod_id)
+                moved += 1
+            self._save_categories()
+        print(f"[调试] _remove_category_node: 删除分类 {path}，{moved} 个MOD移至 {self.category_tree.path(move_to_id)}")
+        return moved
         
     def add_category(self, name):
-        """添加新分类"""
-        if name not in self.config["categories"]:
-            # 记录创建时间戳
-            self.category_timestamps[name] = int(time.time())
-            
-            # 确保默认分类的时间戳是最小的
-            self.category_timestamps["默认分类"] = 0
-            
-            # 添加分类到列表
-            categories = self.config.get("categories", ["默认分类"])
-            categories.append(name)
-            
-            # 按时间戳排序
-            sorted_categories = sorted(categories, key=lambda x: self.category_timestamps.get(x, 0))
-            self.config["categories"] = sorted_categories
-            self._save_config()
+        """添加新分类，name可以是"一级/二级"形式的路径，缺失的上级分类会一并创建
+        
+        Returns:
+            int: 分类ID，名称无效时返回None
+        """
+        category_id = self.get_category_id(name)
+        if category_id is not None:
+            return category_id
+        try:
+            category_id = self.category_tree.ensure_path(name)
+        except ValueError as e:
+            print(f"[警告] add_category: 无法添加分类 {name}: {e}")
+            return None
+        self._save_categories()
+        return category_id
             
     def rename_category(self, old_name, new_name):
-        """重命名分类，并同步所有MOD的category字段"""
+        """重命名分类
+        
+        只修改分类树中的一个节点，子分类和MOD通过ID引用，不需要改动。
+        
+        Args:
+            old_name: 原分类路径
+            new_name: 新名称，也可以是同一上级下的完整路径
+        """
         print(f"[调试] rename_category: 开始重命名分类 {old_name} -> {new_name}")
-        print(f"[调试] rename_category: 当前分类列表: {self.config['categories']}")
-        print(f"[调试] rename_category: 当前默认分类名称: {self.default_category_name}")
+        node_id = self.get_category_id(old_name)
+        if node_id is None:
+            print(f"[警告] rename_category: 分类 {old_name} 不存在")
+            return False
+        new_leaf = new_name.rsplit(CategoryTree.SEPARATOR, 1)[-1]
+        try:
+            self.category_tree.rename(node_id, new_leaf)
+        except ValueError as e:
+            print(f"[警告] rename_category: 重命名失败: {e}")
+            return False
+        if node_id == self.default_category_id:
+            self.default_category_name = new_leaf
+            print(f"[调试] rename_category: 默认分类名称已更新为 {new_leaf}")
+        self._save_categories()
+        return True
         
-        if old_name in self.config["categories"] and new_name not in self.config["categories"]:
-            idx = self.config["categories"].index(old_name)
-            print(f"[调试] rename_category: 找到分类 {old_name} 在索引 {idx}")
-            
-            # 如果是重命名默认分类，确保新名称成为新的默认分类
-            if old_name == self.default_category_name:
-                print(f"[调试] rename_category: 正在重命名默认分类 {old_name}")
-                
-                # 修改所有使用默认分类的MOD到新名称
-                mods = self.config.get("mods", {})
-                updated = 0
-                for mod_id, mod_info in mods.items():
-                    if mod_info.get("category") == old_name:
-                        mod_info["category"] = new_name
-                        self.config["mods"][mod_id] = mod_info
-                        updated += 1
-                        print(f"[调试] rename_category: 更新MOD {mod_id} 分类从 {old_name} 到 {new_name}")
-                    # 同时处理"默认分类"的特殊情况
-                    elif mod_info.get("category") == "默认分类" and old_name == self.default_category_name:
-                        mod_info["category"] = new_name
-                        self.config["mods"][mod_id] = mod_info
-                        updated += 1
-                        print(f"[调试] rename_category: 更新MOD {mod_id} 分类从 默认分类 到 {new_name}")
-                
-                if updated:
-                    print(f"[调试] rename_category: 同步更新了{updated}个MOD的分类字段")
-                
-                # 将默认分类名称改为新名称
-                self.config["categories"][idx] = new_name
-                print(f"[调试] rename_category: 在分类列表中将 {old_name} 替换为 {new_name}")
-                
-                # 更新时间戳，确保新名称的时间戳是最早的（0），保持在第一位
-                self.category_timestamps[new_name] = 0
-                print(f"[调试] rename_category: 设置 {new_name} 的时间戳为 0")
-                
-                # 删除旧的默认分类时间戳
-                if self.default_category_name in self.category_timestamps and self.default_category_name != new_name:
-                    del self.category_timestamps[self.default_category_name]
-                    print(f"[调试] rename_category: 删除旧默认分类 {self.default_category_name} 的时间戳")
-                
-                # 标记新名称为默认分类（用于set_categories方法）
-                self.default_category_name = new_name
-                print(f"[调试] rename_category: 默认分类名称已更新为 {new_name}")
-                
-                # 确保默认分类不会被重新添加
-                print(f"[调试] rename_category: 修改后的分类列表: {self.config['categories']}")
-                print(f"[调试] rename_category: 修改后的时间戳: {self.category_timestamps}")
-            else:
-                # 正常分类重命名
-                self.config["categories"][idx] = new_name
-                
-                # 同步所有MOD的category字段
-                mods = self.config.get("mods", {})
-                updated = 0
-                for mod_id, mod_info in mods.items():
-                    if mod_info.get("category") == old_name:
-                        mod_info["category"] = new_name
-                        updated += 1
-                
-                if updated:
-                    print(f"[调试] rename_category: 同步更新了{updated}个MOD的分类字段")
-                
-                # 更新时间戳
-                self.category_timestamps[new_name] = self.category_timestamps.get(old_name, 0)
-                # 删除旧分类的时间戳
-                if old_name in self.category_timestamps:
-                    del self.category_timestamps[old_name]
-                    
-            self._save_config()
+    def move_category(self, category, new_parent=None, index=None):
+        """移动分类（连同子分类）到新的上级分类下
+        
+        Args:
+            category: 要移动的分类路径
+            new_parent: 新的上级分类路径，None表示移到根级
+            index: 在新上级分类下的位置，None表示末尾
             
-    def delete_category(self, name):
-        """删除分类"""
-        if name != "默认分类" and name in self.config["categories"]:
-            self.config["categories"].remove(name)
+        Returns:
+            bool: 是否移动成功
+        """
+        node_id = self.get_category_id(category)
+        if node_id is None:
+            print(f"[警告] move_category: 分类 {category} 不存在")
+            return False
+        parent_id = None
+        if new_parent:
+            parent_id = self.get_category_id(new_parent)
+            if parent_id is None:
+                print(f"[警告] move_category: 上级分类 {new_parent} 不存在")
+                return False
+        if node_id == self.default_category_id and parent_id is not None:
+            print("[警告] move_category: 默认分类只能位于根级")
+            return False
+        if parent_id is None and index == 0 and node_id != self.default_category_id:
+            # 默认分类始终在第一位
+            index = 1
+        try:
+            self.category_tree.move(node_id, parent_id, index)
+        except ValueError as e:
+            print(f"[警告] move_category: 移动分类失败: {e}")
+            return False
+        print(f"[调试] move_category: 分类 {category} 已移动到 {self.category_tree.path(node_id)}")
+        self._save_categories()
+        return True
             
-            # 删除分类的时间戳
-            if name in self.category_timestamps:
-                del self.category_timestamps[name]
-                
-            self._save_config()
+    def delete_category(self, name, move_to=None):
+        """删除分类及其子分类
+        
+        Args:
+            name: 分类路径
+            move_to: 其中MOD的去向分类路径，默认为默认分类
+        """
+        node_id = self.get_category_id(name)
+        if node_id is None or node_id == self.default_category_id:
+            return 0
+        move_to_id = self.get_category_id(move_to) if move_to else None
+        if move_to_id is None or move_to_id in self.category_tree.subtree(node_id):
+            move_to_id = self.default_category_id
+        return self._remove_category_node(node_id, move_to_id)
             
     def get_mods(self):
         """获取所有MOD信息"""
         return self.config.get("mods", {})
         
+    def mods_in_category(self, category, enabled=None):
+        """通过索引获取指定分类下的MOD ID列表（按MOD表顺序）
+        
+        Args:
+            category: 分类名称（二级分类为"一级/二级"）
+            enabled: 为True/False时只返回已启用/已禁用的MOD，为None时不过滤
+        """
+        category_id = self.get_category_id(category)
+        if category_id is None:
+            return []
+        if category_id == self.default_category_id:
+            # 没有设置分类的MOD属于默认分类
+            mod_ids = self.mod_index.lookup_any("category_id", (category_id, None))
+        else:
+            mod_ids = self.mod_index.lookup("category_id", category_id)
+        if enabled is None:
+            return mod_ids
+        return [mod_id for mod_id in mod_ids if self.mod_index.matches(mod_id, "enabled", bool(enabled))]
+        
+    def mods_under_category(self, category):
+        """通过索引获取分类及其所有子分类下的MOD ID列表"""
+        category_id = self.get_category_id(category)
+        if category_id is None:
+            return []
+        category_ids = self.category_tree.subtree(category_id)
+        if category_id == self.default_category_id:
+            category_ids.append(None)
+        return self.mod_index.lookup_any("category_id", category_ids)
+        
+    def find_mod_by_original_path(self, original_path):
+        """通过original_path查找MOD ID，找不到时返回None"""
+        return self.mod_index.first("original_path", str(original_path))
+        
+    def find_mod_by_folder_name(self, folder_name):
+        """通过文件夹名称查找MOD ID，找不到时返回None"""
+        return self.mod_index.first("folder_name", folder_name)
+        
+    def find_mod_by_real_name(self, real_name):
+        """通过原始名称查找MOD ID，找不到时返回None"""
+        return self.mod_index.first("real_name", real_name)
+        
     def add_mod(self, mod_id, mod_info):
         """添加MOD信息，自动补充导入日期"""
         if 'import_date' not in mod_info:
             mod_info['import_date'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         # 确保使用mod_info中的name作为MOD ID
         actual_mod_id = mod_info.get('name', mod_id)
-        self.config["mods"][actual_mod_id] = mod_info
-        self._save_config()
+        self.config["mods"][actual_mod_id] = ModRecord.from_json(mod_info)
+        self._save_mod(actual_mod_id)
         
     def remove_mod(self, mod_id):
         """删除MOD信息"""
         if mod_id in self.config["mods"]:
             del self.config["mods"][mod_id]
-            self._save_config()
+            self._delete_mod_record(mod_id)
+            digests = self.backup_index.digests(mod_id)
+            self.backup_index.remove(mod_id)
+            self._save_backup_index()
+            self._collect_garbage(digests)
             
     def update_mod(self, mod_id, mod_info):
         """更新MOD信息"""
@@ -386,10 +1028,9 @@ class ConfigManager:
                 print(f"[调试] update_mod: 检测到MOD重命名 {mod_id} -> {new_name}")
                 
                 # 获取备份路径
-                backup_path = self.get_backup_path()
-                if not backup_path or not str(backup_path).strip():
-                    backup_path = os.path.join(os.getcwd(), "modbackup")
-                backup_path = Path(backup_path)
+                backup_path = Path(self.get_backup_root())
+                # 重命名后的备份目录，None表示备份目录没有变化
+                moved_backup_dir = None
                 
                 # 旧备份目录
                 old_backup_dir = backup_path / mod_id
@@ -406,6 +1047,7 @@ class ConfigManager:
                         # 重命名备份目录
                         print(f"[调试] update_mod: 重命名备份目录 {old_backup_dir} -> {new_backup_dir}")
                         shutil.move(str(old_backup_dir), str(new_backup_dir))
+                        moved_backup_dir = new_backup_dir
                     except Exception as e:
                         print(f"[警告] update_mod: 重命名备份目录失败: {e}")
                         # 如果重命名失败，尝试复制文件
@@ -416,12 +1058,25 @@ class ConfigManager:
                             # 复制所有文件
                             for file in old_backup_dir.glob('*'):
                                 if file.is_file():
-                                    shutil.copy2(file, new_backup_dir / file.name)
+                                    self.copy_engine.copy_file(file, new_backup_dir / file.name)
                             
                             print(f"[调试] update_mod: 已复制备份文件到新目录 {new_backup_dir}")
+                            moved_backup_dir = new_backup_dir
                         except Exception as copy_err:
                             print(f"[错误] update_mod: 复制备份文件失败: {copy_err}")
                 
+                # 暂存目录跟随MOD ID
+                old_staged_dir = self.get_staging_dir(mod_id)
+                if old_staged_dir is not None and old_staged_dir.exists():
+                    new_staged_dir = self.get_staging_dir(new_name)
+                    try:
+                        if new_staged_dir.exists():
+                            shutil.rmtree(new_staged_dir)
+                        os.replace(old_staged_dir, new_staged_dir)
+                        print(f"[调试] update_mod: 重命名暂存目录 {old_staged_dir} -> {new_staged_dir}")
+                    except Exception as e:
+                        print(f"[警告] update_mod: 重命名暂存目录失败: {e}")
+                
                 # 检查是否有预览图需要更新路径
                 preview_image = mod_info.get('preview_image', '')
                 if preview_image:
@@ -454,17 +1109,22 @@ class ConfigManager:
                                     print(f"[警告] update_mod: 复制预览图失败: {e}")
                 
                 # 复制MOD信息到新ID
-                self.config["mods"][new_name] = mod_info.copy()
+                self.config["mods"][new_name] = ModRecord(mod_info)
                 # 删除旧ID
                 del self.config["mods"][mod_id]
                 # 保存配置
-                self._save_config()
+                self._delete_mod_record(mod_id)
+                self._save_mod(new_name)
+                self.backup_index.rename(mod_id, new_name, moved_backup_dir)
+                self._save_backup_index()
                 print(f"[调试] update_mod: MOD ID已更改，新配置: {self.config['mods'].keys()}")
                 return
             
-            # 正常更新MOD信息
-            self.config["mods"][mod_id].update(mod_info)
-            self._save_config()
+            # 正常更新MOD信息（调用方通常直接修改get_mods()返回的记录，此时无需再复制）
+            record = self.config["mods"][mod_id]
+            if record is not mod_info:
+                record.update(mod_info)
+            self._save_mod(mod_id)
             
     def set_mod_category(self, mod_id, category):
         """设置MOD的分类
@@ -484,20 +1144,13 @@ class ConfigManager:
             # 获取MOD信息
             mod_info = self.config["mods"][mod_id]
             
-            # 检查分类是否存在
-            categories = self.get_categories()
-            if category not in categories:
-                print(f"[警告] set_mod_category: 分类 {category} 不存在，添加到分类列表")
-                # 如果分类不存在，添加到分类列表
-                self.add_category(category)
-                
-            # 更新MOD的分类
-            old_category = mod_info.get('category', self.default_category_name)
-            mod_info['category'] = category
+            # 分类不存在时会自动添加到分类树
+            old_category = self.get_mod_category(mod_info)
+            mod_info.pop('category', None)
+            mod_info['category_id'] = self._category_id_for(category)
             
             # 更新MOD信息
-            self.config["mods"][mod_id] = mod_info
-            self._save_config()
+            self._save_mod(mod_id)
             
             print(f"[调试] set_mod_category: MOD {mod_id} 分类已从 {old_category} 更新为 {category}")
             return True
@@ -507,9 +1160,14 @@ class ConfigManager:
             
     def backup_mod(self, mod_id, mod_info):
         """备份MOD文件：将相关文件复制到备份目录"""
+        # 确保使用正确的MOD ID
+        actual_mod_id = mod_info.get('name', mod_id)
+        # 失败时的清理需要知道进行到哪一步
+        mod_backup_dir = None
+        backup_existed = False
+        digests = {}
+        old_digests = set()
         try:
-            # 确保使用正确的MOD ID
-            actual_mod_id = mod_info.get('name', mod_id)
             print(f"[调试] backup_mod: 开始备份MOD {actual_mod_id}")
             
             # 获取配置的备份路径
@@ -536,9 +1194,12 @@ class ConfigManager:
             mod_backup_dir = backup_path / actual_mod_id
             print(f"[调试] backup_mod: MOD专属备份目录: {mod_backup_dir}, 绝对路径: {mod_backup_dir.absolute()}")
             
-            if mod_backup_dir.exists():
-                print(f"[调试] backup_mod: 清理已存在的备份目录 {mod_backup_dir}")
-                shutil.rmtree(mod_backup_dir)
+            # 旧备份引用的对象，重新备份后没有引用的会被回收
+            old_digests = self.backup_index.digests(actual_mod_id)
+            # 增量备份：已有的备份目录不再整个删除，只复制新增或变化的文件，最后删除多余的文件
+            backup_existed = mod_backup_dir.exists()
+            old_entry = self.backup_index.get(actual_mod_id)
+            old_manifest = old_entry["files"] if old_entry and old_entry["dir"] == mod_backup_dir.name else {}
             
             # 获取MOD目录路径
             mods_path = Path(self.get_mods_path())
@@ -616,32 +1277,76 @@ class ConfigManager:
             
             print(f"[调试] backup_mod: 备份文件列表准备完成，共有 {len(files_to_backup)} 个文件")
             
-            # 复制所有文件
-            for src_file, dest_name in files_to_backup:
-                dest_file = mod_backup_dir / dest_name
-                try:
-                    print(f"[调试] backup_mod: 复制文件 {src_file} -> {dest_file}")
-                    shutil.copy2(src_file, dest_file)
-                    copied_count += 1
-                    print(f"[调试] backup_mod: 复制成功")
-                except Exception as e:
-                    print(f"[错误] backup_mod: 复制文件失败 {src_file} -> {dest_file}: {e}")
-                    import traceback
-                    traceback.print_exc()
-            
-            # 备份预览图（如果存在）
+            # 备份预览图（如果存在），与MOD文件一样只在变化时复制
             preview_image = mod_info.get('preview_image', '')
+            preview_name = None
             if preview_image and os.path.exists(preview_image):
-                try:
-                    preview_ext = os.path.splitext(preview_image)[1]
-                    dest_preview = mod_backup_dir / f"preview{preview_ext}"
-                    print(f"[调试] backup_mod: 复制预览图 {preview_image} -> {dest_preview}")
-                    shutil.copy2(preview_image, dest_preview)
+                preview_name = f"preview{os.path.splitext(preview_image)[1]}"
+            
+            # 复制新增或变化的文件（多个文件并行，大文件优先）；启用去重时存入对象库，备份目录中是指向对象的硬链接
+            # 每个文件先写临时文件再替换，中途失败时备份中的每个文件都是完整的旧版本或新版本
+            dedup = self.dedup_enabled()
+            verify_content = self.config.get("backup_verify_content", False)
+            kept_count = 0
+            scheduler = CopyScheduler(self.copy_engine, self.get_copy_workers())
+            for src_file, dest_name in files_to_backup:
+                dest_file = mod_backup_dir / dest_name
+                if self._backup_file_unchanged(src_file, dest_file, old_manifest.get(dest_name), verify_content):
+                    kept_count += 1
+                    continue
+                print(f"[调试] backup_mod: 复制文件 {src_file} -> {dest_file}")
+                scheduler.add(src_file, dest_file, tag=dest_name,
+                              copy_func=self.object_store.store if dedup else self.copy_engine.copy_file)
+            copy_results = scheduler.run(f"备份 {actual_mod_id}")
+            cancelled = False
+            failed_count = 0
+            for dest_name, result in copy_results.items():
+                for src_file, dest_file, error in result['errors']:
+                    cancelled = cancelled or isinstance(error, CopyCancelled)
+                    failed_count += 1
+                for src_file, dest_file, value in result['done']:
+                    if dedup:
+                        digests[dest_name] = value
                     copied_count += 1
-                except Exception as e:
-                    print(f"[错误] backup_mod: 复制预览图失败: {e}")
+            if cancelled:
+                raise CopyCancelled("备份已取消")
             
-            print(f"[调试] backup_mod: 备份完成，复制了 {copied_count} 个文件")
+            if preview_name:
+                dest_preview = mod_backup_dir / preview_name
+                if self._backup_file_unchanged(preview_image, dest_preview, None, verify_content):
+                    kept_count += 1
+                else:
+                    try:
+                        print(f"[调试] backup_mod: 复制预览图 {preview_image} -> {dest_preview}")
+                        self.copy_engine.copy_file(preview_image, dest_preview)
+                        copied_count += 1
+                    except Exception as e:
+                        print(f"[错误] backup_mod: 复制预览图失败: {e}")
+            
+            # 所有文件都已就位后才删除备份中多余的旧文件；有文件复制失败时保留旧文件
+            removed_count = 0
+            if failed_count == 0:
+                wanted = {dest_name for _, dest_name in files_to_backup}
+                if preview_name:
+                    wanted.add(preview_name)
+                for entry in os.scandir(mod_backup_dir):
+                    if entry.is_file() and entry.name not in wanted:
+                        print(f"[调试] backup_mod: 删除备份中多余的文件 {entry.path}")
+                        os.remove(entry.path)
+                        removed_count += 1
+            
+            print(f"[调试] backup_mod: 备份完成，复制了 {copied_count} 个文件，"
+                  f"{kept_count} 个文件未变化，删除了 {removed_count} 个旧文件")
+            
+            # 记录到备份索引，启用时直接按ID找到备份目录
+            if copied_count + kept_count > 0:
+                self.backup_index.record(actual_mod_id, mod_backup_dir, digests)
+                # 有文件变化时暂存目录中是旧版本的文件
+                if copied_count or removed_count:
+                    self.discard_staged(actual_mod_id)
+            else:
+                self.backup_index.remove(actual_mod_id)
+            self._collect_garbage(old_digests)
             
             # 检查是否已存在相同ID的MOD
             if actual_mod_id in self.config["mods"]:
@@ -650,36 +1355,89 @@ class ConfigManager:
             else:
                 print(f"[调试] backup_mod: 添加新MOD: {actual_mod_id}")
                 self.add_mod(actual_mod_id, mod_info)
+            self._save_backup_index()
             
-            return copied_count > 0
+            return copied_count + kept_count > 0
         except Exception as e:
             print(f"[调试] backup_mod: 备份失败 {str(e)}")
             import traceback
             traceback.print_exc()
+            # 原来就有的备份保留（每个文件都是完整的），只刷新索引中的清单
+            if backup_existed:
+                try:
+                    self.backup_index.record(actual_mod_id, mod_backup_dir, digests)
+                    self._save_backup_index()
+                    self._collect_garbage(set(digests.values()) | old_digests)
+                except Exception as cleanup_e:
+                    print(f"[错误] backup_mod: 刷新备份索引或回收对象失败: {cleanup_e}")
+                    traceback.print_exc()
+                return False
             # 清理失败的备份
-            if 'mod_backup_dir' in locals() and mod_backup_dir.exists():
+            if mod_backup_dir is not None and mod_backup_dir.exists():
                 try:
                     shutil.rmtree(mod_backup_dir)
-                except:
-                    pass
+                    # 备份目录已删除，索引中的记录和本次存入的对象都不再有效
+                    self.backup_index.remove(actual_mod_id)
+                    self._save_backup_index()
+                    self._collect_garbage(set(digests.values()) | old_digests)
+                except Exception as cleanup_e:
+                    print(f"[错误] backup_mod: 清理失败的备份 {mod_backup_dir} 失败: {cleanup_e}")
+                    traceback.print_exc()
             # 不抛出异常，返回失败状态
             return False
 
-    def clean_invalid_mods(self):
-        """清理无效的MOD记录（没有实际文件和备份的MOD）"""
+    def _backup_file_unchanged(self, src_file, dest_file, manifest_info, verify_content=False):
+        """备份中的文件是否与源文件相同，相同时增量备份跳过该文件
+        
+        大小和修改时间都相同时认为未变化（复制时保留了修改时间）；大小相同但修改时间不同
+        （例如去重时链接到了其他MOD存入的同内容对象）或设置了backup_verify_content时比较内容哈希，
+        备份文件的哈希优先使用备份索引清单中记录的值，不需要重新读取备份文件。
+        
+        Args:
+            manifest_info: 备份索引中该文件的清单项[大小, 修改时间, 哈希]，没有时为None
+        """
+        try:
+            src_st = os.stat(src_file)
+            dest_st = os.stat(dest_file)
+        except OSError:
+            return False
+        if src_st.st_size != dest_st.st_size:
+            return False
+        if src_st.st_mtime_ns == dest_st.st_mtime_ns and not verify_content:
+            return True
+        dest_digest = None
+        if (manifest_info and len(manifest_info) > 2 and manifest_info[0] == dest_st.st_size
+                and manifest_info[1] == dest_st.st_mtime_ns):
+            dest_digest = manifest_info[2]
+        if dest_digest is None:
+            dest_digest = self.fingerprints.fingerprint(dest_file)
+        src_digest = self.fingerprints.fingerprint(src_file)
+        return src_digest is not None and src_digest == dest_digest
+
+    def clean_invalid_mods(self, mod_ids=None, fs_cache=None):
+        """清理无效的MOD记录（没有实际文件和备份的MOD）
+        
+        Args:
+            mod_ids: 只检查这些MOD，None表示检查全部（文件监视增量更新时只检查受影响的MOD）
+            fs_cache: 本次操作共享的FsCache，None时新建一个；每个目录只列出一次
+        """
         print("[调试] clean_invalid_mods: 开始清理无效MOD记录")
+        fs = fs_cache if fs_cache is not None else FsCache()
         mods_to_remove = []
         mods = self.get_mods()
         backup_path = Path(self.get_backup_path())
         mods_path = Path(self.get_mods_path())
         
         # 如果备份路径不存在，创建它
-        if not backup_path.exists():
+        if not fs.exists(backup_path):
             print(f"[调试] clean_invalid_mods: 创建备份目录 {backup_path}")
             backup_path.mkdir(parents=True, exist_ok=True)
+            fs.invalidate(backup_path)
         
         # 遍历所有MOD，检查文件是否存在
         for mod_id, mod_info in mods.items():
+            if mod_ids is not None and mod_id not in mod_ids:
+                continue
             files_exist = False
             backup_exists = False
             original_exists = False
@@ -688,7 +1446,7 @@ class ConfigManager:
             if 'files' in mod_info:
                 for file_path in mod_info.get('files', []):
                     full_path = mods_path / file_path
-                    if full_path.exists():
+                    if fs.exists(full_path):
                         print(f"[调试] clean_invalid_mods: MOD {mod_id} 文件存在: {full_path}")
                         files_exist = True
                         break
@@ -698,7 +1456,7 @@ class ConfigManager:
                 # 检查原始文件是否存在
                 if 'original_path' in mod_info:
                     orig_path = Path(mod_info['original_path'])
-                    if orig_path.exists():
+                    if fs.exists(orig_path):
                         print(f"[调试] clean_invalid_mods: MOD {mod_id} 原始文件存在: {orig_path}")
                         original_exists = True
                 
@@ -716,29 +1474,80 @@ class ConfigManager:
                 # 移除空字符串和重复项
                 base_names = list(set([name for name in base_names if name]))
                 
+                # 备份索引中记录的目录优先
+                indexed_dir = self.backup_index.backup_dir(mod_id)
+                if indexed_dir is not None and indexed_dir != str(backup_path / mod_id):
+                    base_names.insert(0, indexed_dir)
+                
                 # 检查每个可能的备份目录是否存在且不为空
                 for name in base_names:
                     backup_dir = backup_path / name
-                    if backup_dir.exists() and list(backup_dir.glob('*')):
+                    if fs.listdir(backup_dir):
                         print(f"[调试] clean_invalid_mods: MOD {mod_id} 备份存在: {backup_dir}")
                         backup_exists = True
                         break
             
+            # 禁用时移到暂存目录的文件
+            if not files_exist and not backup_exists and self.has_staged_files(mod_id):
+                print(f"[调试] clean_invalid_mods: MOD {mod_id} 暂存文件存在")
+                backup_exists = True
+            
             # 如果MOD文件、原始文件和备份都不存在，标记为删除
             if not files_exist and not backup_exists and not original_exists:
                 print(f"[调试] clean_invalid_mods: MOD {mod_id} 无效（无文件也无备份），将标记为删除")
                 mods_to_remove.append(mod_id)
         
         # 删除无效的MOD
-        for mod_id in mods_to_remove:
-            print(f"[调试] clean_invalid_mods: 删除无效MOD记录 {mod_id}")
-            self.remove_mod(mod_id)
+        with self.batch():
+            for mod_id in mods_to_remove:
+                print(f"[调试] clean_invalid_mods: 删除无效MOD记录 {mod_id}")
+                self.remove_mod(mod_id)
             
-        # 保存更改
-        self._save_config()
-        print(f"[调试] clean_invalid_mods: 清理完成，共删除 {len(mods_to_remove)} 条无效记录")
+        print(f"[调试] clean_invalid_mods: 清理完成，共删除 {len(mods_to_remove)} 条无效记录，目录缓存 {fs.stats()}")
         return len(mods_to_remove)
 
+    def find_mods_by_paths(self, paths):
+        """找出受这些文件或目录变化影响的MOD
+        
+        MOD的某个文件就是变化的路径或位于变化的目录中，或者变化发生在该MOD可能的备份目录中。
+        只比较路径字符串，不访问文件系统。
+        
+        Returns:
+            set: MOD ID集合
+        """
+        mods_root = os.path.abspath(self.get_mods_path()) if self.get_mods_path() else None
+        backup_root = os.path.abspath(self.get_backup_path()) if self.get_backup_path() else None
+        rel_paths = set()
+        backup_names = set()
+        for path in paths:
+            path = os.path.abspath(path)
+            if mods_root and path.startswith(mods_root + os.sep):
+                rel_paths.add(os.path.relpath(path, mods_root))
+            elif backup_root and path.startswith(backup_root + os.sep):
+                backup_names.add(os.path.relpath(path, backup_root).split(os.sep)[0])
+        
+        affected = set()
+        for mod_id, mod_info in self.get_mods().items():
+            if backup_names:
+                indexed = self.backup_index.get(mod_id)
+                names = (mod_id, mod_info.get('display_name'), mod_info.get('mod_name'),
+                         mod_info.get('folder_name'), mod_info.get('name'), mod_info.get('real_name'),
+                         indexed["dir"] if indexed else None)
+                if any(name in backup_names for name in names if name):
+                    affected.add(mod_id)
+                    continue
+            if not rel_paths:
+                continue
+            for file_path in mod_info.get('files', []):
+                # 依次检查文件本身和它的各级上级目录
+                rel_path = os.path.normpath(file_path)
+                while rel_path and rel_path not in rel_paths:
+                    rel_path = os.path.dirname(rel_path)
+                if rel_path:
+                    affected.add(mod_id)
+                    break
+        return affected
+
     def update_mod_file_paths(self, mod_id, new_paths=None):
         """更新MOD文件路径，用于修正错误的文件路径"""
         mod_info = self.config["mods"].get(mod_id)
@@ -848,7 +1657,7 @@ class ConfigManager:
                     dest_file = target_dir / path.name
                     if not dest_file.exists():
                         print(f"[调试] restore_mod_from_backup: 复制原始文件 {path} -> {dest_file}")
-                        shutil.copy2(path, dest_file)
+                        self.copy_engine.copy_file(path, dest_file)
                         return True
             
             # 寻找可能的备份目录
@@ -899,14 +1708,15 @@ class ConfigManager:
             print(f"[调试] restore_mod_from_backup: 从备份目录复制文件到 {target_dir}")
             copied_count = 0
             
-            # 复制备份目录中的所有文件
+            # 复制备份目录中的所有文件（按部署方式链接或复制）
+            deploy_mode = resolve_deploy_mode(self.get_deploy_mode(), mod_backup_dir, target_dir)
             for src_file in backup_files:
                 if src_file.is_file():
                     try:
                         # 直接复制到目标目录
                         dest_file = target_dir / src_file.name
-                        print(f"[调试] restore_mod_from_backup: 复制文件 {src_file} -> {dest_file}")
-                        shutil.copy2(src_file, dest_file)
+                        print(f"[调试] restore_mod_from_backup: {deploy_mode} {src_file} -> {dest_file}")
+                        deploy_file(src_file, dest_file, deploy_mode, self.copy_engine.copy_file)
                         copied_count += 1
                     except Exception as e:
                         print(f"[错误] restore_mod_from_backup: 复制文件失败 {src_file} -> {dest_file}: {e}")
@@ -946,83 +1756,33 @@ class ConfigManager:
             raise ValueError(f"MOD还原失败: {str(e)}")
 
     def update_mod_categories(self, valid_categories=None):
-        """更新所有MOD的分类信息，确保它们的分类路径正确"""
-        # 如果未提供有效分类列表，使用当前配置的分类列表
-        if valid_categories is None:
-            valid_categories = set(self.get_categories())
-        else:
-            # 确保valid_categories是集合类型，而不是列表
-            valid_categories = set(valid_categories)
-            
-        # 确保默认分类始终存在
-        valid_categories.add(self.default_category_name)
-            
-        print(f"[调试] config_manager.update_mod_categories: 有效分类列表: {valid_categories}")
-        
-        # 更新MOD的分类信息
-        mods = self.get_mods()
-        updated_count = 0
-        default_count = 0
+        """删除不在valid_categories中的分类，并把引用了无效分类的MOD移到上级分类或默认分类
         
-        # 先检查默认分类相关的特殊情况
-        for mod_id, mod_info in mods.items():
-            current_category = mod_info.get('category', self.default_category_name)
-            
-            # 特殊处理默认分类作为子分类的情况
-            if '/' in current_category and current_category.endswith('/' + self.default_category_name):
-                # 将其还原为顶级默认分类
-                old_category = current_category
-                mod_info['category'] = self.default_category_name
-                self.update_mod(mod_id, mod_info)
-                print(f"[调试] config_manager.update_mod_categories: 修正 MOD {mod_id} 的分类从 {old_category} 为顶级默认分类")
+        Returns:
+            int: 被更新分类的MOD数量
+        """
+        with self.batch():
+            updated_count = 0
+            if valid_categories is not None:
+                # 路径上的各级上级分类都视为有效
+                keep_ids = {self.default_category_id}
+                for category in valid_categories:
+                    node_id = self.get_category_id(category)
+                    while node_id is not None and node_id not in keep_ids:
+                        keep_ids.add(node_id)
+                        node_id = self.category_tree.parent(node_id)
+                updated_count += self._prune_categories(keep_ids)
+            
+            # 通过索引找出引用了不存在分类的MOD
+            mods = self.get_mods()
+            invalid_ids = [cat_id for cat_id in self.mod_index.values("category_id")
+                           if cat_id is None or cat_id not in self.category_tree]
+            for mod_id in self.mod_index.lookup_any("category_id", invalid_ids):
+                mods[mod_id]["category_id"] = self.default_category_id
+                self._save_mod(mod_id)
+                print(f"[调试] config_manager.update_mod_categories: MOD {mod_id} 的分类无效，移至默认分类 {self.default_category_name}")
                 updated_count += 1
-                default_count += 1
-        
-        # 处理常规分类变更情况
-        for mod_id, mod_info in mods.items():
-            current_category = mod_info.get('category', self.default_category_name)
             
-            # 如果当前分类有效，不做修改
-            if current_category in valid_categories:
-                continue
-                
-            # 如果分类不存在，检查父级分类是否存在
-            parent_category = None
-            if '/' in current_category:
-                parent_name = current_category.split('/', 1)[0]
-                if parent_name in valid_categories:
-                    parent_category = parent_name
-            
-            # 分类变更处理
-            old_category = current_category
-            if parent_category:
-                mod_info['category'] = parent_category
-                print(f"[调试] config_manager.update_mod_categories: MOD {mod_id} 的分类从 {old_category} 更新为父级分类 {parent_category}")
-            else:
-                mod_info['category'] = self.default_category_name
-                print(f"[调试] config_manager.update_mod_categories: MOD {mod_id} 的分类从 {old_category} 更新为默认分类 {self.default_category_name}")
-                default_count += 1
-            
-            self.update_mod(mod_id, mod_info)
-            updated_count += 1
-        
-        # 输出详细日志
-        if updated_count > 0:
-            print(f"[调试] config_manager.update_mod_categories: 已更新 {updated_count} 个MOD的分类信息，其中 {default_count} 个移至默认分类")
-        
-        # 确保配置中的categories列表只包含实际有效的分类，不添加新分类
-        # 将传入的valid_categories视为权威来源，而不是添加新分类
-        sorted_categories = list(valid_categories)
-        
-        # 确保默认分类在列表的第一位
-        if self.default_category_name in sorted_categories:
-            sorted_categories.remove(self.default_category_name)
-        sorted_categories.insert(0, self.default_category_name)
-        
-        # 设置分类列表，但不创建新的分类
-        print(f"[调试] config_manager.update_mod_categories: 更新配置中的分类列表: {sorted_categories}")
-        # 不使用set_categories，而是直接更新config，避免创建新分类
-        self.config["categories"] = sorted_categories
-        self._save_config()
-        
+            if updated_count > 0:
+                print(f"[调试] config_manager.update_mod_categories: 已更新 {updated_count} 个MOD的分类信息")
         return updated_count 
\ No newline at end of file
@@ -0,0 +1,400 @@
+import json
+import os
+import sqlite3
+import threading
+
+
+def json_default(obj):
+    """json序列化钩子：ModRecord等提供to_json()的对象转换为普通字典"""
+    if hasattr(obj, "to_json"):
+        return obj.to_json()
+    raise TypeError(f"无法序列化的对象: {type(obj).__name__}")
+
+
+def atomic_write_text(path, text):
+    """原子写入文本文件：先写临时文件并落盘，再用rename替换目标文件"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class JsonConfigStorage:
+    """JSON配置存储：所有修改都会整体重写config.json（原有行为）"""
+
+    name = "json"
+
+    def __init__(self, config_file):
+        self.config_file = config_file
+
+    def exists(self):
+        return os.path.exists(self.config_file)
+
+    def load(self):
+        """读取整个配置字典"""
+        with open(self.config_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_all(self, config):
+        """整体保存配置（临时文件+重命名，写入中途崩溃不会损坏原文件）"""
+        atomic_write_text(self.config_file, json.dumps(config, ensure_ascii=False, default=json_default, indent=4))
+        print(f"[调试] _save_config: 配置已保存到 {self.config_file}")
+
+    # JSON格式没有行级写入，以下方法全部退化为整体保存
+    def save_mod(self, config, mod_id):
+        self.save_all(config)
+
+    def delete_mod(self, config, mod_id):
+        self.save_all(config)
+
+    def save_categories(self, config):
+        self.save_all(config)
+
+    def save_setting(self, config, key):
+        self.save_all(config)
+
+    def save_batch(self, config, mod_ids, categories=False, settings=()):
+        """批量提交：JSON格式只需整体写入一次"""
+        self.save_all(config)
+
+    def close(self):
+        pass
+
+
+class JournalConfigStorage:
+    """日志式JSON配置存储
+    
+    config.json作为快照，每次修改只向config.journal追加一行记录，开销与MOD总数无关。
+    加载时在快照上重放日志；日志超过阈值后由后台线程把当前配置原子写入新快照并截断日志。
+    每条记录都是完整的最终状态（整个MOD、整个分类列表或单个设置），重复重放结果不变，
+    因此在压缩的任意阶段崩溃都不会丢失数据。
+    """
+
+    name = "journal"
+
+    # 日志超过该大小（字节）时触发后台压缩
+    COMPACT_THRESHOLD = 1024 * 1024
+
+    def __init__(self, config_file, compact_threshold=None):
+        self.config_file = config_file
+        self.journal_file = os.path.splitext(config_file)[0] + ".journal"
+        self.compact_threshold = compact_threshold or self.COMPACT_THRESHOLD
+        self._lock = threading.RLock()
+        self._compact_thread = None
+
+    def exists(self):
+        return os.path.exists(self.config_file) or os.path.exists(self.journal_file)
+
+    def load(self):
+        """读取快照并重放日志"""
+        config = {}
+        if os.path.exists(self.config_file):
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        config.setdefault("mods", {})
+
+        replayed = 0
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 最后一行可能在崩溃时只写了一半，忽略即可
+                        print(f"[警告] JournalConfigStorage: 跳过损坏的日志记录: {line[:80]}")
+                        continue
+                    self._apply(config, record)
+                    replayed += 1
+        if replayed:
+            print(f"[调试] JournalConfigStorage: 在快照上重放了 {replayed} 条日志记录")
+        return config
+
+    def save_all(self, config):
+        """整体保存：直接写新快照并删除日志（日志中的记录都已包含在快照里，不能再重放到新快照上）"""
+        with self._lock:
+            self._write_snapshot(json.dumps(config, ensure_ascii=False, default=json_default, indent=4), None)
+
+    def save_mod(self, config, mod_id):
+        self._append([self._mod_record(config, mod_id)], config)
+
+    def delete_mod(self, config, mod_id):
+        self._append([{"op": "del_mod", "id": mod_id}], config)
+
+    def save_categories(self, config):
+        self._append([self._categories_record(config)], config)
+
+    def save_setting(self, config, key):
+        self._append([self._setting_record(config, key)], config)
+
+    def save_batch(self, config, mod_ids, categories=False, settings=()):
+        """批量提交：所有记录一次追加"""
+        records = [self._mod_record(config, mod_id) for mod_id in mod_ids]
+        if categories:
+            records.append(self._categories_record(config))
+        records.extend(self._setting_record(config, key) for key in settings)
+        self._append(records, config)
+
+    def compact(self, config):
+        """把当前配置写成新快照，并只保留快照之后追加的日志
+
+        序列化、写快照和截断日志都在同一个锁内，不会覆盖save_all在此期间写入的更新的快照。
+        """
+        with self._lock:
+            try:
+                offset = os.path.getsize(self.journal_file) if os.path.exists(self.journal_file) else 0
+                text = json.dumps(config, ensure_ascii=False, default=json_default, indent=4)
+            except (OSError, RuntimeError) as e:
+                # 其他线程正在修改配置时序列化可能失败，下次再压缩
+                print(f"[警告] JournalConfigStorage: 压缩时序列化配置失败: {e}")
+                return False
+            self._write_snapshot(text, offset)
+        return True
+
+    def close(self):
+        if self._compact_thread is not None:
+            self._compact_thread.join()
+
+    def _append(self, records, config):
+        data = "".join(json.dumps(record, ensure_ascii=False, default=json_default) + "\n" for record in records)
+        with self._lock:
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            size = os.path.getsize(self.journal_file)
+        if size >= self.compact_threshold:
+            self._start_compaction(config)
+
+    def _start_compaction(self, config):
+        if self._compact_thread is not None and self._compact_thread.is_alive():
+            return
+        print(f"[调试] JournalConfigStorage: 日志超过 {self.compact_threshold} 字节，开始后台压缩")
+        self._compact_thread = threading.Thread(target=self.compact, args=(config,), daemon=True)
+        self._compact_thread.start()
+
+    def _write_snapshot(self, text, offset):
+        """写入快照，然后丢弃偏移量offset之前（已包含在快照里）的日志，offset为None时删除整个日志
+
+        调用方必须持有self._lock。
+        """
+        atomic_write_text(self.config_file, text)
+        if os.path.exists(self.journal_file):
+            remaining = ""
+            if offset is not None:
+                with open(self.journal_file, 'r', encoding='utf-8') as f:
+                    f.seek(offset)
+                    remaining = f.read()
+            if remaining:
+                atomic_write_text(self.journal_file, remaining)
+            else:
+                os.remove(self.journal_file)
+        print(f"[调试] JournalConfigStorage: 已写入新快照 {self.config_file}")
+
+    @staticmethod
+    def _mod_record(config, mod_id):
+        mod_info = config.get("mods", {}).get(mod_id)
+        if mod_info is None:
+            return {"op": "del_mod", "id": mod_id}
+        return {"op": "mod", "id": mod_id, "data": mod_info}
+
+    @staticmethod
+    def _categories_record(config):
+        return {
+            "op": "categories",
+            "categories": config.get("categories", []),
+            "timestamps": config.get("category_timestamps", {}),
+        }
+
+    @staticmethod
+    def _setting_record(config, key):
+        if key in config:
+            return {"op": "set", "key": key, "value": config[key]}
+        return {"op": "unset", "key": key}
+
+    @staticmethod
+    def _apply(config, record):
+        op = record.get("op")
+        if op == "mod":
+            # 与dict赋值语义一致：已存在的MOD保持位置，新MOD追加到末尾
+            config["mods"][record["id"]] = record["data"]
+        elif op == "del_mod":
+            config["mods"].pop(record["id"], None)
+        elif op == "categories":
+            config["categories"] = record["categories"]
+            config["category_timestamps"] = record["timestamps"]
+        elif op == "set":
+            config[record["key"]] = record["value"]
+        elif op == "unset":
+            config.pop(record["key"], None)
+
+
+class SqliteConfigStorage:
+    """SQLite配置存储（WAL模式）：MOD、分类和设置分表保存，修改只写对应的行"""
+
+    name = "sqlite"
+
+    # 不作为普通设置保存的键，它们有专门的表
+    TABLE_KEYS = ("mods", "categories", "category_timestamps")
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS mods (
+            mod_id TEXT PRIMARY KEY,
+            category TEXT,
+            enabled INTEGER NOT NULL DEFAULT 0,
+            original_path TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS categories (
+            name TEXT PRIMARY KEY,
+            position INTEGER NOT NULL,
+            timestamp INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_mods_category ON mods(category);
+        CREATE INDEX IF NOT EXISTS idx_mods_enabled ON mods(enabled);
+        CREATE INDEX IF NOT EXISTS idx_mods_original_path ON mods(original_path);
+    """
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        # 导入线程也会写配置，连接需要跨线程使用，由锁保证串行
+        self._lock = threading.RLock()
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    def exists(self):
+        return os.path.exists(self.db_file)
+
+    def load(self):
+        """从数据库组装出与config.json结构相同的配置字典"""
+        with self._lock:
+            config = {}
+            for key, value in self.conn.execute("SELECT key, value FROM settings"):
+                config[key] = json.loads(value)
+
+            categories = []
+            timestamps = {}
+            for name, timestamp in self.conn.execute(
+                    "SELECT name, timestamp FROM categories ORDER BY position"):
+                categories.append(name)
+                timestamps[name] = timestamp
+            config["categories"] = categories
+            config["category_timestamps"] = timestamps
+
+            mods = {}
+            for mod_id, data in self.conn.execute("SELECT mod_id, data FROM mods ORDER BY rowid"):
+                mods[mod_id] = json.loads(data)
+            config["mods"] = mods
+            return config
+
+    def import_config(self, config):
+        """一次性从JSON配置迁移数据"""
+        self.save_all(config)
+        print(f"[调试] SqliteConfigStorage: 已从JSON迁移 {len(config.get('mods', {}))} 个MOD到 {self.db_file}")
+
+    def save_all(self, config):
+        """整体同步：在一个事务中写入所有表"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM mods")
+            for mod_id, mod_info in config.get("mods", {}).items():
+                self._upsert_mod(mod_id, mod_info)
+            self._write_categories(config)
+            self.conn.execute("DELETE FROM settings")
+            for key in config:
+                if key not in self.TABLE_KEYS:
+                    self._write_setting(key, config[key])
+
+    def save_mod(self, config, mod_id):
+        """只写入一个MOD的行"""
+        mod_info = config.get("mods", {}).get(mod_id)
+        with self._lock, self.conn:
+            if mod_info is None:
+                self.conn.execute("DELETE FROM mods WHERE mod_id = ?", (mod_id,))
+            else:
+                self._upsert_mod(mod_id, mod_info)
+
+    def delete_mod(self, config, mod_id):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM mods WHERE mod_id = ?", (mod_id,))
+
+    def save_categories(self, config):
+        with self._lock, self.conn:
+            self._write_categories(config)
+
+    def save_setting(self, config, key):
+        with self._lock, self.conn:
+            if key in config:
+                self._write_setting(key, config[key])
+            else:
+                self.conn.execute("DELETE FROM settings WHERE key = ?", (key,))
+
+    def save_batch(self, config, mod_ids, categories=False, settings=()):
+        """批量提交：在一个事务中写入所有变更的行"""
+        mods = config.get("mods", {})
+        with self._lock, self.conn:
+            for mod_id in mod_ids:
+                if mod_id in mods:
+                    self._upsert_mod(mod_id, mods[mod_id])
+                else:
+                    self.conn.execute("DELETE FROM mods WHERE mod_id = ?", (mod_id,))
+            if categories:
+                self._write_categories(config)
+            for key in settings:
+                if key in config:
+                    self._write_setting(key, config[key])
+                else:
+                    self.conn.execute("DELETE FROM settings WHERE key = ?", (key,))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _upsert_mod(self, mod_id, mod_info):
+        # 使用UPSERT而不是REPLACE，保持rowid不变，从而保持MOD的原有顺序
+        self.conn.execute(
+            "INSERT INTO mods (mod_id, category, enabled, original_path, data) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(mod_id) DO UPDATE SET category = excluded.category, enabled = excluded.enabled, "
+            "original_path = excluded.original_path, data = excluded.data",
+            (
+                mod_id,
+                # 分类列保存分类ID，旧版配置中是分类路径
+                mod_info.get("category_id", mod_info.get("category")),
+                1 if mod_info.get("enabled", False) else 0,
+                mod_info.get("original_path"),
+                json.dumps(mod_info, ensure_ascii=False, default=json_default),
+            ),
+        )
+
+    def _write_categories(self, config):
+        timestamps = config.get("category_timestamps", {})
+        self.conn.execute("DELETE FROM categories")
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO categories (name, position, timestamp) VALUES (?, ?, ?)",
+            [(name, index, timestamps.get(name, 0)) for index, name in enumerate(config.get("categories", []))],
+        )
+
+    def _write_setting(self, key, value):
+        self.conn.execute(
+            "INSERT INTO settings (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value, ensure_ascii=False, default=json_default)),
+        )
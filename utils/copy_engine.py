@@ -0,0 +1,319 @@
+import os
+import shutil
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+
+class CopyCancelled(Exception):
+    """复制被取消"""
+
+
+class CopyOperation:
+    """一次复制操作的状态：进度、取消标志和吞吐量统计
+
+    每个操作是独立的对象，取消只影响这一个操作，多个线程（例如后台备份和导入）同时使用
+    同一个CopyEngine时互不干扰。可以事先创建好交给CopyEngine.operation()，
+    这样在操作开始之前（例如界面上的取消按钮）就能持有它。
+    """
+
+    def __init__(self, label, total_bytes=0, progress_callback=None):
+        """
+        Args:
+            label: 操作名称，显示在进度和统计中
+            total_bytes: 预计复制的总字节数，未知时为0
+            progress_callback: 进度回调，参数为(已复制字节数, 总字节数, 操作名称)；None时使用CopyEngine的回调
+        """
+        self.label = label
+        self.total = total_bytes
+        self.progress_callback = progress_callback
+        self.done = 0
+        self.files = 0
+        self.start = time.perf_counter()
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """请求取消：正在复制的文件在下一块之前停止，本操作之后的复制立即失败"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise CopyCancelled("复制已取消")
+
+    def current_rate(self):
+        """平均速度（MB/s）"""
+        seconds = time.perf_counter() - self.start
+        return (self.done / (1024 * 1024)) / seconds if seconds > 0 else 0.0
+
+    def advance(self, n):
+        with self._lock:
+            self.done += n
+            return self.done
+
+    def add_file(self):
+        with self._lock:
+            self.files += 1
+
+
+class CopyEngine:
+    """分块复制文件，支持进度回调、协作式取消和吞吐量统计
+
+    Linux上优先使用copy_file_range（同一文件系统上可能由内核或文件系统直接完成，甚至共享数据块），
+    不支持时使用sendfile，其他情况使用大缓冲区读写。每个文件先写到同目录下的临时文件，
+    完成后再改名为目标文件，取消或出错时删除临时文件，不会留下复制了一半的文件。
+
+    一次"操作"（例如备份一个MOD、启用一批MOD）用operation()包起来，
+    进度回调收到的是操作内累计的字节数，结束时记录该操作的MB/s。
+    当前操作按线程记录：不同线程中的操作各自统计、各自取消；
+    线程池中的工作线程用attach()加入发起线程的操作。
+    """
+
+    # 每次读写或copy_file_range的块大小
+    CHUNK_SIZE = 8 * 1024 * 1024
+    # 最多保留多少条操作统计
+    MAX_RECORDS = 100
+
+    def __init__(self, progress_callback=None, chunk_size=None):
+        """
+        Args:
+            progress_callback: 默认的进度回调，参数为(已复制字节数, 总字节数, 操作名称)，总字节数未知时为0；
+                操作自己指定了回调时使用操作的回调
+            chunk_size: 块大小，None时使用CHUNK_SIZE
+        """
+        self.progress_callback = progress_callback
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self._lock = threading.Lock()
+        # 每个线程当前的操作和嵌套深度
+        self._local = threading.local()
+        # 最近的操作统计：{"label", "files", "bytes", "seconds", "mb_per_s", "cancelled"}
+        self.records = []
+        self._use_copy_file_range = hasattr(os, "copy_file_range")
+        self._use_sendfile = sys.platform.startswith("linux") and hasattr(os, "sendfile")
+
+    # ---- 取消 ----
+
+    @property
+    def current_operation(self):
+        """调用线程当前的操作，没有时为None"""
+        return getattr(self._local, "operation", None)
+
+    def cancel(self, operation=None):
+        """取消一个操作，operation为None时取消调用线程当前的操作（例如在进度回调中取消）
+
+        只影响这一个操作，其他线程中的操作和之后开始的操作不受影响。
+        """
+        operation = operation or self.current_operation
+        if operation is not None:
+            operation.cancel()
+
+    @property
+    def cancelled(self):
+        operation = self.current_operation
+        return operation is not None and operation.cancelled
+
+    def check_cancelled(self):
+        operation = self.current_operation
+        if operation is not None:
+            operation.check_cancelled()
+
+    # ---- 操作和统计 ----
+
+    @contextmanager
+    def operation(self, label, total_bytes=0, progress_callback=None):
+        """一次复制操作，可以嵌套（只有最外层创建操作、记录统计，内层沿用外层的操作）
+
+        Args:
+            label: 操作名称，或事先创建的CopyOperation
+            total_bytes: 预计复制的总字节数，未知时为0
+            progress_callback: 本操作的进度回调，None时使用self.progress_callback
+
+        Yields:
+            CopyOperation: 当前线程的操作
+        """
+        current = self.current_operation
+        if current is not None:
+            self._local.depth += 1
+            try:
+                yield current
+            finally:
+                self._local.depth -= 1
+            return
+        if isinstance(label, CopyOperation):
+            operation = label
+            operation.start = time.perf_counter()
+        else:
+            operation = CopyOperation(label, total_bytes, progress_callback)
+        cancelled = False
+        with self.attach(operation):
+            try:
+                yield operation
+            except CopyCancelled:
+                cancelled = True
+                raise
+            finally:
+                self._record(operation, cancelled or operation.cancelled)
+
+    @contextmanager
+    def attach(self, operation):
+        """让调用线程加入一个已经开始的操作（用于线程池中的工作线程），进度和取消都计入该操作"""
+        previous = (self.current_operation, getattr(self._local, "depth", 0))
+        self._local.operation = operation
+        self._local.depth = 1
+        try:
+            yield operation
+        finally:
+            self._local.operation, self._local.depth = previous
+
+    def _record(self, operation, cancelled):
+        seconds = time.perf_counter() - operation.start
+        mb_per_s = (operation.done / (1024 * 1024)) / seconds if seconds > 0 else 0.0
+        record = {
+            "label": operation.label,
+            "files": operation.files,
+            "bytes": operation.done,
+            "seconds": round(seconds, 3),
+            "mb_per_s": round(mb_per_s, 1),
+            "cancelled": cancelled,
+        }
+        with self._lock:
+            self.records.append(record)
+            del self.records[:-self.MAX_RECORDS]
+        print(f"[调试] CopyEngine: {operation.label}: {operation.files} 个文件，{operation.done / (1024 * 1024):.1f} MB，"
+              f"{seconds:.2f} 秒，{mb_per_s:.1f} MB/s{'（已取消）' if cancelled else ''}")
+
+    def current_rate(self, operation=None):
+        """操作的平均速度（MB/s），operation为None时使用调用线程当前的操作"""
+        operation = operation or self.current_operation
+        return operation.current_rate() if operation is not None else 0.0
+
+    def last_record(self):
+        with self._lock:
+            return self.records[-1] if self.records else None
+
+    def _advance(self, n):
+        operation = self.current_operation
+        done = operation.advance(n)
+        callback = operation.progress_callback or self.progress_callback
+        if callback is not None:
+            try:
+                callback(done, operation.total, operation.label)
+            except Exception as e:
+                print(f"[警告] CopyEngine: 进度回调出错: {e}")
+
+    # ---- 复制 ----
+
+    def copy_file(self, src, dest, follow_symlinks=True):
+        """复制文件内容和元数据（同shutil.copy2），返回目标路径
+
+        dest是目录时复制到该目录下的同名文件，参数与shutil.copy2兼容，可以作为copytree的copy_function。
+        """
+        src = os.fspath(src)
+        dest = os.fspath(dest)
+        if os.path.isdir(dest):
+            dest = os.path.join(dest, os.path.basename(src))
+        with self.operation(f"复制 {os.path.basename(src)}"):
+            self.check_cancelled()
+            tmp_path = f"{dest}.{uuid.uuid4().hex}.part"
+            try:
+                with open(src, 'rb', buffering=0) as fsrc, open(tmp_path, 'wb', buffering=0) as fdst:
+                    size = os.fstat(fsrc.fileno()).st_size
+                    self._copy_data(fsrc, fdst, size)
+                shutil.copystat(src, tmp_path, follow_symlinks=follow_symlinks)
+                os.replace(tmp_path, dest)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+            self.current_operation.add_file()
+        return dest
+
+    def copy_stream(self, fsrc, dest, size=0):
+        """把已打开的读取流（例如压缩包成员）写入dest，同样先写临时文件再改名
+
+        Args:
+            size: 预计的字节数，只用于日志，未知时为0
+        """
+        dest = os.fspath(dest)
+        with self.operation(f"写入 {os.path.basename(dest)}", size):
+            self.check_cancelled()
+            tmp_path = f"{dest}.{uuid.uuid4().hex}.part"
+            try:
+                with open(tmp_path, 'wb', buffering=0) as fdst:
+                    while True:
+                        self.check_cancelled()
+                        data = fsrc.read(self.chunk_size)
+                        if not data:
+                            break
+                        view = memoryview(data)
+                        written = 0
+                        while written < len(data):
+                            written += fdst.write(view[written:])
+                        self._advance(len(data))
+                os.replace(tmp_path, dest)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+            self.current_operation.add_file()
+        return dest
+
+    def copytree(self, src, dest, dirs_exist_ok=False):
+        """复制目录树，每个文件都经过copy_file"""
+        return shutil.copytree(src, dest, copy_function=self.copy_file, dirs_exist_ok=dirs_exist_ok)
+
+    def _copy_data(self, fsrc, fdst, size):
+        infd = fsrc.fileno()
+        outfd = fdst.fileno()
+        if self._use_copy_file_range and size > 0:
+            try:
+                self._copy_loop(lambda n: os.copy_file_range(infd, outfd, n), size)
+                return
+            except OSError:
+                # 跨文件系统（旧内核）或文件系统不支持时退回
+                self._use_copy_file_range = False
+                self._rewind(fsrc, fdst)
+        if self._use_sendfile and size > 0:
+            try:
+                self._copy_loop(lambda n: os.sendfile(outfd, infd, None, n), size)
+                return
+            except OSError:
+                self._use_sendfile = False
+                self._rewind(fsrc, fdst)
+        buf = bytearray(self.chunk_size)
+        view = memoryview(buf)
+        while True:
+            self.check_cancelled()
+            n = fsrc.readinto(buf)
+            if not n:
+                break
+            written = 0
+            while written < n:
+                written += fdst.write(view[written:n])
+            self._advance(n)
+
+    def _copy_loop(self, copy_chunk, size):
+        copied = 0
+        while copied < size:
+            self.check_cancelled()
+            n = copy_chunk(min(self.chunk_size, size - copied))
+            if n == 0:
+                break
+            copied += n
+            self._advance(n)
+
+    def _rewind(self, fsrc, fdst):
+        """快速路径中途失败后从头开始普通复制（已报告的进度不回退，只是会略多于实际）"""
+        os.lseek(fsrc.fileno(), 0, os.SEEK_SET)
+        os.lseek(fdst.fileno(), 0, os.SEEK_SET)
+        os.ftruncate(fdst.fileno(), 0)
@@ -0,0 +1,136 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.mod_scanner import detect_storage_kind
+from utils.copy_engine import CopyCancelled
+
+# (目录, 存储类型)缓存，每个目录只判断一次
+_storage_kinds = {}
+_storage_kinds_lock = threading.Lock()
+
+
+def _storage_kind(path):
+    path = os.path.abspath(os.fspath(path))
+    with _storage_kinds_lock:
+        if path in _storage_kinds:
+            return _storage_kinds[path]
+    kind = detect_storage_kind(path)
+    with _storage_kinds_lock:
+        _storage_kinds[path] = kind
+    return kind
+
+
+def default_copy_workers(src_dir, dest_dir):
+    """根据源和目标的存储类型选择并行复制的线程数
+
+    任一端是机械硬盘时并发读写只会增加寻道，使用1个线程按源路径顺序复制；
+    SSD（尤其是NVMe）需要多个并发请求才能跑满带宽；网络共享并发可以重叠往返延迟；
+    无法判断时使用适中的并发数。
+    """
+    kinds = {_storage_kind(src_dir), _storage_kind(dest_dir)}
+    if "hdd" in kinds:
+        workers = 1
+    elif kinds <= {"ssd"}:
+        workers = 8
+    elif "network" in kinds:
+        workers = 8
+    else:
+        workers = 4
+    print(f"[调试] default_copy_workers: {src_dir} -> {dest_dir} 存储类型 {sorted(kinds)}，复制线程数 {workers}")
+    return workers
+
+
+class CopyScheduler:
+    """把多个MOD的文件复制任务放在一起并行执行
+
+    用add()加入任务后调用run()：线程数有上限，大文件先开始（最长处理时间优先，缩短总耗时）；
+    机械硬盘上退回单线程，并按源路径顺序复制以减少寻道。
+    所有复制都在CopyEngine的同一个操作内进行，进度、取消和吞吐量统计覆盖整批任务。
+    """
+
+    def __init__(self, copy_engine, workers=None):
+        """
+        Args:
+            copy_engine: CopyEngine
+            workers: 线程数，None表示根据第一个任务的源和目标目录的存储类型自动选择
+        """
+        self.copy_engine = copy_engine
+        self.workers = workers
+        # (序号, 大小, 源, 目标, 标签, 复制函数)
+        self.jobs = []
+
+    def add(self, src, dest, tag=None, copy_func=None):
+        """加入一个复制任务
+
+        Args:
+            tag: 任务所属的分组（例如MOD ID），结果按分组汇总
+            copy_func: 复制函数(src, dest)，返回值记录在结果中；None表示CopyEngine.copy_file
+        """
+        try:
+            size = os.path.getsize(src)
+        except OSError:
+            size = 0
+        self.jobs.append((len(self.jobs), size, src, dest, tag, copy_func or self.copy_engine.copy_file))
+
+    @property
+    def total_bytes(self):
+        return sum(job[1] for job in self.jobs)
+
+    def _ordered_jobs(self, workers):
+        if workers == 1:
+            # 顺序复制：按源路径排列，同一目录的文件连续读取
+            return sorted(self.jobs, key=lambda job: (os.fspath(job[2]), job[0]))
+        # 最长处理时间优先
+        return sorted(self.jobs, key=lambda job: (-job[1], job[0]))
+
+    def run(self, label="复制文件"):
+        """执行所有任务
+
+        某个任务失败不影响其他任务；取消时尚未开始的任务都会以CopyCancelled失败。
+
+        Returns:
+            dict: 标签 -> {"done": [(源, 目标, 复制函数返回值)], "errors": [(源, 目标, 异常)]}
+        """
+        results = {}
+        if not self.jobs:
+            return results
+        workers = self.workers
+        if workers is None:
+            first = self.jobs[0]
+            workers = default_copy_workers(os.path.dirname(os.fspath(first[2])), os.path.dirname(os.fspath(first[3])))
+        workers = max(1, min(workers, len(self.jobs)))
+        for job in self.jobs:
+            results.setdefault(job[4], {"done": [], "errors": []})
+        lock = threading.Lock()
+
+        def run_job(job):
+            _, _, src, dest, tag, copy_func = job
+            try:
+                value = copy_func(src, dest)
+                with lock:
+                    results[tag]["done"].append((src, dest, value))
+            except Exception as e:
+                if not isinstance(e, CopyCancelled):
+                    print(f"[错误] CopyScheduler: 复制失败 {src} -> {dest}: {e}")
+                with lock:
+                    results[tag]["errors"].append((src, dest, e))
+
+        jobs = self._ordered_jobs(workers)
+        print(f"[调试] CopyScheduler.run: {label}，{len(jobs)} 个文件，{self.total_bytes / (1024 * 1024):.1f} MB，{workers} 个线程")
+        try:
+            with self.copy_engine.operation(label, self.total_bytes) as operation:
+                if workers == 1:
+                    for job in jobs:
+                        run_job(job)
+                else:
+                    # 工作线程加入本线程的操作，进度和取消覆盖整批任务
+                    def run_attached(job):
+                        with self.copy_engine.attach(operation):
+                            run_job(job)
+
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        list(executor.map(run_attached, jobs))
+        except CopyCancelled:
+            pass
+        self.jobs = []
+        return results
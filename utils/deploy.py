@@ -0,0 +1,175 @@
+import os
+import shutil
+import sys
+import threading
+import uuid
+
+# 启用MOD时把备份文件放到~mods中的方式
+#   auto     同一文件系统上使用写时复制（reflink），不支持时复制；不会自动使用硬链接
+#   hardlink 硬链接（需要手动选择）：不占额外空间，瞬间完成；但~mods中的文件与备份是同一个inode，
+#            原地修改~mods中的文件会同时改坏备份。去重对象库中的备份本身就是.objects中共享文件的
+#            硬链接，再链接会让所有内容相同的MOD共用同一份数据，因此源文件已有其他硬链接
+#            （st_nlink > 1）时拒绝硬链接，改为复制
+#   reflink  写时复制克隆（Btrfs、XFS、APFS等）：共享数据块，修改一方不影响另一方
+#   symlink  符号链接：需要手动选择（Windows上需要开发者模式或管理员权限）
+#   copy     完整复制（原有方式）
+DEPLOY_MODES = ("auto", "hardlink", "reflink", "symlink", "copy")
+
+# Linux的FICLONE ioctl
+_FICLONE = 0x40049409
+
+# (源设备号, 目标设备号) -> 支持的部署方式集合，每对文件系统只探测一次
+_capabilities = {}
+_capabilities_lock = threading.Lock()
+
+
+def _reflink(src, dest):
+    """写时复制克隆文件，不支持时抛出OSError"""
+    if sys.platform.startswith("linux"):
+        import fcntl
+        with open(src, 'rb') as src_f, open(dest, 'wb') as dest_f:
+            try:
+                fcntl.ioctl(dest_f.fileno(), _FICLONE, src_f.fileno())
+            except OSError:
+                dest_f.close()
+                os.remove(dest)
+                raise
+        shutil.copystat(src, dest)
+        return
+    if sys.platform == "darwin":
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dest), 0) != 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), dest)
+        return
+    raise OSError(f"当前系统不支持写时复制: {sys.platform}")
+
+
+_LINKERS = {
+    "hardlink": os.link,
+    "reflink": _reflink,
+    "symlink": os.symlink,
+}
+
+
+def probe_capabilities(src_dir, dest_dir):
+    """探测从src_dir到dest_dir可用的部署方式
+
+    硬链接和写时复制要求两个目录在同一文件系统上（比较st_dev），
+    之后在目标目录中实际试一次，结果按(源设备号, 目标设备号)缓存。
+
+    Returns:
+        set: 支持的部署方式，总是包含"copy"
+    """
+    src_dir = os.path.abspath(os.fspath(src_dir))
+    dest_dir = os.path.abspath(os.fspath(dest_dir))
+    try:
+        src_dev = os.stat(src_dir).st_dev
+        dest_dev = os.stat(dest_dir).st_dev
+    except OSError:
+        return {"copy"}
+    key = (src_dev, dest_dev)
+    with _capabilities_lock:
+        if key in _capabilities:
+            return _capabilities[key]
+
+    supported = {"copy"}
+    probe_src = os.path.join(src_dir, f".deploy-probe-{uuid.uuid4().hex}")
+    try:
+        with open(probe_src, 'wb') as f:
+            f.write(b"probe")
+    except OSError as e:
+        print(f"[警告] probe_capabilities: 无法在 {src_dir} 创建探测文件: {e}")
+        return supported
+    try:
+        for mode, linker in _LINKERS.items():
+            if mode != "symlink" and src_dev != dest_dev:
+                continue
+            probe_dest = os.path.join(dest_dir, f".deploy-probe-{uuid.uuid4().hex}")
+            try:
+                linker(probe_src, probe_dest)
+                supported.add(mode)
+            except (OSError, NotImplementedError, AttributeError):
+                pass
+            finally:
+                try:
+                    os.remove(probe_dest)
+                except OSError:
+                    pass
+    finally:
+        try:
+            os.remove(probe_src)
+        except OSError:
+            pass
+    print(f"[调试] probe_capabilities: {src_dir} -> {dest_dir} 支持的部署方式: {sorted(supported)}")
+    with _capabilities_lock:
+        _capabilities[key] = supported
+    return supported
+
+
+def resolve_deploy_mode(mode, src_dir, dest_dir):
+    """把设置中的部署方式换成两个目录之间实际可用的方式"""
+    if mode not in DEPLOY_MODES:
+        mode = "auto"
+    if mode == "copy":
+        return "copy"
+    supported = probe_capabilities(src_dir, dest_dir)
+    if mode == "auto":
+        return "reflink" if "reflink" in supported else "copy"
+    if mode not in supported:
+        print(f"[警告] resolve_deploy_mode: {src_dir} -> {dest_dir} 不支持 {mode}，改为复制")
+        return "copy"
+    return mode
+
+
+def deploy_file(src, dest, mode, copy_file=shutil.copy2):
+    """按部署方式把文件放到dest（已存在时替换）
+
+    先链接或克隆到同目录下的临时名再改名，替换过程中dest始终完整。
+    链接失败时退回复制。
+
+    硬链接时源文件除dest外还有其他硬链接（例如去重对象库中的共享文件）则改为复制，
+    避免修改~mods中的文件时改坏备份和其他MOD。
+
+    Args:
+        copy_file: 复制时使用的函数，例如CopyEngine.copy_file
+
+    Returns:
+        str: 实际使用的部署方式
+    """
+    src = os.path.abspath(os.fspath(src))
+    dest = os.fspath(dest)
+    if mode == "hardlink":
+        try:
+            same = os.path.exists(dest) and os.path.samefile(src, dest)
+            other_links = os.stat(src).st_nlink - (2 if same else 1)
+        except OSError:
+            same, other_links = False, 0
+        if other_links > 0:
+            print(f"[警告] deploy_file: {src} 还有其他硬链接（共享的备份数据），改为复制")
+            mode = "copy"
+        elif same:
+            return mode
+    linker = _LINKERS.get(mode)
+    if linker is not None:
+        tmp_path = f"{dest}.{uuid.uuid4().hex}.tmp"
+        try:
+            linker(src, tmp_path)
+            os.replace(tmp_path, dest)
+            return mode
+        except OSError as e:
+            print(f"[警告] deploy_file: {mode} 失败，改为复制 {src} -> {dest}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    # dest是src的硬链接时先断开，复制出独立的文件
+    try:
+        if os.path.exists(dest) and os.path.samefile(src, dest):
+            os.remove(dest)
+    except OSError:
+        pass
+    copy_file(src, dest)
+    return "copy"
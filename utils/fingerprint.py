@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from utils.config_storage import atomic_write_text
+
+# xxhash是可选依赖：安装后使用XXH3-128，比BLAKE2b快得多；否则使用标准库的BLAKE2b
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    xxhash = None
+    HAS_XXHASH = False
+
+
+def _new_hasher(algorithm):
+    if algorithm == "xxh3_128":
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+class FingerprintService:
+    """文件内容指纹服务，结果缓存在配置文件旁边（fingerprint_cache.json）
+
+    完整指纹按大块读取整个文件计算哈希；快速指纹只哈希文件大小和首尾各一块，
+    适合先粗略比较几GB的.ucas文件，快速指纹相同时再用完整指纹确认。
+    缓存以(路径, 大小, mtime_ns, inode)为键，文件没有变化时不会重新读取。
+    多个文件的指纹在线程池中并行计算，哈希函数在读取大块数据时会释放GIL。
+    """
+
+    VERSION = 1
+
+    # 每次读取的块大小
+    CHUNK_SIZE = 4 * 1024 * 1024
+    # 快速指纹读取的首尾块大小
+    QUICK_BLOCK_SIZE = 1024 * 1024
+
+    # 刚修改过的文件不缓存：同一个时间刻度内的后续写入不会改变mtime
+    RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+    def __init__(self, cache_file, workers=4, algorithm=None):
+        """
+        Args:
+            cache_file: 缓存文件路径，None表示只在内存中缓存
+            workers: 并行计算指纹的线程数
+            algorithm: "xxh3_128"或"blake2b"，None表示可用时使用xxhash
+        """
+        self.cache_file = cache_file
+        self.workers = max(1, workers)
+        if algorithm is None:
+            algorithm = "xxh3_128" if HAS_XXHASH else "blake2b"
+        if algorithm == "xxh3_128" and not HAS_XXHASH:
+            print("[警告] FingerprintService: 未安装xxhash，改用blake2b")
+            algorithm = "blake2b"
+        self.algorithm = algorithm
+        # 绝对路径 -> {"size", "mtime_ns", "ino", "full", "quick"}
+        self.files = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """读取缓存文件，文件不存在、损坏或哈希算法不同时从空缓存开始"""
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION or data.get("algorithm") != self.algorithm:
+                print("[调试] FingerprintService.load: 缓存版本或哈希算法不匹配，忽略旧缓存")
+                return
+            self.files = data.get("files", {})
+            print(f"[调试] FingerprintService.load: 读取指纹缓存，共 {len(self.files)} 个文件")
+        except Exception as e:
+            print(f"[警告] FingerprintService.load: 读取指纹缓存失败: {e}")
+            self.files = {}
+
+    def save(self):
+        """有变化时写回缓存文件"""
+        with self._lock:
+            if not self._dirty or not self.cache_file:
+                return
+            try:
+                data = {"version": self.VERSION, "algorithm": self.algorithm, "files": self.files}
+                atomic_write_text(self.cache_file, json.dumps(data, ensure_ascii=False))
+                self._dirty = False
+            except Exception as e:
+                print(f"[错误] FingerprintService.save: 保存指纹缓存失败: {e}")
+                traceback.print_exc()
+
+    def prune(self):
+        """删除已不存在的文件的缓存项"""
+        with self._lock:
+            stale = [path for path in self.files if not os.path.exists(path)]
+            for path in stale:
+                del self.files[path]
+            if stale:
+                self._dirty = True
+        return len(stale)
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(os.fspath(path)))
+
+    def fingerprint(self, path, quick=False):
+        """返回文件的指纹（十六进制字符串），文件无法读取时返回None
+
+        Args:
+            path: 文件路径
+            quick: True时只哈希大小和首尾块
+        """
+        field = "quick" if quick else "full"
+        key = self._key(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self.files.get(key)
+            if (entry is not None and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns
+                    and entry["ino"] == st.st_ino):
+                if entry.get(field):
+                    self.hits += 1
+                    return entry[field]
+            else:
+                entry = None
+            self.misses += 1
+
+        try:
+            digest = self._hash_quick(path, st.st_size) if quick else self._hash_full(path)
+        except OSError as e:
+            print(f"[警告] FingerprintService.fingerprint: 无法读取文件 {path}: {e}")
+            return None
+
+        with self._lock:
+            if time.time_ns() - st.st_mtime_ns < self.RACY_WINDOW_NS:
+                # 刚修改过的文件不缓存
+                return digest
+            if entry is None:
+                entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ino": st.st_ino}
+                self.files[key] = entry
+            entry[field] = digest
+            self._dirty = True
+        return digest
+
+    def fingerprint_many(self, paths, quick=False):
+        """并行计算多个文件的指纹
+
+        Returns:
+            dict: 路径 -> 指纹，无法读取的文件为None
+        """
+        paths = list(paths)
+        if self.workers == 1 or len(paths) < 2:
+            return {path: self.fingerprint(path, quick) for path in paths}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(paths))) as executor:
+            digests = executor.map(lambda path: self.fingerprint(path, quick), paths)
+            return dict(zip(paths, digests))
+
+    def same_content(self, path_a, path_b):
+        """判断两个文件内容是否相同：先比较大小，再比较快速指纹，最后比较完整指纹"""
+        try:
+            if os.path.samefile(path_a, path_b):
+                # 硬链接或符号链接指向同一个文件
+                return True
+            if os.path.getsize(path_a) != os.path.getsize(path_b):
+                return False
+        except OSError:
+            return False
+        quick_a = self.fingerprint(path_a, quick=True)
+        if quick_a is None or quick_a != self.fingerprint(path_b, quick=True):
+            return False
+        full_a = self.fingerprint(path_a)
+        return full_a is not None and full_a == self.fingerprint(path_b)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "files": len(self.files), "algorithm": self.algorithm}
+
+    def _hash_full(self, path):
+        hasher = _new_hasher(self.algorithm)
+        with open(path, 'rb', buffering=0) as f:
+            buf = bytearray(self.CHUNK_SIZE)
+            view = memoryview(buf)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                hasher.update(view[:n])
+        return hasher.hexdigest()
+
+    def _hash_quick(self, path, size):
+        hasher = _new_hasher(self.algorithm)
+        hasher.update(str(size).encode('ascii'))
+        with open(path, 'rb') as f:
+            if size <= 2 * self.QUICK_BLOCK_SIZE:
+                hasher.update(f.read())
+            else:
+                hasher.update(f.read(self.QUICK_BLOCK_SIZE))
+                f.seek(size - self.QUICK_BLOCK_SIZE)
+                hasher.update(f.read(self.QUICK_BLOCK_SIZE))
+        return hasher.hexdigest()
@@ -0,0 +1,93 @@
+import os
+import threading
+
+
+class FsCache:
+    """一次操作内共享的目录列表缓存
+
+    在一次刷新或一次批量启用/禁用期间创建，传给扫描、清理和启用/禁用等函数，操作结束后丢弃。
+    每个目录最多调用一次os.scandir，之后的存在性检查、文件列表都从缓存的DirEntry得到；
+    DirEntry自身也会缓存is_dir/stat的结果。自己修改了目录内容后需要调用invalidate。
+    hits和misses记录命中和实际列目录的次数，便于分析。
+    """
+
+    def __init__(self):
+        # 规范化目录路径 -> DirEntry列表，目录不存在或无法读取时为None
+        self._entries = {}
+        # 规范化目录路径 -> {规范化名称: DirEntry}
+        self._names = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(path):
+        # Windows上路径不区分大小写
+        return os.path.normcase(os.path.abspath(os.fspath(path)))
+
+    def scandir(self, path):
+        """返回目录中的DirEntry列表，目录不存在或无法读取时返回None"""
+        key = self._key(path)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            entries = None
+        with self._lock:
+            self._entries[key] = entries
+            self._names[key] = None if entries is None else {os.path.normcase(entry.name): entry for entry in entries}
+        return entries
+
+    def _entry(self, path):
+        """通过上级目录的列表查找路径对应的DirEntry，找不到返回None"""
+        parent, name = os.path.split(os.path.abspath(os.fspath(path)))
+        if not name:
+            return None
+        self.scandir(parent)
+        names = self._names.get(self._key(parent))
+        if not names:
+            return None
+        return names.get(os.path.normcase(name))
+
+    def exists(self, path):
+        path = os.fspath(path)
+        if not os.path.split(os.path.abspath(path))[1]:
+            # 盘符或根目录
+            return os.path.exists(path)
+        return self._entry(path) is not None
+
+    def is_dir(self, path):
+        entry = self._entry(path)
+        try:
+            return entry is not None and entry.is_dir()
+        except OSError:
+            return False
+
+    def is_file(self, path):
+        entry = self._entry(path)
+        try:
+            return entry is not None and entry.is_file()
+        except OSError:
+            return False
+
+    def listdir(self, path):
+        """返回目录中的名称列表，目录不存在时返回空列表"""
+        entries = self.scandir(path)
+        return [entry.name for entry in entries] if entries else []
+
+    def invalidate(self, path):
+        """丢弃路径本身及其上级目录的列表（创建、删除或复制文件后调用）"""
+        key = self._key(path)
+        parent_key = os.path.dirname(key)
+        with self._lock:
+            for k in (key, parent_key):
+                self._entries.pop(k, None)
+                self._names.pop(k, None)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "directories": len(self._entries)}
@@ -0,0 +1,116 @@
+class ModIndex:
+    """MOD表的二级索引
+
+    维护 分类ID -> MOD ID、启用状态 -> MOD ID、original_path/folder_name/real_name -> MOD ID 的映射，
+    由ConfigManager在每次修改MOD时增量更新，查询开销只与结果数量有关，与MOD总数无关。
+    每个MOD记录自己当前的索引键，重新索引时先移除旧键，不会留下过期条目。
+    """
+
+    FIELDS = ("category_id", "enabled", "original_path", "folder_name", "real_name")
+
+    def __init__(self, mods=None):
+        self.rebuild(mods or {})
+
+    def rebuild(self, mods):
+        """根据完整的MOD表重建索引"""
+        # 字段 -> {索引值 -> {MOD ID: None}}，内层用dict保持插入顺序
+        self._maps = {field: {} for field in self.FIELDS}
+        # MOD ID -> 当前索引键
+        self._keys = {}
+        # MOD ID -> 在MOD表中的位置，用于按MOD表顺序返回结果
+        self._positions = {}
+        self._next_position = 0
+        for mod_id, mod_info in mods.items():
+            self.update(mod_id, mod_info)
+
+    def update(self, mod_id, mod_info):
+        """添加或重新索引一个MOD"""
+        keys = self._extract_keys(mod_info)
+        old_keys = self._keys.get(mod_id)
+        if old_keys == keys:
+            return
+        if old_keys is not None:
+            self._unlink(mod_id, old_keys)
+        else:
+            self._positions[mod_id] = self._next_position
+            self._next_position += 1
+        for field, value in zip(self.FIELDS, keys):
+            if self._skip(field, value):
+                continue
+            self._maps[field].setdefault(value, {})[mod_id] = None
+        self._keys[mod_id] = keys
+
+    def remove(self, mod_id):
+        """从索引中移除一个MOD"""
+        old_keys = self._keys.pop(mod_id, None)
+        if old_keys is not None:
+            self._unlink(mod_id, old_keys)
+        self._positions.pop(mod_id, None)
+
+    def lookup(self, field, value):
+        """返回指定字段等于value的所有MOD ID（按MOD表顺序）"""
+        ids = self._maps[field].get(value)
+        if not ids:
+            return []
+        return sorted(ids, key=self._positions.get)
+
+    def lookup_any(self, field, values):
+        """返回指定字段等于values中任意一个值的所有MOD ID（按MOD表顺序）"""
+        ids = {}
+        for value in values:
+            ids.update(self._maps[field].get(value, {}))
+        return sorted(ids, key=self._positions.get)
+
+    def matches(self, mod_id, field, value):
+        """检查MOD的索引字段是否等于value"""
+        keys = self._keys.get(mod_id)
+        return keys is not None and keys[self.FIELDS.index(field)] == value
+
+    def first(self, field, value):
+        """返回指定字段等于value的第一个MOD ID，没有时返回None"""
+        ids = self.lookup(field, value)
+        return ids[0] if ids else None
+
+    def values(self, field):
+        """返回指定字段当前出现过的所有值"""
+        return list(self._maps[field].keys())
+
+    def keys_of(self, mod_id):
+        """返回MOD当前的索引键字典，未索引时返回None"""
+        keys = self._keys.get(mod_id)
+        if keys is None:
+            return None
+        return dict(zip(self.FIELDS, keys))
+
+    def __contains__(self, mod_id):
+        return mod_id in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _unlink(self, mod_id, keys):
+        for field, value in zip(self.FIELDS, keys):
+            if self._skip(field, value):
+                continue
+            ids = self._maps[field].get(value)
+            if ids is None:
+                continue
+            ids.pop(mod_id, None)
+            if not ids:
+                del self._maps[field][value]
+
+    @staticmethod
+    def _skip(field, value):
+        # 分类为空的MOD也要索引（属于默认分类），其余字段为空时不建索引
+        return field != "category_id" and (value is None or value == "")
+
+    @staticmethod
+    def _extract_keys(mod_info):
+        # 未设置分类的MOD索引为None，查询默认分类时由ConfigManager一并返回
+        return (
+            mod_info.get("category_id"),
+            bool(mod_info.get("enabled", False)),
+            mod_info.get("original_path"),
+            mod_info.get("folder_name"),
+            mod_info.get("real_name"),
+        )
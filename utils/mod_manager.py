@@ -12,6 +12,19 @@ import tempfile
 import logging
 import traceback
 import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utils.mod_scanner import scan_mod_groups, default_scan_workers
+from utils.scan_cache import ScanCache
+from utils.fs_cache import FsCache
+from utils.deploy import resolve_deploy_mode, deploy_file
+from utils.copy_engine import CopyCancelled
+from utils.copy_scheduler import CopyScheduler
+from utils.archive_walker import ArchiveGraph, ArchiveWalker, scan_extracted
+from utils.archive_planner import archive_kind, list_members, plan_extraction, extract_members, member_path
+from utils.batch_import import extract_archive_job, default_import_workers
+from utils.mod_record import ModRecord
 
 # 配置日志记录
 mod_logger = logging.getLogger('mod_manager')
@@ -424,8 +437,12 @@ def extract_rar_with_winrar(rar_file, extract_path):
         mod_logger.error(f"extract_rar_with_winrar: 解压异常: {e}")
         return False
 
-def extract_rar_with_rarfile(rar_file, extract_dir):
-    """使用rarfile库解压RAR文件"""
+def extract_rar_with_rarfile(rar_file, extract_dir, members=None):
+    """使用rarfile库解压RAR文件
+    
+    Args:
+        members: 只解压这些成员，None表示全部
+    """
     try:
         mod_logger.info(f"extract_rar_with_rarfile: 开始解压 {rar_file} 到 {extract_dir}")
         mod_logger.info(f"extract_rar_with_rarfile: UNRAR_TOOL={rarfile.UNRAR_TOOL}, USE_EXTRACT_HACK={rarfile.USE_EXTRACT_HACK}")
@@ -433,7 +450,7 @@ def extract_rar_with_rarfile(rar_file, extract_dir):
         # 尝试使用rarfile库解压
         try:
             with rarfile.RarFile(rar_file) as rf:
-                rf.extractall(extract_dir)
+                rf.extractall(extract_dir, members=members)
             mod_logger.info(f"extract_rar_with_rarfile: 成功解压 {rar_file}")
             return True
         except Exception as e:
@@ -692,6 +709,21 @@ class ModManager:
             self.mods_path = Path.cwd() / "mods"
             mod_logger.info(f"ModManager初始化: 使用备选MOD路径 {self.mods_path}")
             
+        # 扫描缓存保存在配置文件旁边，刷新时只重新列出有变化的目录
+        self.scan_cache = ScanCache(os.path.join(config_manager.config_dir, "scan_cache.json"))
+        # (MOD路径, 自动选择的扫描线程数)，按MOD路径所在设备判断一次
+        self._auto_scan_workers = None
+        # 文件内容指纹，按(路径, 大小, mtime, inode)缓存，未变化的大文件不会重新读取
+        self.fingerprints = config_manager.fingerprints
+        # 复制引擎：进度、取消和吞吐量统计，界面在长时间操作前设置进度回调
+        self.copy_engine = config_manager.copy_engine
+        # 最近一次导入的选择性解压统计
+        self.extraction_stats = {"archives": 0, "skipped_files": 0, "skipped_bytes": 0}
+        # 最近一次导入遍历的压缩包树（ArchiveGraph）
+        self.last_import_graph = None
+        # 最近一次批量导入的总体统计
+        self.last_batch_stats = None
+            
         # 使用专用的临时文件夹，避免使用系统默认的临时目录
         self.temp_base_path = Path.cwd() / "mod_temp"
         
@@ -718,8 +750,12 @@ class ModManager:
                 mod_logger.error(f"ModManager初始化: 创建备选临时目录也失败: {str(e2)}")
                 # 不再尝试
 
-    def scan_mods_directory(self):
-        """递归扫描MOD目录及子目录，支持子文件夹下同名pak/ucas/utoc"""
+    def scan_mods_directory(self, fs_cache=None):
+        """递归扫描MOD目录及子目录，支持子文件夹下同名pak/ucas/utoc
+        
+        Args:
+            fs_cache: 本次操作共享的FsCache（例如refresh时先执行的clean_invalid_mods已经列出的目录不再重复列出）
+        """
         print(f"[调试] scan_mods_directory: 开始扫描 {self.mods_path}")
         found_mods = []
         mod_names_seen = set()  # 用于跟踪已经看到的MOD名称
@@ -732,114 +768,322 @@ class ModManager:
                 
             # 获取现有MOD信息，用于保留用户自定义名称
             existing_mods = self.config.get_mods()
-            # 创建文件路径到MOD ID的映射，用于识别重命名的MOD
-            path_to_mod_id = {}
-            for mod_id, mod_info in existing_mods.items():
-                if 'original_path' in mod_info:
-                    path_to_mod_id[mod_info['original_path']] = mod_id
-            
-            # 递归查找所有pak文件
-            for file in self.mods_path.rglob('*.pak'):
-                ucas_file = file.with_suffix('.ucas')
-                utoc_file = file.with_suffix('.utoc')
-                # 必须同目录下有同名ucas/utoc才算完整MOD
-                if ucas_file.exists() and utoc_file.exists():
-                    mod_name = file.stem
-                    folder_name = file.parent.name
-                    
-                    # 创建MOD ID，优先使用mod_name，如果已存在则使用folder_name_mod_name
-                    mod_id = mod_name
-                    if mod_name in mod_names_seen:
-                        # 如果MOD名称已存在，使用文件夹名称+MOD名称作为唯一标识
-                        if folder_name != "~mods":
-                            mod_id = f"{folder_name}_{mod_name}"
-                            print(f"[调试] scan_mods_directory: MOD名称重复，使用文件夹名称作为标识: {mod_id}")
-                    
-                    mod_names_seen.add(mod_name)  # 记录已看到的MOD名称
-                    print(f"[调试] scan_mods_directory: 找到完整MOD {mod_name} in {file.parent}, MOD ID: {mod_id}")
-                    
-                    # 确定文件相对路径
-                    rel_path = file.parent.relative_to(self.mods_path) if file.parent != self.mods_path else Path("")
-                    
-                    # 收集同目录下的所有文件
-                    all_files = []
-                    if rel_path == Path(""):
-                        # MOD文件直接在mods目录中
-                        all_files = [
-                            str(file.name),
-                            str(ucas_file.name),
-                            str(utoc_file.name)
-                        ]
-                        # 添加同目录下的其他文件
-                        for other_file in file.parent.glob('*'):
-                            if other_file.is_file() and other_file.name not in [file.name, ucas_file.name, utoc_file.name]:
-                                all_files.append(str(other_file.name))
-                    else:
-                        # MOD文件在子目录中
-                        all_files = [
-                            str(rel_path / file.name),
-                            str(rel_path / ucas_file.name),
-                            str(rel_path / utoc_file.name)
-                        ]
-                        # 添加同目录下的其他文件
-                        for other_file in file.parent.glob('*'):
-                            if other_file.is_file() and other_file.name not in [file.name, ucas_file.name, utoc_file.name]:
-                                all_files.append(str(rel_path / other_file.name))
-                    
-                    # 检查是否是已知的MOD（通过文件路径匹配）
-                    existing_mod_id = path_to_mod_id.get(str(file), None)
-                    if existing_mod_id and existing_mod_id in existing_mods:
-                        # 如果是已知MOD，保留其ID和用户自定义名称
-                        existing_mod_info = existing_mods[existing_mod_id]
-                        print(f"[调试] scan_mods_directory: 匹配到已知MOD: {existing_mod_id}")
-                        
-                        mod_info = {
-                            'name': existing_mod_info.get('name', mod_id),  # 保留用户自定义名称
-                            'files': all_files,  # 更新文件列表
-                            'original_path': str(file),
-                            'import_date': existing_mod_info.get('import_date', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
-                            'enabled': existing_mod_info.get('enabled', True),
-                            'size': round(file.stat().st_size / (1024 * 1024), 2),
-                            'folder_structure': str(rel_path) != "",  # 标记是否在子文件夹中
-                            'folder_name': folder_name,  # 记录文件夹名称
-                            'display_name': existing_mod_info.get('display_name', mod_name),  # 保留显示名称
-                            'mod_name': mod_name,  # 保存原始MOD名称
-                            'real_name': existing_mod_info.get('real_name', mod_name),  # 保留原始名称
-                            'preview_image': existing_mod_info.get('preview_image', '')  # 保留预览图
-                        }
-                        
-                        # 保留其他自定义属性
-                        for key, value in existing_mod_info.items():
-                            if key not in mod_info:
-                                mod_info[key] = value
-                        
-                        # 使用原始MOD ID
-                        mod_id = existing_mod_id
-                    else:
-                        # 新发现的MOD
-                        mod_info = {
-                            'name': mod_id,  # 使用MOD ID作为唯一标识
-                            'files': all_files,  # 包含所有文件，包括txt等
-                            'original_path': str(file),
-                            'import_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'enabled': True,
-                            'size': round(file.stat().st_size / (1024 * 1024), 2),
-                            'folder_structure': str(rel_path) != "",  # 标记是否在子文件夹中
-                            'folder_name': folder_name,  # 记录文件夹名称
-                            'display_name': mod_name,  # 用于UI显示的名称
-                            'mod_name': mod_name  # 保存原始MOD名称
-                        }
-                    
+            
+            # 单次遍历MOD目录，每个目录只列出一次，按文件名分组找出pak/ucas/utoc
+            for group in scan_mod_groups(self.mods_path, cache=self.scan_cache, workers=self.get_scan_workers(), fs_cache=fs_cache):
+                mod_info = self._mod_info_from_group(group, existing_mods, mod_names_seen)
+                if mod_info:
                     found_mods.append(mod_info)
-                else:
-                    print(f"[调试] scan_mods_directory: MOD文件不完整 {file}")
             print(f"[调试] scan_mods_directory: 扫描完成，找到 {len(found_mods)} 个MOD")
             return found_mods
         except Exception as e:
             print(f"[调试] scan_mods_directory: 扫描失败 {str(e)}")
             raise ValueError(f"扫描MOD目录失败: {str(e)}")
 
+    def get_scan_workers(self):
+        """扫描线程数：配置项scan_workers大于0时使用配置值，否则根据MOD目录所在设备自动选择"""
+        configured = self.config.get('scan_workers', 0)
+        try:
+            configured = int(configured or 0)
+        except (TypeError, ValueError):
+            print(f"[警告] get_scan_workers: 无效的scan_workers配置: {configured}")
+            configured = 0
+        if configured > 0:
+            return configured
+        mods_path = str(self.mods_path)
+        if self._auto_scan_workers is None or self._auto_scan_workers[0] != mods_path:
+            self._auto_scan_workers = (mods_path, default_scan_workers(mods_path))
+        return self._auto_scan_workers[1]
+
+    def scan_changed_paths(self, changed_paths):
+        """只扫描发生变化的路径所在的目录（供文件监视增量更新使用）
+        
+        Args:
+            changed_paths: 变化的文件或目录路径（可包含MOD目录以外的路径，会被忽略）
+            
+        Returns:
+            tuple: (在这些目录中找到的MOD信息列表, 被扫描的相对目录集合)
+        """
+        found_mods = []
+        scanned_dirs = set()
+        try:
+            mods_root = os.path.abspath(self.mods_path)
+            # 相对目录 -> 是否需要递归扫描
+            targets = {}
+            for path in changed_paths:
+                path = os.path.abspath(path)
+                if path != mods_root and not path.startswith(mods_root + os.sep):
+                    continue
+                rel_path = os.path.relpath(path, mods_root)
+                rel_path = "" if rel_path == "." else rel_path
+                if rel_path and os.path.isdir(path):
+                    # 新增或移入的目录，扫描整个子树
+                    targets[rel_path] = True
+                    continue
+                # 文件变化或目录被删除：重新扫描其所在的（仍然存在的）目录
+                rel_dir = os.path.dirname(rel_path) if rel_path else ""
+                while rel_dir and not os.path.isdir(os.path.join(mods_root, rel_dir)):
+                    rel_dir = os.path.dirname(rel_dir)
+                targets.setdefault(rel_dir, False)
+            
+            # 已被某个递归扫描覆盖的目录不再单独扫描
+            recursive_dirs = [rel_dir for rel_dir, recursive in targets.items() if recursive]
+            def covered(rel_dir):
+                return any(rel_dir != other and (other == "" or rel_dir.startswith(other + os.sep)) for other in recursive_dirs)
+            
+            existing_mods = self.config.get_mods()
+            # 已有MOD的名称视为已出现过，重名的新MOD使用文件夹名称作为标识
+            mod_names_seen = set(mod_info.get('mod_name') for mod_info in existing_mods.values() if mod_info.get('mod_name'))
+            for rel_dir, recursive in sorted(targets.items()):
+                if covered(rel_dir):
+                    continue
+                scanned_dirs.add(rel_dir)
+                for group in scan_mod_groups(self.mods_path, rel_dir=rel_dir, recursive=recursive):
+                    scanned_dirs.add(group['rel_dir'])
+                    mod_info = self._mod_info_from_group(group, existing_mods, mod_names_seen)
+                    if mod_info:
+                        found_mods.append(mod_info)
+            print(f"[调试] scan_changed_paths: 扫描了 {len(scanned_dirs)} 个目录，找到 {len(found_mods)} 个MOD")
+        except Exception as e:
+            print(f"[错误] scan_changed_paths: 增量扫描失败: {e}")
+            traceback.print_exc()
+        return found_mods, scanned_dirs
+
+    def _mod_info_from_group(self, group, existing_mods, mod_names_seen):
+        """根据扫描到的文件组生成MOD信息，文件不完整时返回None"""
+        file = Path(group['pak_path'])
+        # 必须同目录下有同名ucas/utoc才算完整MOD
+        if group['complete']:
+            mod_name = group['stem']
+            folder_name = group['folder_name']
+
+            # 创建MOD ID，优先使用mod_name，如果已存在则使用folder_name_mod_name
+            mod_id = mod_name
+            if mod_name in mod_names_seen:
+                # 如果MOD名称已存在，使用文件夹名称+MOD名称作为唯一标识
+                if folder_name != "~mods":
+                    mod_id = f"{folder_name}_{mod_name}"
+                    print(f"[调试] scan_mods_directory: MOD名称重复，使用文件夹名称作为标识: {mod_id}")
+
+            mod_names_seen.add(mod_name)  # 记录已看到的MOD名称
+            print(f"[调试] scan_mods_directory: 找到完整MOD {mod_name} in {file.parent}, MOD ID: {mod_id}")
+
+            # 确定文件相对路径
+            rel_path = Path(group['rel_dir'])
+
+            # 本组的三个文件在前，同目录下的其他文件（扫描时已列出，无需再次遍历目录）在后
+            all_files = list(group['rel_files'])
+            size_mb = round(group['pak_size'] / (1024 * 1024), 2)
+
+            # 检查是否是已知的MOD（通过original_path索引匹配，识别重命名的MOD）
+            existing_mod_id = self.config.find_mod_by_original_path(str(file))
+            if existing_mod_id and existing_mod_id in existing_mods:
+                # 如果是已知MOD，保留其ID和用户自定义名称
+                existing_mod_info = existing_mods[existing_mod_id]
+                print(f"[调试] scan_mods_directory: 匹配到已知MOD: {existing_mod_id}")
+
+                mod_info = {
+                    'name': existing_mod_info.get('name', mod_id),  # 保留用户自定义名称
+                    'files': all_files,  # 更新文件列表
+                    'original_path': str(file),
+                    'import_date': existing_mod_info.get('import_date', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+                    'enabled': existing_mod_info.get('enabled', True),
+                    'size': size_mb,
+                    'folder_structure': str(rel_path) != "",  # 标记是否在子文件夹中
+                    'folder_name': folder_name,  # 记录文件夹名称
+                    'display_name': existing_mod_info.get('display_name', mod_name),  # 保留显示名称
+                    'mod_name': mod_name,  # 保存原始MOD名称
+                    'real_name': existing_mod_info.get('real_name', mod_name),  # 保留原始名称
+                    'preview_image': existing_mod_info.get('preview_image', '')  # 保留预览图
+                }
+
+                # 保留其他自定义属性
+                for key, value in existing_mod_info.items():
+                    if key not in mod_info:
+                        mod_info[key] = value
+
+                # 使用原始MOD ID
+                mod_id = existing_mod_id
+            else:
+                # 新发现的MOD
+                mod_info = {
+                    'name': mod_id,  # 使用MOD ID作为唯一标识
+                    'files': all_files,  # 包含所有文件，包括txt等
+                    'original_path': str(file),
+                    'import_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'enabled': True,
+                    'size': size_mb,
+                    'folder_structure': str(rel_path) != "",  # 标记是否在子文件夹中
+                    'folder_name': folder_name,  # 记录文件夹名称
+                    'display_name': mod_name,  # 用于UI显示的名称
+                    'mod_name': mod_name  # 保存原始MOD名称
+                }
+
+            return mod_info
+        else:
+            print(f"[调试] scan_mods_directory: MOD文件不完整 {file}")
+            return None
+
+    def _extract_groups_to_mods(self, archive_path, plan, mods_path, skip_names=None, kind=None):
+        """把压缩包中的完整MOD组直接解压到MOD目录旁的暂存目录，再整体改名移入MOD目录
+        
+        每个字节只写一次（不再先解压到mod_temp再复制），暂存目录与MOD目录在同一卷上，移入只是改名，
+        MOD目录中也不会出现解压了一半的MOD。
+        
+        Args:
+            archive_path: 压缩包路径或内存中的嵌套压缩包
+            skip_names: 已经导入过的MOD名称，不再重复导入
+            kind: 压缩包格式，None时由archive_kind()判断
+        
+        Returns:
+            list: 与scan_extracted格式相同的MOD组，files为MOD目录中的最终路径，placed为True
+        """
+        groups = []
+        names = set(skip_names or ())
+        for name, members in plan["mod_groups"]:
+            if name not in names:
+                names.add(name)
+                groups.append((name, members))
+        if not groups:
+            return []
+        staging_root = self.config.get_import_staging_path() or (mods_path.parent / "~mods_importing")
+        stage_dir = Path(staging_root) / uuid.uuid4().hex
+        extract_dir = stage_dir / "extract"
+        try:
+            members = [member for _, group_members in groups for member in group_members]
+            source_name = "内存中的嵌套压缩包" if hasattr(archive_path, 'read') else archive_path
+            mod_logger.info(f"_extract_groups_to_mods: 解压 {len(members)} 个文件 {source_name} -> {extract_dir}")
+            kind = kind or archive_kind(archive_path)
+            if kind == "rar":
+                if not extract_rar_with_rarfile(archive_path, extract_dir, members):
+                    raise RuntimeError(f"rarfile无法解压: {archive_path}")
+            else:
+                extract_members(archive_path, members, extract_dir, self.copy_engine.copy_stream, kind)
+            
+            placed = []
+            for name, group_members in groups:
+                mod_stage = stage_dir / "mods" / name
+                mod_stage.mkdir(parents=True, exist_ok=True)
+                for member in group_members:
+                    extracted = Path(member_path(extract_dir, member))
+                    os.replace(extracted, mod_stage / extracted.name)
+                target = mods_path / name
+                file_names = [Path(member_path(extract_dir, member)).name for member in group_members]
+                self._commit_staged_dir(mod_stage, target)
+                mod_logger.info(f"_extract_groups_to_mods: MOD {name} 已移入 {target}")
+                placed.append({'name': name, 'files': [target / file_name for file_name in file_names],
+                               'dir': target, 'placed': True})
+            return placed
+        finally:
+            shutil.rmtree(stage_dir, ignore_errors=True)
+            try:
+                os.rmdir(staging_root)
+            except OSError:
+                pass
+
+    def _commit_staged_dir(self, staged_dir, target):
+        """把暂存目录换入MOD目录，MOD目录中不会出现新旧版本混合的文件
+        
+        目标已存在（重新导入）且其中只有上次导入记录的文件时，先把旧目录改名到旁边，再把暂存目录改名为目标，
+        最后删除旧目录；任何一步失败都删除新目录并把旧目录改回原处。
+        目标中还有未记录的文件（用户自己放入的文件、同一整合包文件夹中其他MOD的文件）时不整体替换：
+        逐个文件改名换入，再只删除上次导入记录、这次不再包含的文件，其他文件保持不动。
+        暂存目录与MOD目录不在同一卷上时，先复制到MOD目录旁边的临时目录，再同样改名换入。
+        """
+        suffix = uuid.uuid4().hex
+        incoming = staged_dir
+        old_dir = None
+        try:
+            if os.stat(staged_dir).st_dev != os.stat(target.parent).st_dev:
+                incoming = target.with_name(f"{target.name}.new-{suffix}")
+                mod_logger.info(f"_commit_staged_dir: 暂存目录与MOD目录不在同一卷上，先复制到 {incoming}")
+                self.copy_engine.copytree(staged_dir, incoming)
+            if target.exists():
+                tracked = self._tracked_files(target)
+                untracked = [path for path in self._relative_files(target) if path not in tracked]
+                if untracked:
+                    mod_logger.info(f"_commit_staged_dir: {target} 中有 {len(untracked)} 个未记录的文件，"
+                                    f"只替换上次导入的文件: {untracked[:5]}")
+                    self._merge_staged_dir(incoming, target, tracked)
+                    return
+                old_dir = target.with_name(f"{target.name}.old-{suffix}")
+                os.rename(target, old_dir)
+            os.rename(incoming, target)
+        except BaseException as e:
+            mod_logger.error(f"_commit_staged_dir: 换入 {target} 失败，恢复原目录: {e}")
+            if old_dir is not None and old_dir.exists():
+                try:
+                    os.rename(old_dir, target)
+                except OSError as restore_e:
+                    mod_logger.error(f"_commit_staged_dir: 恢复原目录失败，旧版本保留在 {old_dir}: {restore_e}")
+            raise
+        finally:
+            if incoming is not staged_dir:
+                shutil.rmtree(incoming, ignore_errors=True)
+        if old_dir is not None:
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    def _tracked_files(self, target):
+        """MOD目录中的文件夹target里，上次以同名导入的MOD记录的文件（相对target的路径）"""
+        mod_info = self.config.get_mods().get(target.name) or {}
+        prefix = f"{target.name}/"
+        return {ModRecord.normalize_path(path)[len(prefix):] for path in mod_info.get('files', [])
+                if ModRecord.normalize_path(path).startswith(prefix)}
+
+    @staticmethod
+    def _relative_files(directory):
+        """目录中所有文件相对该目录的路径（/分隔）"""
+        return [Path(dir_path, file_name).relative_to(directory).as_posix()
+                for dir_path, _, file_names in os.walk(directory) for file_name in file_names]
+
+    def _merge_staged_dir(self, incoming, target, tracked):
+        """逐个文件把incoming改名换入target，再删除tracked中这次没有的旧文件，不动其他文件"""
+        new_files = self._relative_files(incoming)
+        for path in new_files:
+            dest = target / path
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(incoming / path, dest)
+        for path in tracked.difference(new_files):
+            try:
+                (target / path).unlink()
+                mod_logger.info(f"_commit_staged_dir: 删除上次导入、这次不再包含的文件 {target / path}")
+            except FileNotFoundError:
+                pass
+
     def import_mod(self, file_path):
+        """导入MOD，复制文件的进度和取消通过self.copy_engine"""
+        self.extraction_stats = {"archives": 0, "skipped_files": 0, "skipped_bytes": 0}
+        with self.copy_engine.operation(f"导入 {os.path.basename(str(file_path))}"):
+            result = self._import_mod(file_path)
+        if self.extraction_stats["archives"]:
+            mod_logger.info(f"import_mod: 选择性解压了 {self.extraction_stats['archives']} 个压缩包，"
+                            f"跳过 {self.extraction_stats['skipped_files']} 个文件，"
+                            f"{self.extraction_stats['skipped_bytes'] / (1024 * 1024):.1f} MB")
+        return result
+
+    def _plan_archive(self, path, kind=None, name=None):
+        """读取压缩包成员列表，得到只包含完整MOD组、嵌套压缩包（和可选的预览图）的解压计划
+        
+        Args:
+            path: 压缩包路径或内存中的嵌套压缩包
+            kind: 压缩包格式，None时由archive_kind()判断
+            name: 内存中的嵌套压缩包的成员名，用于日志
+        
+        Returns:
+            dict: plan_extraction()的结果；无法读取成员列表时返回None，调用方解压全部内容
+        """
+        members = list_members(path, kind)
+        if members is None:
+            return None
+        plan = plan_extraction(members, include_previews=self.config.get("import_previews", False))
+        self.extraction_stats["archives"] += 1
+        self.extraction_stats["skipped_files"] += plan["skipped_files"]
+        self.extraction_stats["skipped_bytes"] += plan["skipped_bytes"]
+        mod_logger.info(f"解压计划: {name or path}: {len(plan['groups'])} 组MOD，{len(plan['archives'])} 个嵌套压缩包，"
+                        f"跳过 {plan['skipped_files']} 个文件（{plan['skipped_bytes'] / (1024 * 1024):.1f} MB）")
+        return plan
+
+    def _import_mod(self, file_path):
         """导入MOD文件，支持递归解压，宽松识别pak/ucas/utoc，支持嵌套压缩包自动处理"""
         import zipfile, py7zr
         import shutil
@@ -847,29 +1091,35 @@ class ModManager:
         # 记录所有创建的临时目录
         temp_dirs = []
         
-        def recursive_extract(path, to_dir, visited=None, depth=0):
-            if visited is None:
-                visited = set()
-            if str(path) in visited:
-                mod_logger.info(f"跳过已处理压缩包: {path}")
-                return
-            visited.add(str(path))
-            if depth > 10:
-                raise RuntimeError(f"递归解压深度过大，可能存在嵌套死循环: {path}")
+        def extract_archive(path, to_dir, plan=None):
+            """把一个压缩包解压到to_dir（不处理其中的嵌套压缩包，由walk_archives处理）
+            
+            Args:
+                plan: 解压计划，只解压其中的成员；None表示解压全部内容
+            
+            Returns:
+                bool: 是否解压成功
+            """
             try:
                 # 使用更安全的解压方法
                 if zipfile.is_zipfile(path):
                     mod_logger.info(f"解压zip: {path} -> {to_dir}")
-                    with zipfile.ZipFile(path, 'r') as z:
-                        z.extractall(to_dir)
+                    if plan is None:
+                        with zipfile.ZipFile(path, 'r') as z:
+                            z.extractall(to_dir)
+                    else:
+                        extract_members(path, plan["members"], to_dir)
+                    return True
                 elif str(path).lower().endswith('.rar'):
                     mod_logger.info(f"处理rar文件: {path} -> {to_dir}")
-                    extracted = False
+                    extracted = plan is not None and not plan["members"]
                     
                     # 1. 首先尝试使用rarfile库解压（使用内置UnRAR.dll）
                     try:
                         mod_logger.info(f"尝试使用rarfile库解压")
-                        if extract_rar_with_rarfile(path, to_dir):
+                        if extracted:
+                            mod_logger.info(f"压缩包中没有需要解压的文件")
+                        elif extract_rar_with_rarfile(path, to_dir, plan["members"] if plan else None):
                             mod_logger.info(f"rarfile库解压成功")
                             extracted = True
                         else:
@@ -913,9 +1163,9 @@ class ModManager:
                                     if item.is_dir():
                                         if dest_path.exists():
                                             shutil.rmtree(dest_path)
-                                        shutil.copytree(item, dest_path)
+                                        self.copy_engine.copytree(item, dest_path)
                                     else:
-                                        shutil.copy2(item, dest_path)
+                                        self.copy_engine.copy_file(item, dest_path)
                                 mod_logger.info(f"文件已复制到目标目录")
                                 extracted = True
                             else:
@@ -937,31 +1187,33 @@ class ModManager:
                     # 如果所有解压方法都失败，则复制原始文件
                     if not extracted:
                         dest_file = Path(to_dir) / Path(path).name
-                        shutil.copy2(path, dest_file)
+                        self.copy_engine.copy_file(path, dest_file)
                         mod_logger.info(f"RAR文件已复制到目标文件夹: {dest_file}")
                         # 弹出错误提示
                         error_msg = f"无法解压RAR文件: {Path(path).name}\n这可能是由于以下原因之一：\n- 系统未安装WinRAR\n- 文件已损坏\n- 加密的RAR文件\n\n已将原始文件复制到目标文件夹。"
                         log_and_show_error(error_msg, "RAR解压失败", detailed=str(path))
+                    return extracted
                     
                 elif str(path).lower().endswith('.7z'):
                     mod_logger.info(f"解压7z: {path} -> {to_dir}")
                     try:
-                        with py7zr.SevenZipFile(path, 'r') as sz:
-                            sz.extractall(to_dir)
+                        if plan is None:
+                            with py7zr.SevenZipFile(path, 'r') as sz:
+                                sz.extractall(to_dir)
+                        elif plan["members"]:
+                            extract_members(path, plan["members"], to_dir)
+                        return True
                     except Exception as e:
                         mod_logger.warning(f"使用py7zr解压失败: {e}")
                         traceback.print_exc()
                         # 复制文件作为备选
                         dest_file = Path(to_dir) / Path(path).name
-                        shutil.copy2(path, dest_file)
+                        self.copy_engine.copy_file(path, dest_file)
                         mod_logger.info(f"7z文件已复制到目标文件夹: {dest_file}")
-                
-                # 解压后递归查找新压缩包，但跳过RAR文件
-                for f in Path(to_dir).glob('**/*'):
-                    if f.is_file() and (zipfile.is_zipfile(f) or str(f).lower().endswith('.7z') or str(f).lower().endswith('.rar')):
-                        recursive_extract(f, to_dir, visited, depth+1)
+                        return False
+                return False
             except Exception as e:
-                mod_logger.error(f"recursive_extract异常: {path} -> {to_dir}, 错误: {e}")
+                mod_logger.error(f"extract_archive异常: {path} -> {to_dir}, 错误: {e}")
                 traceback.print_exc()
                 # 记录详细错误到日志
                 error_details = traceback.format_exc()
@@ -972,146 +1224,99 @@ class ModManager:
                 # 复制文件作为备选
                 try:
                     dest_file = Path(to_dir) / Path(path).name
-                    shutil.copy2(path, dest_file)
+                    self.copy_engine.copy_file(path, dest_file)
                     mod_logger.info(f"文件已复制到目标文件夹: {dest_file}")
                 except Exception as copy_e:
                     mod_logger.warning(f"复制文件也失败了: {copy_e}")
+                return False
         
-        def find_mod_files(directory):
-            """查找目录中的MOD文件组（pak/ucas/utoc）"""
-            mod_groups = []
+        def walk_archives(original_zip, mods_path, work_dir, direct):
+            """用ArchiveWalker遍历压缩包树，每个压缩包（包括嵌套压缩包）只访问一次
             
-            # 收集所有pak文件
-            pak_files = list(directory.glob('**/*.pak'))
+            direct为True且能读取成员列表时，完整的MOD组直接解压到MOD目录，嵌套压缩包交给ArchiveWalker
+            （小的在内存中处理）；其他压缩包解压到工作目录下该节点自己的目录，只扫描这个目录一次，
+            找到的嵌套压缩包作为子节点，不再重新扫描整个工作目录。
             
-            for pak_file in pak_files:
-                base_name = pak_file.stem
-                dir_path = pak_file.parent
-                
-                # 查找对应的ucas和utoc文件
-                ucas_file = dir_path / f"{base_name}.ucas"
-                utoc_file = dir_path / f"{base_name}.utoc"
-                
-                if ucas_file.exists() and utoc_file.exists():
-                    # 找到一组完整的MOD文件
-                    mod_groups.append({
-                        'name': base_name,
-                        'files': [pak_file, ucas_file, utoc_file],
-                        'dir': dir_path
-                    })
-            
-            return mod_groups
-        
-        def check_nested_archives(directory):
-            """检查目录中是否有嵌套的压缩包，如果有则返回这些压缩包的路径"""
-            nested_archives = []
-            
-            # 收集所有压缩包
-            for archive in directory.glob('**/*'):
-                if archive.is_file() and (zipfile.is_zipfile(archive) or 
-                                          archive.suffix.lower() in ['.rar', '.7z']):
-                    nested_archives.append(archive)
-            
-            return nested_archives
-        
-        def extract_nested_archive(archive_path, output_dir, original_archive_path=None, processed_mod_names=None):
-            """处理嵌套压缩包，提取MOD文件并返回MOD信息列表"""
-            if processed_mod_names is None:
-                processed_mod_names = set()
+            Returns:
+                list: 找到的MOD组，placed为True的已经移入MOD目录，其余在工作目录中需要复制；
+                    每组带有node（ArchiveGraph节点ID）和nested_in（嵌套压缩包的位置，最外层为None）
+            """
+            def extract(source, members, to_dir, kind):
+                if kind == "rar":
+                    if not extract_rar_with_rarfile(source, to_dir, members):
+                        raise RuntimeError(f"无法解压嵌套压缩包: {members}")
+                else:
+                    extract_members(source, members, to_dir, self.copy_engine.copy_stream, kind)
             
-            # 创建以压缩包名称命名的临时目录
-            temp_extract_dir = create_temp_directory(self.temp_base_path)
-            temp_dirs.append(temp_extract_dir)
-            temp_extract_dir = Path(temp_extract_dir)
-            mod_logger.info(f"extract_nested_archive: 创建临时目录: {temp_extract_dir}")
+            walker = ArchiveWalker(work_dir,
+                                   int(self.config.get("nested_memory_limit_mb", 64)) * 1024 * 1024,
+                                   int(self.config.get("nested_memory_budget_mb", 256)) * 1024 * 1024,
+                                   extract)
+            graph = walker.graph
+            self.last_import_graph = graph
+            processed_mod_names = set()
+            found = []
             
-            try:
-                # 解压嵌套压缩包到临时目录
-                recursive_extract(archive_path, temp_extract_dir)
-                
-                # 查找解压后的MOD文件
-                mod_groups = find_mod_files(temp_extract_dir)
-                
-                if mod_groups:
-                    mod_logger.info(f"extract_nested_archive: 在压缩包 {archive_path.name} 中找到 {len(mod_groups)} 组MOD文件")
-                    
-                    # 过滤掉已处理过的MOD名称
-                    filtered_mod_groups = [group for group in mod_groups if group['name'] not in processed_mod_names]
-                    
-                    if filtered_mod_groups:
-                        # 使用MOD文件名作为MOD文件夹名称，而不是压缩包名称
-                        processed_mods = []
-                        for mod_group in filtered_mod_groups:
-                            mod_name = mod_group['name']
-                            processed_mod_names.add(mod_name)
-
-                            # 只有当有实际文件时才创建目录
-                            if mod_group['files']:
-                                mod_folder = output_dir / mod_name
-                                if not mod_folder.exists():
-                                    mod_folder.mkdir(parents=True, exist_ok=True)
-                                
-                                # 复制MOD文件到目标文件夹
-                                for file in mod_group['files']:
-                                    dest_file = mod_folder / file.name
-                                    shutil.copy2(file, dest_file)
-                                
-                                # 创建MOD信息
-                                mod_info = {
-                                    'name': mod_name,
-                                    'files': [f"{mod_name}/{file.name}" for file in mod_group['files']],
-                                    'original_path': str(archive_path),
-                                    'import_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                    'enabled': True,
-                                    'size': round(archive_path.stat().st_size / (1024 * 1024), 2),
-                                    'folder_structure': True
-                                }
-                                
-                                # 如果有父压缩包，记录关系
-                                if original_archive_path:
-                                    mod_info['parent_archive'] = str(original_archive_path)
-                                    mod_info['is_nested'] = True
-                                
-                                processed_mods.append(mod_info)
-                            else:
-                                mod_logger.info(f"extract_nested_archive: MOD组 {mod_name} 没有文件，跳过")
-                        
-                        return processed_mods
-                    else:
-                        mod_logger.info(f"extract_nested_archive: 所有MOD已在主压缩包中处理，跳过")
-                        return None
-                
-                # 如果没有找到MOD文件，检查是否有更深层次的嵌套压缩包
-                nested_archives = check_nested_archives(temp_extract_dir)
-                if nested_archives:
-                    mod_logger.info(f"extract_nested_archive: 在压缩包 {archive_path.name} 中找到 {len(nested_archives)} 个嵌套压缩包")
-                    
-                    # 处理每个嵌套压缩包
-                    nested_mods = []
-                    for nested_archive in nested_archives:
-                        # 对每个嵌套压缩包递归处理
-                        nested_result = extract_nested_archive(
-                            nested_archive, 
-                            output_dir, 
-                            original_archive_path or archive_path,
-                            processed_mod_names
-                        )
-                        if nested_result:
-                            if isinstance(nested_result, list):
-                                nested_mods.extend(nested_result)
-                            else:
-                                nested_mods.append(nested_result)
-                    
-                    return nested_mods if nested_mods else None
-                
-                # 如果没有找到MOD文件也没有嵌套压缩包，返回None
-                return None
+            def add_groups(node_id, groups, placed):
+                node = graph.get(node_id)
+                for group in groups:
+                    if not placed:
+                        if group['name'] in processed_mod_names:
+                            continue
+                        processed_mod_names.add(group['name'])
+                    group.update(placed=placed, node=node_id, nested_in=walker.nested_in(node_id), archive_size=node['size'])
+                    node['mod_groups'].append(group['name'])
+                    found.append(group)
+            
+            def visit(node_id, source):
+                """处理一个节点，返回子节点列表[(来源, 格式, 成员名, 大小)]"""
+                node = graph.get(node_id)
+                kind = node['kind']
+                node_dir = walker.node_dir(node_id)
+                plan = self._plan_archive(source, kind, node['path']) if kind else None
+                if plan is not None:
+                    graph.update(node_id, members=len(plan['members']) + plan['skipped_files'])
+                if direct and plan is not None:
+                    try:
+                        placed = self._extract_groups_to_mods(source, plan, mods_path, processed_mod_names, kind)
+                        for group in placed:
+                            processed_mod_names.add(group['name'])
+                        add_groups(node_id, placed, True)
+                        children = walker.nested_children(node_id, source, plan)
+                        graph.update(node_id, extraction="直接解压到MOD目录")
+                        return children
+                    except CopyCancelled:
+                        raise
+                    except Exception as e:
+                        mod_logger.warning(f"walk_archives: 直接解压 {node['path']} 失败，改为解压到临时目录: {e}")
+                        traceback.print_exc()
                 
-            finally:
-                # 清理临时目录
-                if temp_extract_dir.exists():
-                    shutil.rmtree(temp_extract_dir)
-                    mod_logger.info(f"extract_nested_archive: 清理临时目录: {temp_extract_dir}")
+                # 解压到该节点自己的目录；内存中的嵌套压缩包先写到磁盘
+                if hasattr(source, 'read'):
+                    source.seek(0)
+                    source = Path(self.copy_engine.copy_stream(source, work_dir / f"node{node_id}_{Path(node['name']).name}", node['size']))
+                if not extract_archive(source, node_dir, plan):
+                    raise RuntimeError(f"解压失败: {node['path']}")
+                graph.update(node_id, extraction="解压到临时目录")
+                groups, archives = scan_extracted(node_dir)
+                add_groups(node_id, groups, False)
+                if plan is None:
+                    graph.update(node_id, members=len(groups) * 3 + len(archives))
+                return [(path, archive_kind(path), os.path.relpath(path, node_dir).replace(os.sep, '/'), os.path.getsize(path))
+                        for path in archives]
+            
+            def on_error(node_id, error):
+                if isinstance(error, CopyCancelled):
+                    raise error
+                mod_logger.error(f"walk_archives: 处理压缩包 {graph.get(node_id)['path']} 失败: {error}")
+                traceback.print_exc()
+                return True
+            
+            walker.walk(original_zip, visit, on_error)
+            mod_logger.info(f"walk_archives: 共 {len(graph.nodes)} 个压缩包，最大深度 {graph.max_depth}，{graph.mod_count()} 组MOD")
+            for line in graph.describe():
+                mod_logger.info(f"  {line}")
+            return found
         
         try:
             mod_logger.info(f"import_mod: 开始导入MOD文件 {file_path}")
@@ -1125,14 +1330,12 @@ class ModManager:
             mod_logger.info(f"import_mod: 创建临时工作目录: {temp_work_dir}")
             
             try:
-                # 先将原始文件解压到临时工作目录
-                recursive_extract(original_zip, temp_work_dir)
-                
-                # 检查临时目录中是否有直接的MOD文件
-                direct_mod_groups = find_mod_files(temp_work_dir)
-                
-                # 检查是否有嵌套的压缩包
-                nested_archives = check_nested_archives(temp_work_dir)
+                # 每个压缩包只访问一次：完整的MOD组直接解压到MOD目录旁的暂存目录再改名移入，
+                # 小的嵌套压缩包在内存中处理，其余解压到临时工作目录
+                direct = self.config.get("direct_import", True) and original_zip.suffix.lower() in ('.zip', '.7z', '.rar')
+                found_groups = walk_archives(original_zip, mods_path, temp_work_dir, direct)
+                direct_mod_groups = [group for group in found_groups if not group['nested_in']]
+                nested_mod_groups = [group for group in found_groups if group['nested_in']]
                 
                 # 存储所有导入的MOD信息
                 imported_mods = []
@@ -1155,21 +1358,14 @@ class ModManager:
                             if not mod_folder.exists():
                                 mod_folder.mkdir(parents=True, exist_ok=True)
                             
-                            # 复制MOD文件到目标文件夹
-                            for file in mod_group['files']:
-                                dest_file = mod_folder / file.name
-                                shutil.copy2(file, dest_file)
+                            # 复制MOD文件到目标文件夹（已直接解压到MOD目录的不需要复制）
+                            if not mod_group.get('placed'):
+                                for file in mod_group['files']:
+                                    dest_file = mod_folder / file.name
+                                    self.copy_engine.copy_file(file, dest_file)
                             
                             # 创建MOD信息
-                            mod_info = {
-                                'name': mod_name,
-                                'files': [f"{mod_name}/{file.name}" for file in mod_group['files']],
-                                'original_path': str(original_zip),
-                                'import_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                                'enabled': True,
-                                'size': round(original_zip.stat().st_size / (1024 * 1024), 2),
-                                'folder_structure': True
-                            }
+                            mod_info = self._imported_mod_info(original_zip, mod_group)
                             
                             # 备份MOD文件
                             self.config.backup_mod(mod_info['name'], mod_info)
@@ -1179,25 +1375,20 @@ class ModManager:
                         else:
                             mod_logger.info(f"import_mod: MOD组 {mod_name} 没有文件，跳过")
                 
-                # 处理嵌套的压缩包
-                if nested_archives:
-                    mod_logger.info(f"import_mod: 发现 {len(nested_archives)} 个嵌套压缩包")
-                    
-                    for archive in nested_archives:
-                        # 处理每个嵌套压缩包，传递已处理的MOD名称
-                        nested_result = extract_nested_archive(archive, mods_path, original_zip, processed_mod_names)
-                        
-                        if nested_result:
-                            if isinstance(nested_result, list):
-                                # 如果返回了多个MOD信息
-                                for mod_info in nested_result:
-                                    # 备份MOD文件
-                                    self.config.backup_mod(mod_info['name'], mod_info)
-                                    imported_mods.append(mod_info)
-                            else:
-                                # 如果只返回了一个MOD信息
-                                self.config.backup_mod(nested_result['name'], nested_result)
-                                imported_mods.append(nested_result)
+                # 嵌套压缩包中的MOD
+                if nested_mod_groups:
+                    mod_logger.info(f"import_mod: 在嵌套压缩包中找到 {len(nested_mod_groups)} 组MOD文件")
+                for mod_group in nested_mod_groups:
+                    mod_name = mod_group['name']
+                    processed_mod_names.add(mod_name)
+                    if not mod_group.get('placed'):
+                        mod_folder = mods_path / mod_name
+                        mod_folder.mkdir(parents=True, exist_ok=True)
+                        for file in mod_group['files']:
+                            self.copy_engine.copy_file(file, mod_folder / file.name)
+                    mod_info = self._imported_mod_info(original_zip, mod_group)
+                    self.config.backup_mod(mod_info['name'], mod_info)
+                    imported_mods.append(mod_info)
                 
                 # 如果没有找到任何MOD文件，创建一个虚拟MOD
                 if not imported_mods:
@@ -1213,7 +1404,7 @@ class ModManager:
                         
                         # 复制原始压缩包到目标文件夹
                         dest_file = mod_folder / original_zip.name
-                        shutil.copy2(original_zip, dest_file)
+                        self.copy_engine.copy_file(original_zip, dest_file)
                         
                         # 创建虚拟MOD信息
                         mod_info = {
@@ -1251,155 +1442,428 @@ class ModManager:
             mod_logger.error(f"import_mod: 导入失败 {str(e)}")
             raise
 
-    def enable_mod(self, mod_id):
-        """启用MOD"""
-        try:
-            mod_logger.info(f"enable_mod: 开始启用MOD {mod_id}")
-            
-            # 获取MOD信息
-            mods = self.config.get_mods()
-            mod_info = mods.get(mod_id)
-            if not mod_info:
-                mod_logger.error(f"enable_mod: 找不到MOD信息: {mod_id}")
+    def _imported_mod_info(self, original_zip, mod_group):
+        """导入的MOD组对应的MOD信息，嵌套压缩包中的MOD记录所在的嵌套压缩包和外层压缩包"""
+        mod_name = mod_group['name']
+        mod_info = {
+            'name': mod_name,
+            'files': [f"{mod_name}/{Path(file).name}" for file in mod_group['files']],
+            'original_path': str(original_zip),
+            'import_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'enabled': True,
+            'size': round(original_zip.stat().st_size / (1024 * 1024), 2),
+            'folder_structure': True
+        }
+        if mod_group.get('nested_in'):
+            mod_info.update({
+                'original_path': f"{original_zip}/{mod_group['nested_in']}",
+                'size': round(mod_group.get('archive_size', 0) / (1024 * 1024), 2),
+                'parent_archive': str(original_zip),
+                'is_nested': True
+            })
+        return mod_info
+
+    def import_mods(self, file_paths, progress_callback=None, workers=None):
+        """批量导入多个压缩包
+        
+        各压缩包在进程池中并行解压（extract_archive_job，解压到MOD目录旁的暂存目录，与MOD目录在同一卷上），
+        移入MOD目录和备份在调用线程中按完成顺序逐个进行。工作进程无法处理的压缩包（rar、无法读取成员列表、
+        没有完整MOD组等）改用import_mod()。取消调用线程当前的复制操作（CopyOperation.cancel()）后，
+        排队的压缩包不再开始，已导入的MOD保留。
+        
+        Args:
+            file_paths: 压缩包路径列表
+            progress_callback: 每个任务状态变化时调用 (压缩包路径, 状态, 说明, 总体统计)，
+                状态见JOB_STATES，总体统计为{"jobs", "done", "failed", "bytes", "seconds", "mb_per_s"}
+            workers: 解压进程数，None时使用设置项import_workers或按CPU核数选择
+        
+        Returns:
+            dict: 压缩包路径 -> 导入的MOD信息列表，失败或取消时为异常对象
+        """
+        file_paths = [str(path) for path in file_paths]
+        results = {}
+        if not file_paths:
+            return results
+        workers = workers or self.config.get_import_workers() or default_import_workers(len(file_paths))
+        workers = max(1, min(workers, len(file_paths)))
+        mods_path = Path(self.config.get_mods_path())
+        staging_root = Path(self.config.get_import_staging_path() or (mods_path.parent / "~mods_importing"))
+        batch_dir = staging_root / f"batch_{uuid.uuid4().hex}"
+        memory_limit = int(self.config.get("nested_memory_limit_mb", 64)) * 1024 * 1024
+        # 内存预算由所有解压进程平分，批量导入时总占用与导入单个压缩包相同
+        memory_budget = int(self.config.get("nested_memory_budget_mb", 256)) * 1024 * 1024 // workers
+        include_previews = self.config.get("import_previews", False)
+        stats = {"jobs": len(file_paths), "done": 0, "failed": 0, "bytes": 0, "seconds": 0.0, "mb_per_s": 0.0}
+        self.last_batch_stats = stats
+        start = time.perf_counter()
+        
+        def report(path, state, detail=""):
+            stats["seconds"] = time.perf_counter() - start
+            stats["mb_per_s"] = (stats["bytes"] / (1024 * 1024)) / stats["seconds"] if stats["seconds"] > 0 else 0.0
+            mod_logger.info(f"import_mods: {os.path.basename(path)}: {state} {detail}")
+            if progress_callback:
+                progress_callback(path, state, detail, dict(stats))
+        
+        def fail(path, error):
+            results[path] = error
+            stats["failed"] += 1
+            report(path, "failed", str(error))
+        
+        mod_logger.info(f"import_mods: 批量导入 {len(file_paths)} 个压缩包，{workers} 个解压进程")
+        for path in file_paths:
+            report(path, "queued")
+        with self.copy_engine.operation(f"批量导入 {len(file_paths)} 个压缩包"):
+            try:
+                # 使用spawn：从多线程的Qt进程中fork子进程可能继承其他线程持有的锁
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    futures = {}
+                    for index, path in enumerate(file_paths):
+                        job_dir = batch_dir / f"job{index}"
+                        future = pool.submit(extract_archive_job, path, str(job_dir), memory_limit, memory_budget, include_previews)
+                        futures[future] = (path, job_dir)
+                    # 进程池按提交顺序开始任务，每完成一个就有下一个开始解压
+                    for path in file_paths[:workers]:
+                        report(path, "extracting")
+                    next_index = workers
+                    for future in as_completed(futures):
+                        path, job_dir = futures[future]
+                        if next_index < len(file_paths) and not self.copy_engine.cancelled:
+                            report(file_paths[next_index], "extracting")
+                            next_index += 1
+                        try:
+                            if self.copy_engine.cancelled:
+                                raise CopyCancelled("导入已取消")
+                            try:
+                                job = future.result()
+                            except Exception as e:
+                                mod_logger.warning(f"import_mods: 解压进程处理 {path} 失败: {e}")
+                                job = {"error": str(e), "groups": [], "graph": [], "bytes": 0}
+                            stats["bytes"] += job["bytes"]
+                            results[path] = self._place_batch_job(path, job, mods_path, job_dir, report)
+                            stats["done"] += 1
+                            report(path, "done", f"{len(results[path])} 个MOD")
+                        except CopyCancelled as e:
+                            # 运行中的解压进程无法中断，排队的任务不再开始
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            for pending_path in file_paths:
+                                if pending_path not in results:
+                                    fail(pending_path, e)
+                            break
+                        except Exception as e:
+                            mod_logger.error(f"import_mods: 导入 {path} 失败: {e}")
+                            traceback.print_exc()
+                            fail(path, e)
+                        finally:
+                            shutil.rmtree(job_dir, ignore_errors=True)
+            finally:
+                shutil.rmtree(batch_dir, ignore_errors=True)
+                try:
+                    os.rmdir(staging_root)
+                except OSError:
+                    pass
+        stats["seconds"] = time.perf_counter() - start
+        stats["mb_per_s"] = (stats["bytes"] / (1024 * 1024)) / stats["seconds"] if stats["seconds"] > 0 else 0.0
+        mod_logger.info(f"import_mods: 完成 {stats['done']} 个，失败 {stats['failed']} 个，"
+                        f"解压 {stats['bytes'] / (1024 * 1024):.1f} MB，{stats['seconds']:.2f} 秒，{stats['mb_per_s']:.1f} MB/s")
+        return results
+
+    def _place_batch_job(self, archive_path, job, mods_path, job_dir, report):
+        """把一个解压完成的批量导入任务移入MOD目录并备份，返回导入的MOD信息列表
+        
+        工作进程无法处理或没有找到完整MOD组时改用import_mod()（包括虚拟MOD的处理）。
+        """
+        original_zip = Path(archive_path)
+        graph = ArchiveGraph()
+        graph.nodes = job["graph"]
+        for line in graph.describe():
+            mod_logger.info(f"  {line}")
+        if job["error"] or not job["groups"]:
+            report(archive_path, "extracting", "使用单个导入流程")
+            result = self.import_mod(archive_path)
+            return result if isinstance(result, list) else [result]
+        
+        report(archive_path, "placing", f"{len(job['groups'])} 组MOD")
+        placed = []
+        for group in job["groups"]:
+            files = [Path(file) for file in group["files"]]
+            mod_stage = job_dir / "mods" / group["name"]
+            mod_stage.mkdir(parents=True, exist_ok=True)
+            for file in files:
+                os.replace(file, mod_stage / file.name)
+            target = mods_path / group["name"]
+            self._commit_staged_dir(mod_stage, target)
+            placed.append(dict(group, files=[target / file.name for file in files], dir=target, placed=True))
+        
+        report(archive_path, "backing_up")
+        imported_mods = []
+        with self.config.batch():
+            for group in placed:
+                mod_info = self._imported_mod_info(original_zip, group)
+                self.config.backup_mod(mod_info['name'], mod_info)
+                imported_mods.append(mod_info)
+        return imported_mods
+
+    @staticmethod
+    def _backup_mod_files(fs, directory):
+        """备份目录中的MOD文件（带扩展名的项，排除预览图），目录不存在时返回空列表"""
+        entries = fs.scandir(directory) or []
+        return [Path(entry.path) for entry in entries if '.' in entry.name and entry.name != 'preview.png']
+
+    def _indexed_backup_files(self, fs, mod_id):
+        """通过备份索引查找MOD的备份目录和文件
+        
+        索引中没有记录时只检查与MOD ID同名的备份目录并补记到索引；
+        清单中的文件在磁盘上缺失时按磁盘内容刷新清单。
+        
+        Returns:
+            tuple: (备份目录Path, MOD文件Path列表)，没有可用备份时为(None, [])
+        """
+        backup_dir = self.config.get_backup_dir(mod_id)
+        if backup_dir is None:
+            backup_dir = os.path.join(self.config.get_backup_root(), mod_id)
+            if not self._backup_mod_files(fs, backup_dir):
+                return None, []
+            mod_logger.info(f"enable_mod: 备份索引中没有 {mod_id}，补记备份目录 {backup_dir}")
+            self.config.record_backup(mod_id, backup_dir)
+        
+        backup_files = [Path(path) for path in self.config.backup_index.backup_files(mod_id)]
+        if not backup_files or not all(fs.is_file(path) for path in backup_files):
+            mod_logger.warning(f"enable_mod: MOD {mod_id} 的备份清单与磁盘不一致，重新读取 {backup_dir}")
+            self.config.refresh_backup_index(mod_id)
+            backup_files = [Path(path) for path in self.config.backup_index.backup_files(mod_id)]
+            if not backup_files:
+                return None, []
+        return Path(backup_dir), backup_files
+
+    def _unstage_mod(self, fs, mod_id, mod_info):
+        """把暂存目录中的MOD文件移回MOD目录
+        
+        每个文件都是同一卷上的改名，不会出现复制了一半的文件。上次移动中途中断时，
+        已经在MOD目录中的文件直接保留，只移动剩下的。
+        
+        Returns:
+            bool: 所有文件都已回到MOD目录时返回True；没有暂存文件或有文件缺失时返回False
+        """
+        staged_dir = self.config.get_staging_dir(mod_id)
+        files = [file for file in mod_info.get('files', []) if not file.endswith('.zip')]
+        if staged_dir is None or not files or not fs.is_dir(staged_dir):
+            return False
+        mods_path = self.mods_path
+        for file in files:
+            staged_file = staged_dir / file
+            file_path = mods_path / file
+            if fs.is_file(staged_file):
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(staged_file, file_path)
+                fs.invalidate(staged_file)
+                fs.invalidate(file_path)
+                mod_logger.info(f"enable_mod: 移回文件 {staged_file} -> {file_path}")
+            elif not fs.exists(file_path):
+                mod_logger.warning(f"enable_mod: 暂存目录中缺少文件 {staged_file}，改为从备份恢复")
                 return False
-                
-            # 获取备份路径
-            backup_path = Path(self.config.get_backup_path())
-            if not str(backup_path).strip():
-                backup_path = Path(os.getcwd()) / "modbackup"
-                
-            # 尝试查找备份目录
-            mod_backup_dir = backup_path / mod_id
+        shutil.rmtree(staged_dir, ignore_errors=True)
+        fs.invalidate(staged_dir)
+        return True
+
+    def enable_mod(self, mod_id, fs_cache=None):
+        """启用MOD
+        
+        Args:
+            mod_id: MOD ID
+            fs_cache: 本次操作共享的FsCache（批量启用时多个MOD共用），None时新建一个
+        """
+        return self.enable_mods([mod_id], fs_cache).get(mod_id, False)
+
+    def enable_mods(self, mod_ids, fs_cache=None):
+        """批量启用MOD
+        
+        先逐个处理不需要复制数据的部分（从暂存目录移回、硬链接/reflink/符号链接），
+        需要复制的文件交给CopyScheduler，多个MOD的文件一起并行复制（大文件优先，机械硬盘上顺序复制）。
+        某个MOD复制失败或被取消时删除它已经复制的文件，不影响其他MOD。
+        
+        Args:
+            mod_ids: MOD ID列表
+            fs_cache: 本次操作共享的FsCache，None时新建一个
             
-            # 如果指定的备份目录不存在，尝试查找其他可能的备份目录
-            if not mod_backup_dir.exists() or not any(f for f in mod_backup_dir.glob('*.*') if f.name != 'preview.png'):
-                mod_logger.warning(f"enable_mod: MOD {mod_id} 的备份目录不存在或没有MOD文件: {mod_backup_dir}")
-                
-                # 尝试查找可能的备份目录
-                possible_backup_dirs = []
-                
-                # 检查预览图路径
-                preview_image = mod_info.get('preview_image', '')
-                if preview_image and os.path.exists(preview_image):
-                    preview_dir = Path(preview_image).parent
-                    if preview_dir.exists() and any(f for f in preview_dir.glob('*.*') if f.name != 'preview.png'):
-                        possible_backup_dirs.append(preview_dir)
-                        mod_logger.info(f"enable_mod: 从预览图路径找到可能的备份目录: {preview_dir}")
-                
-                # 检查其他可能的备份目录名
-                base_names = [
-                    mod_info.get('real_name', ''),
-                    mod_info.get('display_name', ''),
-                    mod_info.get('mod_name', ''),
-                    mod_info.get('folder_name', '')
-                ]
-                
-                # 移除空字符串和重复项
-                base_names = list(set([name for name in base_names if name]))
-                
-                for name in base_names:
-                    dir_path = backup_path / name
-                    if dir_path.exists() and any(f for f in dir_path.glob('*.*') if f.name != 'preview.png'):
-                        possible_backup_dirs.append(dir_path)
-                        mod_logger.info(f"enable_mod: 找到可能的备份目录: {dir_path}")
+        Returns:
+            dict: MOD ID -> 是否启用成功
+        """
+        fs = fs_cache if fs_cache is not None else FsCache()
+        results = {}
+        plans = {}
+        scheduler = CopyScheduler(self.copy_engine, self.config.get_copy_workers())
+        for mod_id in mod_ids:
+            try:
+                plan = self._plan_enable(fs, mod_id)
+            except Exception as e:
+                mod_logger.error(f"enable_mod: 启用MOD失败: {e}")
+                traceback.print_exc()
+                plan = None
+            if plan is None or plan is True:
+                results[mod_id] = plan is True
+                continue
+            plans[mod_id] = plan
+            for src_file, dest_file in plan['copies']:
+                mod_logger.info(f"enable_mod: copy {src_file} -> {dest_file}")
+                scheduler.add(src_file, dest_file, tag=mod_id)
                 
-                # 使用找到的第一个备份目录
-                if possible_backup_dirs:
-                    mod_backup_dir = possible_backup_dirs[0]
-                    mod_logger.info(f"enable_mod: 使用备份目录: {mod_backup_dir}")
-                else:
-                    # 最后尝试在所有备份目录中查找
-                    for backup_dir in backup_path.glob('*'):
-                        if backup_dir.is_dir() and any(f for f in backup_dir.glob('*.*') if f.name != 'preview.png'):
-                            possible_backup_dirs.append(backup_dir)
-                            mod_logger.info(f"enable_mod: 找到其他备份目录: {backup_dir}")
+        copy_results = {}
+        if plans:
+            label = f"启用 {next(iter(plans))}" if len(plans) == 1 else f"启用 {len(plans)} 个MOD"
+            copy_results = scheduler.run(label)
+        
+        for mod_id, plan in plans.items():
+            results[mod_id] = self._finish_enable(fs, mod_id, plan, copy_results.get(mod_id))
+        return results
+
+    def _plan_enable(self, fs, mod_id):
+        """准备启用一个MOD：能从暂存目录移回时直接完成，否则链接备份文件并列出需要复制的文件
+        
+        Returns:
+            True表示已启用，None表示失败，否则为dict：
+            {'mod_info', 'mod_dir', 'deployed': 已链接的文件, 'copies': [(备份文件, 目标文件)]}
+        """
+        mod_logger.info(f"enable_mod: 开始启用MOD {mod_id}")
+        
+        # 获取MOD信息
+        mods = self.config.get_mods()
+        mod_info = mods.get(mod_id)
+        if not mod_info:
+            mod_logger.error(f"enable_mod: 找不到MOD信息: {mod_id}")
+            return None
+            
+        # 禁用时移到暂存目录的文件直接移回，备份只在暂存文件不完整时使用
+        if self._unstage_mod(fs, mod_id, mod_info):
+            mod_info['enabled'] = True
+            self.config.update_mod(mod_id, mod_info)
+            mod_logger.info(f"enable_mod: MOD {mod_id} 已从暂存目录启用")
+            return True
+            
+        # 从备份索引直接得到备份目录和文件清单
+        mod_backup_dir, backup_files = self._indexed_backup_files(fs, mod_id)
+        if mod_backup_dir is None:
+            mod_logger.error(f"enable_mod: MOD {mod_id} 没有可用的备份")
+            return None
+        
+        # 获取MOD目录路径
+        mods_path = Path(self.config.get_mods_path())
+        if not fs.exists(mods_path):
+            mods_path.mkdir(parents=True, exist_ok=True)
+            fs.invalidate(mods_path)
+            
+        if not backup_files:
+            mod_logger.error(f"enable_mod: 备份目录没有MOD文件: {mod_backup_dir}")
+            return None
+            
+        # 确定MOD文件夹名称
+        folder_name = mod_info.get('folder_name', '')
+        if not folder_name:
+            # 尝试从文件路径获取文件夹名称
+            if mod_info.get('files'):
+                first_file = mod_info['files'][0]
+                if '/' in first_file:
+                    folder_name = first_file.split('/')[0]
+                elif '\\' in first_file:
+                    folder_name = first_file.split('\\')[0]
                     
-                    if possible_backup_dirs:
-                        mod_backup_dir = possible_backup_dirs[0]
-                        mod_logger.info(f"enable_mod: 使用其他备份目录: {mod_backup_dir}")
-                    else:
-                        mod_logger.error(f"enable_mod: MOD {mod_id} 没有可用的备份")
-                        return False
+            # 如果仍然没有找到，使用备份文件名称推断
+            if not folder_name and backup_files:
+                first_file = backup_files[0].name
+                if '.' in first_file:
+                    folder_name = first_file.split('.')[0]
             
-            # 获取MOD目录路径
-            mods_path = Path(self.config.get_mods_path())
-            if not mods_path.exists():
-                mods_path.mkdir(parents=True, exist_ok=True)
-                
-            # 获取MOD文件列表（排除预览图）
-            backup_files = [f for f in mod_backup_dir.glob('*.*') if f.name != 'preview.png']
-            if not backup_files:
-                mod_logger.error(f"enable_mod: 备份目录没有MOD文件: {mod_backup_dir}")
-                return False
-                
-            # 确定MOD文件夹名称
-            folder_name = mod_info.get('folder_name', '')
+            # 如果仍然没有找到，使用MOD ID作为文件夹名称
             if not folder_name:
-                # 尝试从文件路径获取文件夹名称
-                if mod_info.get('files'):
-                    first_file = mod_info['files'][0]
-                    if '/' in first_file:
-                        folder_name = first_file.split('/')[0]
-                    elif '\\' in first_file:
-                        folder_name = first_file.split('\\')[0]
-                        
-                # 如果仍然没有找到，使用备份文件名称推断
-                if not folder_name and backup_files:
-                    first_file = backup_files[0].name
-                    if '.' in first_file:
-                        folder_name = first_file.split('.')[0]
+                folder_name = mod_id
                 
-                # 如果仍然没有找到，使用MOD ID作为文件夹名称
-                if not folder_name:
-                    folder_name = mod_id
-                    
-            # 创建MOD目录
-            mod_dir = mods_path / folder_name
-            mod_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 复制文件
-            copied_count = 0
-            for src_file in backup_files:
-                if src_file.is_file():
-                    dest_file = mod_dir / src_file.name
-                    mod_logger.info(f"enable_mod: 复制文件 {src_file} -> {dest_file}")
-                    shutil.copy2(src_file, dest_file)
-                    copied_count += 1
-                    
-            if copied_count == 0:
+        # 创建MOD目录
+        mod_dir = mods_path / folder_name
+        mod_dir.mkdir(parents=True, exist_ok=True)
+        
+        # 链接方式立即完成，复制方式交给调度器
+        deploy_mode = resolve_deploy_mode(self.config.get_deploy_mode(), mod_backup_dir, mod_dir)
+        plan = {'mod_info': mod_info, 'mod_dir': mod_dir, 'deployed': [], 'copies': []}
+        for src_file in backup_files:
+            if fs.is_file(src_file):
+                dest_file = mod_dir / src_file.name
+                if deploy_mode == "copy":
+                    plan['copies'].append((src_file, dest_file))
+                else:
+                    mod_logger.info(f"enable_mod: {deploy_mode} {src_file} -> {dest_file}")
+                    deploy_file(src_file, dest_file, deploy_mode, self.copy_engine.copy_file)
+                    plan['deployed'].append(dest_file)
+        return plan
+
+    def _finish_enable(self, fs, mod_id, plan, copy_result):
+        """复制完成后更新MOD状态；有文件复制失败或被取消时删除该MOD已部署的文件"""
+        mod_dir = plan['mod_dir']
+        deployed = plan['deployed'] + [dest_file for _, dest_file in plan['copies']]
+        try:
+            if copy_result and copy_result['errors']:
+                cancelled = any(isinstance(error, CopyCancelled) for _, _, error in copy_result['errors'])
+                if cancelled:
+                    mod_logger.warning(f"enable_mod: 已取消启用MOD {mod_id}，删除已复制的文件")
+                else:
+                    mod_logger.error(f"enable_mod: MOD {mod_id} 有 {len(copy_result['errors'])} 个文件复制失败")
+                for dest_file in deployed:
+                    dest_file.unlink(missing_ok=True)
+                fs.invalidate(mod_dir)
+                return False
+            fs.invalidate(mod_dir)
+            
+            if not deployed:
                 mod_logger.error(f"enable_mod: 没有复制任何文件")
                 # 清理创建的空目录
                 if mod_dir.exists() and not list(mod_dir.glob('*')):
                     shutil.rmtree(mod_dir)
                 return False
                 
+            # 已从备份恢复，暂存目录中剩下的文件不再需要
+            self.config.discard_staged(mod_id)
+            
             # 更新MOD状态
+            mod_info = plan['mod_info']
             mod_info['enabled'] = True
             self.config.update_mod(mod_id, mod_info)
             
-            mod_logger.info(f"enable_mod: MOD {mod_id} 已启用，复制了 {copied_count} 个文件")
+            mod_logger.info(f"enable_mod: MOD {mod_id} 已启用，复制了 {len(deployed)} 个文件")
             return True
             
         except Exception as e:
             mod_logger.error(f"enable_mod: 启用MOD失败: {e}")
-            import traceback
             traceback.print_exc()
             return False
 
-    def disable_mod(self, mod_id):
-        """禁用MOD"""
+    def disable_mod(self, mod_id, fs_cache=None):
+        """禁用MOD
+        
+        Args:
+            mod_id: MOD ID
+            fs_cache: 本次操作共享的FsCache（批量禁用时多个MOD共用），None时新建一个
+        """
+        fs = fs_cache if fs_cache is not None else FsCache()
         try:
             mod_info = self.config.get_mods().get(mod_id)
             if not mod_info:
                 raise ValueError(f"MOD不存在: {mod_id}")
                 
-            # 删除MOD文件
+            # 把MOD文件移到暂存目录（同一卷上只是改名），暂存目录不可用时删除
             mods_path = self.mods_path
+            staged_dir = self.config.get_staging_dir(mod_id) if self.config.staging_available() else None
             for file in mod_info.get('files', []):
                 file_path = mods_path / file if not file.endswith('.zip') else None
-                if file_path and file_path.exists():
-                    file_path.unlink()
-                    mod_logger.info(f"disable_mod: 删除文件 {file_path}")
+                if file_path and fs.exists(file_path):
+                    if staged_dir is not None:
+                        staged_file = staged_dir / file
+                        staged_file.parent.mkdir(parents=True, exist_ok=True)
+                        os.replace(file_path, staged_file)
+                        fs.invalidate(staged_file)
+                        fs.invalidate(staged_dir)
+                        mod_logger.info(f"disable_mod: 移动文件 {file_path} -> {staged_file}")
+                    else:
+                        file_path.unlink()
+                        mod_logger.info(f"disable_mod: 删除文件 {file_path}")
+                    fs.invalidate(file_path)
                     
             # 清理空文件夹
             if mod_info.get('folder_structure', False):
@@ -1407,10 +1871,11 @@ class ModManager:
                 first_file = mod_info.get('files', [''])[0]
                 if first_file:
                     parent_dir = (mods_path / first_file).parent
-                    if parent_dir.exists() and parent_dir != mods_path:
+                    if parent_dir != mods_path and fs.exists(parent_dir):
                         # 检查目录是否为空
-                        if not any(parent_dir.iterdir()):
+                        if not fs.listdir(parent_dir):
                             parent_dir.rmdir()
+                            fs.invalidate(parent_dir)
                             mod_logger.info(f"disable_mod: 删除空目录 {parent_dir}")
             
             mod_info['enabled'] = False
@@ -1424,15 +1889,43 @@ class ModManager:
         """删除MOD"""
         # 先禁用MOD
         self.disable_mod(mod_id)
+        self.config.discard_staged(mod_id)
         
-        # 删除备份
-        backup_dir = Path(self.config.get_backup_path()) / mod_id
-        if backup_dir.exists():
+        # 删除备份（索引中记录的目录，没有记录时为与MOD ID同名的目录）
+        backup_dir = self.config.get_backup_dir(mod_id)
+        if backup_dir is None:
+            backup_dir = os.path.join(self.config.get_backup_root(), mod_id)
+        if os.path.exists(backup_dir):
             shutil.rmtree(backup_dir)
         
         # 从配置中删除
         self.config.remove_mod(mod_id)
         
+    def verify_enabled_mod(self, mod_id):
+        """检查已启用MOD在MOD目录中的文件与备份内容是否一致
+        
+        Returns:
+            list: 问题描述列表，一致时为空列表
+        """
+        mod_info = self.config.get_mods().get(mod_id)
+        if not mod_info:
+            return [f"MOD不存在: {mod_id}"]
+        backup_dir = self.config.get_backup_dir(mod_id)
+        if backup_dir is None:
+            return ["没有备份记录"]
+        issues = []
+        for file in mod_info.get('files', []):
+            enabled_file = self.mods_path / file
+            backup_file = os.path.join(backup_dir, os.path.basename(file))
+            if not enabled_file.exists():
+                issues.append(f"缺少文件: {file}")
+            elif not os.path.exists(backup_file):
+                issues.append(f"备份中没有文件: {os.path.basename(file)}")
+            elif not self.fingerprints.same_content(enabled_file, backup_file):
+                issues.append(f"文件与备份不一致: {file}")
+        self.fingerprints.save()
+        return issues
+
     def update_mod_info(self, mod_id, mod_info):
         """更新MOD信息"""
         self.config.update_mod(mod_id, mod_info)
@@ -1559,7 +2052,7 @@ class ModManager:
                 # 更新MOD文件列表
                 mod_logger.info(f"restore_mod_from_backup: 从备份推断的文件列表: {mod_files}")
                 mod['files'] = mod_files
-                self.config._save_config()
+                self.config._save_mod(mod_id)
             
             # 将所有备份文件复制到游戏目录
             success_count = 0
@@ -1593,9 +2086,10 @@ class ModManager:
                     # 确保目标目录存在
                     target_path.parent.mkdir(parents=True, exist_ok=True)
                     
-                    # 复制文件
+                    # 按部署方式链接或复制文件
                     if not source_path.is_dir():
-                        shutil.copy2(source_path, target_path)
+                        deploy_file(source_path, target_path, resolve_deploy_mode(self.config.get_deploy_mode(), source_path.parent, target_path.parent),
+                                    self.copy_engine.copy_file)
                         mod_logger.info(f"restore_mod_from_backup: 成功恢复文件 {target_path}")
                         success_count += 1
                     else:
@@ -1603,7 +2097,7 @@ class ModManager:
                         if target_path.exists() and target_path.is_dir():
                             # 如果目标目录已存在，先清空
                             shutil.rmtree(target_path)
-                        shutil.copytree(source_path, target_path)
+                        self.copy_engine.copytree(source_path, target_path)
                         mod_logger.info(f"restore_mod_from_backup: 成功恢复目录 {target_path}")
                         success_count += 1
                 except Exception as e:
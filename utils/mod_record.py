@@ -0,0 +1,83 @@
+import posixpath
+import sys
+
+
+class ModRecord(dict):
+    """单个MOD的信息记录
+
+    是dict的子类，json.dumps、dict(...)等可以直接使用，现有代码可以不加修改地使用。
+    写入时统一处理：键、在大量MOD之间重复的字符串（文件夹名、分类、导入日期）和同一MOD中
+    重复的名称字段会被intern，
+    files中的相对路径统一规范化。数据保存在dict自身中（json的C编码器直接读取dict的存储，
+    不会经过子类的方法，因此不能把字段放在__slots__里）。
+    """
+
+    # 在大量MOD之间重复出现的字符串字段，以及同一MOD中通常相同的几个名称字段
+    INTERNED_FIELDS = frozenset((
+        "folder_name", "category", "import_date",
+        "name", "display_name", "mod_name", "real_name",
+    ))
+
+    __slots__ = ()
+
+    def __init__(self, data=None, **kwargs):
+        super().__init__()
+        self.update(data or (), **kwargs)
+
+    @classmethod
+    def from_json(cls, data):
+        """从JSON字典创建，已经是ModRecord时直接返回"""
+        if isinstance(data, cls):
+            return data
+        return cls(data)
+
+    def to_json(self):
+        """转换为普通字典"""
+        return dict(self)
+
+    @staticmethod
+    def normalize_path(path):
+        """规范化MOD的相对文件路径（统一为/分隔符，去掉多余的.和/）
+
+        使用posixpath：os.path.normpath在Windows上会把/重新换成\\，保存的路径会随平台变化。
+        """
+        if not path:
+            return path
+        return posixpath.normpath(str(path).replace("\\", "/"))
+
+    @classmethod
+    def _prepare(cls, key, value):
+        if key in cls.INTERNED_FIELDS and type(value) is str:
+            return sys.intern(value)
+        if key == "files" and isinstance(value, list):
+            return [cls.normalize_path(path) for path in value]
+        return value
+
+    def __setitem__(self, key, value):
+        if type(key) is str:
+            key = sys.intern(key)
+        super().__setitem__(key, self._prepare(key, value))
+
+    def update(self, other=(), **kwargs):
+        items = other.items() if hasattr(other, "keys") else other
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return super().__getitem__(key)
+
+    def copy(self):
+        """浅拷贝，与dict.copy()语义一致"""
+        record = ModRecord()
+        dict.update(record, self)
+        return record
+
+    def __repr__(self):
+        return f"ModRecord({dict.__repr__(self)})"
+
+    def __reduce__(self):
+        return (ModRecord, (dict(self),))
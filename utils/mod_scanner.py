@@ -0,0 +1,298 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# 一个完整MOD由同目录下同名的这三个文件组成
+MOD_EXTENSIONS = (".pak", ".ucas", ".utoc")
+
+# Linux上视为网络存储的文件系统类型
+NETWORK_FS_TYPES = ("nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "9p", "afs", "ceph", "glusterfs")
+
+
+def scan_mod_groups(root, cache=None, rel_dir="", recursive=True, workers=1, fs_cache=None):
+    """单次遍历MOD目录，找出所有pak/ucas/utoc文件组
+
+    每个目录只调用一次os.scandir，目录项按文件名（不含扩展名）分组，
+    不再为每个pak单独检查ucas/utoc是否存在、重复列出同一目录，
+    文件大小直接使用DirEntry的stat结果（Windows上不需要额外的系统调用）。
+
+    Args:
+        root: MOD根目录
+        cache: 可选的ScanCache；提供时mtime和inode未变化的目录直接使用缓存结果，
+            不再列出目录内容。只在完整扫描（rel_dir为空且递归）时使用
+        rel_dir: 只扫描root下的这个相对目录（用于增量更新），结果中的路径仍相对root
+        recursive: 是否扫描子目录
+        workers: 扫描线程数。大于1时起始目录下的每个子目录树作为一个任务交给线程池
+            （列目录和stat期间会释放GIL），结果仍按串行扫描的顺序合并
+        fs_cache: 可选的FsCache；提供时目录列表从中获取并保存到其中，
+            同一次操作中的其他检查（如clean_invalid_mods）不必再次列出这些目录
+
+    Returns:
+        list: 每个pak对应一个字典，按目录先序、目录内scandir顺序排列:
+            dir: 所在目录的完整路径
+            rel_dir: 相对root的目录（root本身为""）
+            folder_name: 所在目录名
+            stem: 文件名（不含扩展名）
+            files: {".pak": 文件名, ".ucas": 文件名, ".utoc": 文件名}，缺失的扩展名不在其中
+            pak_path: pak文件完整路径
+            pak_size: pak文件大小（字节）
+            rel_files: 相对root的文件路径列表，本组的pak/ucas/utoc在前，同目录下的其他文件在后
+            complete: 三个文件是否齐全
+    """
+    root = os.fspath(root)
+    start = (os.path.join(root, rel_dir) if rel_dir else root, rel_dir)
+    if rel_dir or not recursive:
+        cache = None
+    if cache is not None:
+        cache.begin(root)
+
+    if not recursive:
+        result = _visit_dir(start[0], start[1], None, fs_cache)
+        groups = list(result[0]) if result else []
+    elif workers and workers > 1:
+        groups = _walk_parallel(start, cache, workers, fs_cache)
+    else:
+        groups = _walk([start], cache, fs_cache)
+
+    if cache is not None:
+        cache.finish()
+    return groups
+
+
+def _walk(stack, cache, fs_cache=None):
+    """串行先序遍历，返回找到的文件组"""
+    groups = []
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        result = _visit_dir(dir_path, rel_dir, cache, fs_cache)
+        if result is None:
+            continue
+        dir_groups, subdirs = result
+        groups.extend(dir_groups)
+        # 子目录逆序入栈，出栈时保持scandir顺序（先序遍历）
+        stack.extend(reversed(subdirs))
+    return groups
+
+
+def _walk_parallel(start, cache, workers, fs_cache=None):
+    """起始目录在当前线程处理，其下每个子目录树作为一个任务交给线程池
+
+    按子目录顺序收集各任务的结果，与串行扫描的先序顺序完全一致。
+    """
+    result = _visit_dir(start[0], start[1], cache, fs_cache)
+    if result is None:
+        return []
+    groups, subdirs = result
+    groups = list(groups)
+    if not subdirs:
+        return groups
+    with ThreadPoolExecutor(max_workers=min(workers, len(subdirs)), thread_name_prefix="ModScan") as executor:
+        futures = [executor.submit(_walk, [subdir], cache, fs_cache) for subdir in subdirs]
+        for future in futures:
+            groups.extend(future.result())
+    return groups
+
+
+def _visit_dir(dir_path, rel_dir, cache, fs_cache=None):
+    """处理一个目录
+
+    Returns:
+        tuple: (本目录中的文件组列表, [(子目录路径, 子目录相对路径)])，目录无法读取时返回None
+    """
+    if cache is not None:
+        try:
+            dir_stat = os.stat(dir_path)
+        except OSError as e:
+            print(f"[警告] scan_mod_groups: 无法读取目录 {dir_path}: {e}")
+            return None
+        cached = cache.lookup(rel_dir, dir_stat)
+        if cached is not None:
+            subdirs = [(os.path.join(dir_path, name), os.path.join(rel_dir, name) if rel_dir else name)
+                       for name in cached["subdirs"]]
+            return cached["groups"], subdirs
+    if fs_cache is not None:
+        entries = fs_cache.scandir(dir_path)
+        if entries is None:
+            print(f"[警告] scan_mod_groups: 无法读取目录 {dir_path}")
+            return None
+    else:
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError as e:
+            print(f"[警告] scan_mod_groups: 无法读取目录 {dir_path}: {e}")
+            return None
+
+    subdirs = []
+    file_names = []
+    # 文件名 -> {扩展名: DirEntry}
+    by_stem = {}
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                # 与Path.rglob一致：不进入指向目录的符号链接
+                if not entry.is_symlink():
+                    subdirs.append(entry)
+                continue
+            if not entry.is_file():
+                continue
+        except OSError:
+            continue
+        file_names.append(entry.name)
+        stem, ext = os.path.splitext(entry.name)
+        ext = ext.lower()
+        if ext in MOD_EXTENSIONS:
+            by_stem.setdefault(stem, {})[ext] = entry
+
+    folder_name = os.path.basename(dir_path)
+    dir_groups = []
+    for entry in entries:
+        stem, ext = os.path.splitext(entry.name)
+        if ext.lower() != ".pak":
+            continue
+        members = by_stem.get(stem)
+        if not members or members.get(".pak") is not entry:
+            continue
+        group_names = {ext: member.name for ext, member in members.items()}
+        try:
+            pak_size = entry.stat().st_size
+        except OSError:
+            pak_size = 0
+        # 本组的三个文件在前，同目录下的其他文件在后
+        names = [members[ext].name for ext in MOD_EXTENSIONS if ext in members]
+        excluded = set(names)
+        names.extend(name for name in file_names if name not in excluded)
+        dir_groups.append({
+            "dir": dir_path,
+            "rel_dir": rel_dir,
+            "folder_name": folder_name,
+            "stem": stem,
+            "files": group_names,
+            "pak_path": entry.path,
+            "pak_size": pak_size,
+            "rel_files": [os.path.join(rel_dir, name) for name in names] if rel_dir else names,
+            "complete": all(ext in members for ext in MOD_EXTENSIONS),
+        })
+
+    if cache is not None:
+        cache.store(rel_dir, dir_stat, dir_groups, [entry.name for entry in subdirs])
+    subdirs = [(entry.path, os.path.join(rel_dir, entry.name) if rel_dir else entry.name) for entry in subdirs]
+    return dir_groups, subdirs
+
+
+def detect_storage_kind(path):
+    """判断路径所在的存储设备类型
+
+    Returns:
+        str: "ssd"、"hdd"（机械硬盘，有寻道开销）、"network"（网络共享）或"unknown"
+    """
+    try:
+        path = os.path.abspath(os.fspath(path))
+        if sys.platform == "win32":
+            return _detect_storage_kind_windows(path)
+        if sys.platform.startswith("linux"):
+            return _detect_storage_kind_linux(path)
+    except Exception as e:
+        print(f"[警告] detect_storage_kind: 无法判断存储类型 {path}: {e}")
+    return "unknown"
+
+
+def default_scan_workers(path):
+    """根据存储类型选择扫描线程数
+
+    网络共享和机械硬盘上列目录主要受延迟（往返、寻道）限制，并发请求可以重叠这些等待，
+    网络共享并发越多越好，机械硬盘只保留少量并发让磁盘调度合并请求；
+    SSD和无法判断的设备上目录元数据通常已在系统缓存中，扫描受CPU（GIL）限制，
+    多线程反而更慢，使用串行扫描。
+    """
+    kind = detect_storage_kind(path)
+    if kind == "network":
+        workers = 16
+    elif kind == "hdd":
+        workers = 4
+    else:
+        workers = 1
+    print(f"[调试] default_scan_workers: {path} 存储类型 {kind}，扫描线程数 {workers}")
+    return workers
+
+
+def _detect_storage_kind_linux(path):
+    # 找到路径所在的挂载点，先判断是否网络文件系统
+    best_mount = ""
+    best_type = ""
+    with open("/proc/mounts", "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 3:
+                continue
+            mount_point = parts[1].replace("\\040", " ")
+            if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) >= len(best_mount):
+                best_mount = mount_point
+                best_type = parts[2]
+    if best_type in NETWORK_FS_TYPES:
+        return "network"
+
+    # 通过设备号找到块设备的rotational标记（分区的标记在上一级设备中）
+    dev = os.stat(path).st_dev
+    sys_dir = f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}"
+    for candidate in (os.path.join(sys_dir, "queue", "rotational"), os.path.join(sys_dir, "..", "queue", "rotational")):
+        if os.path.exists(candidate):
+            with open(candidate, "r") as f:
+                return "hdd" if f.read().strip() == "1" else "ssd"
+    return "unknown"
+
+
+def _detect_storage_kind_windows(path):
+    import ctypes
+    from ctypes import wintypes
+
+    drive, _ = os.path.splitdrive(path)
+    if not drive:
+        return "unknown"
+    # UNC路径
+    if drive.startswith("\\\\"):
+        return "network"
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    # 映射的网络驱动器
+    DRIVE_REMOTE = 4
+    if kernel32.GetDriveTypeW(drive + "\\") == DRIVE_REMOTE:
+        return "network"
+
+    # 查询卷所在磁盘是否有寻道开销（IOCTL_STORAGE_QUERY_PROPERTY / StorageDeviceSeekPenaltyProperty）
+    class STORAGE_PROPERTY_QUERY(ctypes.Structure):
+        _fields_ = [("PropertyId", ctypes.c_int), ("QueryType", ctypes.c_int), ("AdditionalParameters", ctypes.c_ubyte * 1)]
+
+    class DEVICE_SEEK_PENALTY_DESCRIPTOR(ctypes.Structure):
+        _fields_ = [("Version", wintypes.DWORD), ("Size", wintypes.DWORD), ("IncursSeekPenalty", wintypes.BOOLEAN)]
+
+    IOCTL_STORAGE_QUERY_PROPERTY = 0x002D1400
+    StorageDeviceSeekPenaltyProperty = 7
+    PropertyStandardQuery = 0
+    FILE_SHARE_READ_WRITE = 0x1 | 0x2
+    OPEN_EXISTING = 3
+    INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    kernel32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                     wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
+    kernel32.DeviceIoControl.argtypes = [wintypes.HANDLE, wintypes.DWORD, wintypes.LPVOID, wintypes.DWORD,
+                                         wintypes.LPVOID, wintypes.DWORD, ctypes.POINTER(wintypes.DWORD), wintypes.LPVOID]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+    # 访问权限为0即可查询设备属性，不需要管理员权限
+    handle = kernel32.CreateFileW(f"\\\\.\\{drive}", 0, FILE_SHARE_READ_WRITE, None, OPEN_EXISTING, 0, None)
+    if not handle or handle == INVALID_HANDLE_VALUE:
+        return "unknown"
+    try:
+        query = STORAGE_PROPERTY_QUERY(StorageDeviceSeekPenaltyProperty, PropertyStandardQuery)
+        descriptor = DEVICE_SEEK_PENALTY_DESCRIPTOR()
+        returned = wintypes.DWORD(0)
+        ok = kernel32.DeviceIoControl(handle, IOCTL_STORAGE_QUERY_PROPERTY,
+                                      ctypes.byref(query), ctypes.sizeof(query),
+                                      ctypes.byref(descriptor), ctypes.sizeof(descriptor),
+                                      ctypes.byref(returned), None)
+        if not ok:
+            return "unknown"
+        return "hdd" if descriptor.IncursSeekPenalty else "ssd"
+    finally:
+        kernel32.CloseHandle(handle)
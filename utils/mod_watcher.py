@@ -0,0 +1,257 @@
+import os
+import threading
+import time
+import traceback
+
+# watchdog是可选依赖：安装后使用系统文件通知（inotify、ReadDirectoryChangesW、FSEvents），
+# 否则退回到定时轮询目录
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    HAS_WATCHDOG = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    HAS_WATCHDOG = False
+
+
+class ModWatcher:
+    """监视MOD目录和备份目录的文件变化
+
+    一段时间内连续发生的事件会被合并（防抖），安静下来后把变化的路径集合交给回调，
+    回调在后台线程中执行，界面需要自行切回主线程。
+    """
+
+    def __init__(self, paths, callback, debounce_ms=500, max_delay_ms=5000, poll_interval=2.0, use_watchdog=None):
+        """
+        Args:
+            paths: 要监视的目录列表
+            callback: 回调函数，参数为变化路径的集合
+            debounce_ms: 最后一个事件之后等待多久再回调
+            max_delay_ms: 持续有事件时最多等待多久就回调一次（例如复制大量文件时）
+            poll_interval: 轮询模式下的检查间隔（秒）
+            use_watchdog: 是否使用watchdog，None表示可用时使用
+        """
+        self.paths = [os.path.abspath(os.fspath(path)) for path in paths if path]
+        self.callback = callback
+        self.debounce = debounce_ms / 1000.0
+        self.max_delay = max(max_delay_ms, debounce_ms) / 1000.0
+        self.poll_interval = poll_interval
+        self.use_watchdog = HAS_WATCHDOG if use_watchdog is None else (use_watchdog and HAS_WATCHDOG)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._first_event = None
+        self._last_event = None
+        self._event = threading.Event()
+        self._stop_event = threading.Event()
+        self._dispatch_thread = None
+        self._observer = None
+        self._poller = None
+
+    @property
+    def backend(self):
+        return "watchdog" if self.use_watchdog else "polling"
+
+    @property
+    def running(self):
+        return self._dispatch_thread is not None
+
+    def start(self):
+        """开始监视"""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._dispatch_thread = threading.Thread(target=self._dispatch_loop, name="ModWatcherDispatch", daemon=True)
+        self._dispatch_thread.start()
+        try:
+            if self.use_watchdog:
+                self._start_watchdog()
+            else:
+                self._poller = _DirectoryPoller(self.paths, self.notify, self.poll_interval, self._stop_event)
+                self._poller.start()
+            print(f"[调试] ModWatcher.start: 开始监视 {self.paths}，方式: {self.backend}")
+        except Exception as e:
+            print(f"[错误] ModWatcher.start: 启动文件监视失败: {e}")
+            traceback.print_exc()
+            self.stop()
+
+    def stop(self):
+        """停止监视并等待后台线程退出，未回调的变化会被丢弃"""
+        self._stop_event.set()
+        self._event.set()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=5)
+            except Exception as e:
+                print(f"[警告] ModWatcher.stop: 停止watchdog失败: {e}")
+            self._observer = None
+        if self._poller is not None:
+            self._poller.join(timeout=5)
+            self._poller = None
+        if self._dispatch_thread is not None:
+            if self._dispatch_thread is not threading.current_thread():
+                self._dispatch_thread.join(timeout=5)
+            self._dispatch_thread = None
+        with self._lock:
+            self._pending.clear()
+
+    def notify(self, path):
+        """记录一个变化的路径（可从任意线程调用）"""
+        now = time.monotonic()
+        with self._lock:
+            self._pending.add(path)
+            if self._first_event is None:
+                self._first_event = now
+            self._last_event = now
+        self._event.set()
+
+    def _start_watchdog(self):
+        handler = _WatchdogHandler(self.notify)
+        self._observer = Observer()
+        for path in self.paths:
+            if os.path.isdir(path):
+                self._observer.schedule(handler, path, recursive=True)
+            else:
+                print(f"[警告] ModWatcher: 目录不存在，跳过监视: {path}")
+        self._observer.daemon = True
+        self._observer.start()
+
+    def _dispatch_loop(self):
+        while not self._stop_event.is_set():
+            self._event.wait()
+            self._event.clear()
+            # 等待事件安静下来，但持续有事件时不超过max_delay
+            while not self._stop_event.is_set():
+                with self._lock:
+                    if self._last_event is None:
+                        break
+                    now = time.monotonic()
+                    remaining = min(self._last_event + self.debounce, self._first_event + self.max_delay) - now
+                if remaining <= 0:
+                    break
+                self._stop_event.wait(remaining)
+            if self._stop_event.is_set():
+                break
+            with self._lock:
+                paths = self._pending
+                self._pending = set()
+                self._first_event = None
+                self._last_event = None
+            if not paths:
+                continue
+            try:
+                self.callback(paths)
+            except Exception as e:
+                print(f"[错误] ModWatcher: 处理文件变化失败: {e}")
+                traceback.print_exc()
+
+
+class _WatchdogHandler(FileSystemEventHandler):
+    """把watchdog事件转换为变化路径"""
+
+    def __init__(self, notify):
+        super().__init__()
+        self._notify = notify
+
+    def on_any_event(self, event):
+        # 目录自身的"修改"事件只表示其中有文件变化，对应的文件事件会单独到达
+        if event.is_directory and event.event_type == "modified":
+            return
+        self._notify(os.fspath(event.src_path))
+        dest_path = getattr(event, "dest_path", None)
+        if dest_path:
+            self._notify(os.fspath(dest_path))
+
+
+class _DirectoryPoller(threading.Thread):
+    """轮询方式的文件监视
+
+    记录每个目录的mtime和其中各项的大小、修改时间，每次轮询只stat目录，
+    只有mtime变化的目录才重新列出并比较，找出新增、删除和修改的路径。
+    与扫描缓存相同，原地覆盖文件不改变目录mtime，这种修改要等目录有其他变化时才会发现。
+    """
+
+    # 刚修改过的目录在下次轮询时仍重新列出，避免同一时间刻度内的后续修改被漏掉
+    RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+    def __init__(self, roots, notify, interval, stop_event):
+        super().__init__(name="ModWatcherPoll", daemon=True)
+        self.roots = roots
+        self.notify = notify
+        self.interval = interval
+        self.stop_event = stop_event
+        # 目录 -> (mtime_ns, {名称: (是否目录, 大小, mtime_ns)})
+        self.snapshot = {}
+
+    def run(self):
+        # 建立初始快照，不产生事件
+        for root in self.roots:
+            self._poll_tree(root, report=False)
+        while not self.stop_event.wait(self.interval):
+            try:
+                for root in self.roots:
+                    self._poll_tree(root, report=True)
+            except Exception as e:
+                print(f"[错误] ModWatcher: 轮询目录失败: {e}")
+                traceback.print_exc()
+
+    def _poll_tree(self, root, report):
+        stack = [root]
+        while stack:
+            dir_path = stack.pop()
+            try:
+                mtime_ns = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                # 目录已被删除
+                if dir_path in self.snapshot:
+                    self._forget(dir_path)
+                    if report:
+                        self.notify(dir_path)
+                continue
+            old = self.snapshot.get(dir_path)
+            if old is not None and old[0] == mtime_ns:
+                entries = old[1]
+            else:
+                entries = self._list(dir_path)
+                if entries is None:
+                    continue
+                recent = time.time_ns() - mtime_ns < self.RACY_WINDOW_NS
+                self.snapshot[dir_path] = (None if recent else mtime_ns, entries)
+                if report:
+                    self._report_changes(dir_path, old[1] if old else {}, entries)
+            for name, (is_dir, _, _) in entries.items():
+                if is_dir:
+                    stack.append(os.path.join(dir_path, name))
+
+    def _list(self, dir_path):
+        entries = {}
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        st = entry.stat(follow_symlinks=False)
+                        entries[entry.name] = (is_dir, 0 if is_dir else st.st_size, st.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        return entries
+
+    def _report_changes(self, dir_path, old_entries, new_entries):
+        for name, info in new_entries.items():
+            if old_entries.get(name) != info:
+                self.notify(os.path.join(dir_path, name))
+        for name, (is_dir, _, _) in old_entries.items():
+            if name not in new_entries:
+                path = os.path.join(dir_path, name)
+                if is_dir:
+                    self._forget(path)
+                self.notify(path)
+
+    def _forget(self, dir_path):
+        """删除目录及其子目录的快照"""
+        prefix = dir_path + os.sep
+        for path in [p for p in self.snapshot if p == dir_path or p.startswith(prefix)]:
+            del self.snapshot[path]
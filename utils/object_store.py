@@ -0,0 +1,216 @@
+import os
+import shutil
+import threading
+import traceback
+import uuid
+
+
+class ObjectStore:
+    """按内容哈希存放备份文件的对象库，位于备份目录下的.objects
+
+    每个不同内容的文件只保存一份（.objects/<哈希前两位>/<哈希>），
+    各MOD备份目录中的文件是指向对象的硬链接，因此现有按目录读取备份的代码不需要改动，
+    内容重复的MOD（换名重新导入、同一材质包多次导入）不再占用额外空间，也不需要再写一遍数据。
+
+    引用计数由备份索引中各MOD清单记录的哈希得到，gc()删除引用数为0的对象。
+    删除对象只是去掉对象库里的那个链接，仍被其他目录链接的数据不会丢失。
+    备份目录所在的文件系统不支持硬链接（例如FAT/exFAT）时对象库不启用，备份照常复制文件。
+    """
+
+    DIR_NAME = ".objects"
+
+    def __init__(self, backup_root, fingerprints, copy_file=shutil.copy2):
+        """
+        Args:
+            backup_root: 备份根目录
+            fingerprints: FingerprintService，用于计算文件哈希
+            copy_file: 复制文件的函数，例如CopyEngine.copy_file
+        """
+        self.backup_root = os.path.abspath(os.fspath(backup_root))
+        self.objects_dir = os.path.join(self.backup_root, self.DIR_NAME)
+        self.fingerprints = fingerprints
+        self.copy_file = copy_file
+        self._lock = threading.Lock()
+        self._links_supported = None
+        # 本次运行中因内容重复而省掉的写入
+        self.dedup_files = 0
+        self.dedup_bytes = 0
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def has(self, digest):
+        return os.path.isfile(self.object_path(digest))
+
+    @property
+    def enabled(self):
+        """备份目录所在的文件系统是否支持硬链接（第一次调用时检测一次）"""
+        if self._links_supported is None:
+            self._links_supported = self._check_links()
+        return self._links_supported
+
+    def _check_links(self):
+        probe = os.path.join(self.objects_dir, f"probe-{uuid.uuid4().hex}")
+        try:
+            os.makedirs(self.objects_dir, exist_ok=True)
+            with open(probe, 'wb'):
+                pass
+            os.link(probe, probe + ".link")
+            os.remove(probe + ".link")
+            return True
+        except OSError as e:
+            print(f"[警告] ObjectStore: 备份目录不支持硬链接，不使用去重对象库: {e}")
+            return False
+        finally:
+            try:
+                os.remove(probe)
+            except OSError:
+                pass
+
+    def store(self, src, dest):
+        """把文件存入对象库，并在dest创建指向对象的硬链接
+
+        内容已存在时不再复制。对象库不可用或链接失败时直接复制到dest。
+
+        Returns:
+            str: 文件内容的哈希，没有使用对象库时返回None
+        """
+        src = os.fspath(src)
+        dest = os.fspath(dest)
+        if not self.enabled:
+            self.copy_file(src, dest)
+            return None
+        digest = self.fingerprints.fingerprint(src)
+        if digest is None:
+            self.copy_file(src, dest)
+            return None
+        object_path = self.object_path(digest)
+        if os.path.isfile(object_path):
+            with self._lock:
+                self.dedup_files += 1
+                self.dedup_bytes += os.path.getsize(object_path)
+        else:
+            # 复制不持有锁，多个线程可以同时存入不同对象；
+            # 同一内容被并发存入时各自写临时文件再改名，结果相同
+            self._add_object(src, object_path, move=False)
+        try:
+            self._link(object_path, dest)
+        except OSError as e:
+            print(f"[警告] ObjectStore.store: 创建硬链接失败，改为复制 {src} -> {dest}: {e}")
+            self.copy_file(src, dest)
+            return None
+        return digest
+
+    def adopt(self, path):
+        """把已有的备份文件收入对象库（迁移旧备份用）
+
+        内容已存在时用指向现有对象的硬链接替换该文件，否则直接把该文件链接为新对象，都不复制数据。
+
+        Returns:
+            tuple: (哈希, 省掉的字节数)，无法处理时哈希为None
+        """
+        path = os.fspath(path)
+        if not self.enabled:
+            return None, 0
+        digest = self.fingerprints.fingerprint(path)
+        if digest is None:
+            return None, 0
+        object_path = self.object_path(digest)
+        with self._lock:
+            if not os.path.isfile(object_path):
+                self._add_object(path, object_path, move=True)
+                return digest, 0
+            if os.path.samefile(object_path, path):
+                return digest, 0
+            saved = os.path.getsize(path)
+        self._link(object_path, path)
+        return digest, saved
+
+    def gc(self, refs, candidates=None):
+        """删除引用数为0的对象
+
+        Args:
+            refs: 哈希 -> 引用数
+            candidates: 只检查这些哈希（例如刚删除的MOD的清单），None表示检查整个对象库
+
+        Returns:
+            tuple: (删除的对象数, 释放的字节数)
+        """
+        if candidates is None:
+            candidates = self.all_digests()
+        removed = 0
+        freed = 0
+        with self._lock:
+            for digest in set(candidates):
+                if not digest or refs.get(digest, 0) > 0:
+                    continue
+                object_path = self.object_path(digest)
+                try:
+                    st = os.stat(object_path)
+                    os.remove(object_path)
+                except OSError:
+                    continue
+                removed += 1
+                # 仍有其他链接的对象删除后不会真正释放空间
+                if st.st_nlink <= 1:
+                    freed += st.st_size
+        if removed:
+            print(f"[调试] ObjectStore.gc: 删除 {removed} 个无引用对象，释放 {freed} 字节")
+        return removed, freed
+
+    def all_digests(self):
+        """对象库中所有对象的哈希"""
+        digests = []
+        try:
+            with os.scandir(self.objects_dir) as it:
+                prefixes = [entry.path for entry in it if entry.is_dir() and len(entry.name) == 2]
+        except OSError:
+            return digests
+        for prefix in prefixes:
+            try:
+                with os.scandir(prefix) as it:
+                    digests.extend(entry.name for entry in it if entry.is_file())
+            except OSError:
+                continue
+        return digests
+
+    def usage(self):
+        """对象数和对象库占用的字节数"""
+        count = 0
+        size = 0
+        for digest in self.all_digests():
+            try:
+                size += os.path.getsize(self.object_path(digest))
+                count += 1
+            except OSError:
+                continue
+        return {"objects": count, "bytes": size, "dedup_files": self.dedup_files, "dedup_bytes": self.dedup_bytes}
+
+    def _add_object(self, src, object_path, move):
+        """新对象先写到临时文件，完成后再改名，避免中断留下不完整的对象"""
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        tmp_path = f"{object_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            if move:
+                os.link(src, tmp_path)
+            else:
+                self.copy_file(src, tmp_path)
+            os.replace(tmp_path, object_path)
+        except Exception:
+            traceback.print_exc()
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _link(object_path, dest):
+        """用指向对象的硬链接替换dest（先链接到临时名再改名，dest始终完整）"""
+        tmp_path = f"{dest}.{uuid.uuid4().hex}.tmp"
+        os.link(object_path, tmp_path)
+        try:
+            os.replace(tmp_path, dest)
+        except OSError:
+            os.remove(tmp_path)
+            raise
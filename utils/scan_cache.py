@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+import traceback
+from utils.config_storage import atomic_write_text
+
+
+class ScanCache:
+    """MOD目录扫描缓存，保存在配置文件旁边
+
+    按相对目录记录目录的mtime、inode、其中找到的MOD文件组和子目录名。
+    再次扫描时只需stat每个目录：mtime和inode都没变的目录直接复用缓存，
+    只有发生变化（增删、重命名文件或子目录）的目录才重新列出。
+
+    注意：原地覆盖已有文件不会改变目录的mtime，这种情况下缓存中的pak大小不会更新，
+    直到该目录有其他变化或缓存被清除。
+    """
+
+    VERSION = 1
+
+    # 目录mtime距离扫描时间太近时不缓存：同一个时间刻度内的后续修改不会改变mtime
+    # （FAT/exFAT的精度为2秒），下次扫描会重新列出这些目录
+    RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+    def __init__(self, cache_file):
+        self.cache_file = cache_file
+        self.root = None
+        # 相对目录 -> {"mtime_ns", "ino", "groups", "subdirs"}
+        self.dirs = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._visited = set()
+        self._scan_time_ns = 0
+        # 并行扫描时多个线程同时查询和记录
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """读取缓存文件，文件不存在或损坏时从空缓存开始"""
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                print("[调试] ScanCache.load: 缓存版本不匹配，忽略旧缓存")
+                return
+            self.root = data.get("root")
+            self.dirs = data.get("dirs", {})
+            print(f"[调试] ScanCache.load: 读取扫描缓存，共 {len(self.dirs)} 个目录")
+        except Exception as e:
+            print(f"[警告] ScanCache.load: 读取扫描缓存失败，将重新扫描: {e}")
+            self.root = None
+            self.dirs = {}
+
+    def save(self):
+        """有变化时写回缓存文件"""
+        if not self._dirty:
+            return
+        try:
+            data = {"version": self.VERSION, "root": self.root, "dirs": self.dirs}
+            atomic_write_text(self.cache_file, json.dumps(data, ensure_ascii=False))
+            self._dirty = False
+        except Exception as e:
+            print(f"[错误] ScanCache.save: 保存扫描缓存失败: {e}")
+            traceback.print_exc()
+
+    def clear(self):
+        """清空缓存（下次扫描完整重建）"""
+        self.dirs = {}
+        self._dirty = True
+        self.save()
+
+    def begin(self, root):
+        """开始一次扫描；根目录变化时丢弃整个缓存"""
+        root = os.path.abspath(os.fspath(root))
+        if root != self.root:
+            if self.root is not None:
+                print("[调试] ScanCache.begin: MOD目录已变化，清空扫描缓存")
+            self.root = root
+            self.dirs = {}
+            self._dirty = True
+        self.hits = 0
+        self.misses = 0
+        self._visited = set()
+        self._scan_time_ns = time.time_ns()
+
+    def lookup(self, rel_dir, st):
+        """目录未变化时返回缓存项，否则返回None"""
+        with self._lock:
+            self._visited.add(rel_dir)
+            entry = self.dirs.get(rel_dir)
+            if entry is not None and entry["mtime_ns"] == st.st_mtime_ns and entry["ino"] == st.st_ino:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def store(self, rel_dir, st, groups, subdirs):
+        """记录重新列出的目录"""
+        with self._lock:
+            if self._scan_time_ns - st.st_mtime_ns < self.RACY_WINDOW_NS:
+                # 刚修改过的目录不缓存，避免同一时间刻度内的后续修改被漏掉
+                if self.dirs.pop(rel_dir, None) is not None:
+                    self._dirty = True
+                return
+            self.dirs[rel_dir] = {
+                "mtime_ns": st.st_mtime_ns,
+                "ino": st.st_ino,
+                "groups": groups,
+                "subdirs": subdirs,
+            }
+            self._dirty = True
+
+    def finish(self):
+        """结束扫描：删除本次没有访问到的目录（已被删除或移走），并保存缓存"""
+        stale = [rel_dir for rel_dir in self.dirs if rel_dir not in self._visited]
+        for rel_dir in stale:
+            del self.dirs[rel_dir]
+        if stale:
+            self._dirty = True
+        print(f"[调试] ScanCache.finish: 缓存命中 {self.hits} 个目录，重新扫描 {self.misses} 个目录")
+        self.save()